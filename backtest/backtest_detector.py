@@ -1,5 +1,6 @@
 import os
 import sys
+import threading
 import time
 from datetime import datetime, timedelta
 
@@ -9,9 +10,11 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 import MetaTrader5 as mt5
 
 from config.settings import Settings
+from core.infrastructure.brokers import OrderGateway
 from core.infrastructure.brokers.mt5_client import MT5Client
 from core.infrastructure.candle.manger import CandleManager
 from core.strategies.scalping_m1 import ScalpingDetector
+from core.utilities.event_bus import EventBus
 from models import Candle
 
 
@@ -32,13 +35,24 @@ class BacktestState:
     def __init__(self, broker: MT5Client):
         self.broker = broker
         self.candle_manager = CandleManager(broker)
+        self.orders = OrderGateway(broker, EventBus())  # Never started
+        self.lock = threading.RLock()  # Detectors copy their windows under it
 
-    def get_candles(self, timeframe, count=None):
+    def get_candles(self, timeframe, count=None, symbol=None):
         return self.candle_manager.get_candles(timeframe, count)
 
-    def calculate_atr(self, timeframe, period=14):
+    def get_candle_buffer(self, timeframe, symbol=None):
+        return self.candle_manager.get_buffer(timeframe)
+
+    def calculate_atr(self, timeframe, period=14, symbol=None):
         return self.candle_manager.calculate_atr(timeframe, period)
 
+    def indicator(self, timeframe, kind, *params, symbol=None):
+        return self.candle_manager.indicators.get(timeframe, kind, *params)
+
+    def candle_version(self, timeframe, symbol=None):
+        return self.candle_manager.version(timeframe)
+
 
 class BacktestRunner:
     """Manages registered detectors and executes the backtest."""
@@ -148,7 +162,7 @@ class BacktestRunner:
             candles = self.broker.get_historical_candles(
                 tf, start.timestamp(), end.timestamp()
             )
-            if not candles:
+            if candles is None or len(candles) == 0:
                 print(f"No candles retrieved for {entry.name}")
                 continue
 
@@ -0,0 +1,115 @@
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from config.settings import Settings
+from core.infrastructure.brokers import mt5_client
+from core.infrastructure.brokers.mt5_client import MT5Client
+
+DAYS = 120
+M1 = 1  # mt5.TIMEFRAME_M1
+
+RATE_DTYPE = np.dtype(
+    [
+        ("time", "i8"),
+        ("open", "f8"),
+        ("high", "f8"),
+        ("low", "f8"),
+        ("close", "f8"),
+        ("tick_volume", "u8"),
+        ("spread", "i4"),
+        ("real_volume", "u8"),
+    ]
+)
+
+
+def synthetic_copy_rates_range(symbol, timeframe, date_from, date_to):
+    """Stand-in for the terminal: one bar per minute in the range."""
+    times = np.arange(
+        int(date_from.timestamp()) // 60 * 60, int(date_to.timestamp()) + 1, 60
+    )
+    rates = np.zeros(len(times), dtype=RATE_DTYPE)
+    rates["time"] = times
+    rates["open"] = rates["close"] = 2000 + np.sin(times / 3600)
+    rates["high"] = rates["open"] + 0.5
+    rates["low"] = rates["open"] - 0.5
+    rates["tick_volume"] = 10
+    return rates
+
+
+def legacy_historical_candles(start_time, end_time):
+    """The previous implementation: a dict per row and a sleep per chunk."""
+    results = []
+    chunk_size = timedelta(days=30)
+    gmt8 = timezone(timedelta(hours=8))
+    current_start = datetime.fromtimestamp(start_time, tz=gmt8)
+    end_dt = datetime.fromtimestamp(end_time, tz=gmt8)
+    while current_start < end_dt:
+        current_end = min(current_start + chunk_size, end_dt)
+        rates = mt5_client.mt5.copy_rates_range(
+            "XAUUSD",
+            M1,
+            current_start.astimezone(timezone.utc).replace(tzinfo=None),
+            current_end.astimezone(timezone.utc).replace(tzinfo=None),
+        )
+        for rate in rates:
+            utc_time = datetime.utcfromtimestamp(rate["time"]).replace(
+                tzinfo=timezone.utc
+            )
+            results.append(
+                {
+                    "time": utc_time.astimezone(gmt8).timestamp(),
+                    "open": rate["open"],
+                    "high": rate["high"],
+                    "low": rate["low"],
+                    "close": rate["close"],
+                    "tick_volume": rate["tick_volume"],
+                }
+            )
+        current_start = current_end + timedelta(seconds=1)
+        time.sleep(0.1)
+    return results
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--live", action="store_true", help="Use the MT5 terminal")
+    parser.add_argument("--days", type=int, default=DAYS)
+    args = parser.parse_args()
+
+    broker = MT5Client(Settings())
+    if args.live:
+        if not broker.connect():
+            print("Failed to connect to MetaTrader 5")
+            return
+    else:
+        mt5_client.mt5.copy_rates_range = synthetic_copy_rates_range
+
+    end = int(time.time()) // 60 * 60
+    start = end - args.days * 86400
+
+    print(f"=== Historical download ({args.days} days of M1) ===")
+    rates, elapsed = timed(broker.get_historical_candles, M1, start, end)
+    print(
+        f"  structured array {len(rates):>8} rows {len(rates) / elapsed:>12,.0f} rows/s"
+    )
+    rows, elapsed = timed(legacy_historical_candles, start, end)
+    print(
+        f"  dict per row     {len(rows):>8} rows {len(rows) / elapsed:>12,.0f} rows/s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+import os
+import sys
+import tracemalloc
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core.infrastructure.candle import CandleBuffer
+from models import Candle, Position
+
+COUNT = 13446  # Bars held by one CandleManager
+
+
+# Same constructors on plain classes, i.e. the models before __slots__
+DictCandle = type("DictCandle", (), {"__init__": Candle.__init__})
+DictPosition = type("DictPosition", (), {"__init__": Position.__init__})
+
+
+def make_candle(cls, i):
+    return cls(
+        timestamp=1700000000 + i * 60,
+        open=2000.0 + i,
+        high=2001.0 + i,
+        low=1999.0 + i,
+        close=2000.5 + i,
+        volume=100,
+        timeframe=1,
+    )
+
+
+def make_position(cls, i):
+    return cls(
+        id=100000 + i,
+        symbol="XAUUSD",
+        direction=1,
+        entry_price=2000.0 + i,
+        stop_loss=1990.0 + i,
+        take_profit=2030.0 + i,
+        size=0.1,
+        pip_point=0.01,
+        time_out=180,
+        comment="M1 Scalping",
+    )
+
+
+def measure(factory, cls, count=COUNT):
+    """Average bytes allocated per instance."""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    objects = [factory(cls, i) for i in range(count)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    total = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    # The list itself holds one pointer per object
+    total -= sys.getsizeof(objects)
+    return total / count
+
+
+def measure_buffer(count=COUNT):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    buffer = CandleBuffer(1, count)
+    for i in range(count):
+        buffer.append(1700000000 + i * 60, 2000.0, 2001.0, 1999.0, 2000.5, 100)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / count
+
+
+def main():
+    print(f"=== Model footprint ({COUNT} instances) ===")
+    rows = [
+        ("Candle (dict)", measure(make_candle, DictCandle)),
+        ("Candle (slots)", measure(make_candle, Candle)),
+        ("CandleBuffer bar", measure_buffer()),
+        ("Position (dict)", measure(make_position, DictPosition)),
+        ("Position (slots)", measure(make_position, Position)),
+    ]
+    for name, size in rows:
+        print(f"  {name:<18} {size:8.1f} bytes")
+
+    candle_saving = 1 - rows[1][1] / rows[0][1]
+    position_saving = 1 - rows[4][1] / rows[3][1]
+    print(
+        f"\nCandle -{candle_saving * 100:.0f}% | Position -{position_saving * 100:.0f}% | "
+        f"{COUNT} bars: {rows[0][1] * COUNT / 1024**2:.2f} MB as dict Candles, "
+        f"{rows[2][1] * COUNT / 1024**2:.2f} MB in CandleBuffer"
+    )
+
+
+if __name__ == "__main__":
+    main()
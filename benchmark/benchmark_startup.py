@@ -0,0 +1,88 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Loaded on first use only, never by importing the app
+HEAVY_MODULES = ("sklearn", "scipy", "matplotlib", "pandas", "tkinter")
+
+IMPORT_APP = f"""
+import json, sys, time
+start = time.perf_counter()
+import core.application.app
+seconds = time.perf_counter() - start
+heavy = [m for m in {HEAVY_MODULES!r} if m in sys.modules]
+print(json.dumps({{"seconds": seconds, "heavy": heavy}}))
+"""
+
+
+def cold_import():
+    """Import the app in a fresh interpreter"""
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_APP],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def last_startup(path):
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        lines = f.read().splitlines()
+    return json.loads(lines[-1]) if lines else None
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Cold start regression budget, exits 1 when exceeded"
+    )
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument(
+        "--budget", type=float, default=0.5, help="Median app import seconds"
+    )
+    parser.add_argument(
+        "--startup-budget",
+        type=float,
+        default=None,
+        help="Seconds allowed for the last recorded startup",
+    )
+    parser.add_argument(
+        "--report", default=os.path.join(ROOT, "out", "profile", "startup.jsonl")
+    )
+    args = parser.parse_args()
+
+    failures = []
+    runs = [cold_import() for _ in range(args.runs)]
+    median = statistics.median(run["seconds"] for run in runs)
+    heavy = sorted({module for run in runs for module in run["heavy"]})
+    print(f"=== Cold import of core.application.app ({args.runs} runs) ===")
+    print(f"  median {median:.3f}s, budget {args.budget:.3f}s")
+    if median > args.budget:
+        failures.append(f"import took {median:.3f}s")
+    if heavy:
+        failures.append(f"heavy modules imported eagerly: {', '.join(heavy)}")
+
+    report = last_startup(args.report)
+    if report is not None:
+        print(f"=== Last startup ({report['time']}) ===")
+        for name, seconds in report["phases"].items():
+            print(f"  {name:<24} {seconds:7.3f}s")
+        print(f"  {'total':<24} {report['total']:7.3f}s")
+        if args.startup_budget is not None and report["total"] > args.startup_budget:
+            failures.append(f"startup took {report['total']:.3f}s")
+
+    for failure in failures:
+        print(f"OVER BUDGET: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,10 +4,14 @@ from dataclasses import dataclass
 @dataclass
 class Settings:
     # Broker Configuration
+    # "MT5", or replay SIM_DATA_DIR offline: "SIM" for <symbol>/M1.npy files,
+    # "REPLAY" for recorded files, i.e. SIM_DATA_DIR set to a live RECORD_DIR
+    BROKER: str = "MT5"
     BROKER_LOGIN: int = 123
     BROKER_PASSWORD: str = "123"
     BROKER_SERVER: str = "MetaQuotes-Demo"
     SYMBOL: str = "XAUUSD"
+    SYMBOLS: tuple[str, ...] = ()  # Traded alongside SYMBOL
     MAGIC_NUMBER = 666
 
     # Risk Parameters
@@ -26,9 +30,34 @@ class Settings:
     TRAIL_START: float = 22
     TRAIL_DISTANCE: float = 18
     BREAKEVEN_DISTANCE: float = 10
+    SLTP_MIN_STEP: float = 2  # Pips, smaller SL/TP moves are not sent
+    SLTP_MAX_PER_SECOND: float = 5  # Modify requests sent per second
 
     # System
     HEARTBEAT_INTERVAL: int = 60
+    UPDATE_INTERVAL: float = 1.0  # Seconds between full state refreshes
+    CANDLE_CACHE_DIR: str = "out/candle"
+    # Seconds from server midnight to the start of the broker's trading day,
+    # for H4/D1 bars built locally
+    SESSION_OFFSET: int = 0
+    TICK_CACHE_TTL: float = 0.5  # Seconds a tick is reused before a new query
+    TICK_STREAM: bool = True  # Poll ticks on a thread between loop iterations
+    TICK_POLL_INTERVAL: float = 0.05
+    RECORD_DIR: str = ""  # Records live ticks and closed bars there when set
+    PROFILE_ENABLED: bool = True  # Loop phase latency histograms
+    PROFILE_INTERVAL: float = 300  # Seconds between profile summaries
+    PROFILE_DIR: str = "out/profile"
+    STRATEGY_WORKERS: int = 4  # Strategy threads, and processes for their fits
+    SNAPSHOT_PATH: str = "out/state/snapshot.npz"  # Warm restart, "" disables
+    SNAPSHOT_INTERVAL: float = 30  # Seconds between snapshots
+    METRICS_PORT: int = 0  # Prometheus endpoint on localhost, 0 disables
+    EVENT_WORKERS: int = 2  # Threads delivering queued events, 0 for inline
+
+    # Replay broker
+    SIM_DATA_DIR: str = "out/candle"
+    SIM_SPREAD_POINTS: int = 20
+    SIM_SLIPPAGE_POINTS: int = 0
+    SIM_WARMUP_BARS: int = 1440
 
 
 config = Settings()
@@ -1,9 +1,11 @@
 import time
 
 from config.settings import Settings
+from core.application.metrics import start_metrics
+from core.application.snapshot import StateSnapshot
 from core.application.state import TradingState
-from core.gui import start_position_monitor
 from core.infrastructure.brokers import BrokerFactory
+from core.infrastructure.brokers import mt5_constants as mt5
 from core.infrastructure.position import PositionLogger
 from core.infrastructure.risk import RiskManager
 from core.strategies.loader import StrategyRegistry
@@ -12,56 +14,116 @@ from core.strategies.mtc import (
     MajorTrendConfidenceExecutor,
 )
 from core.strategies.scalping_m1 import ScalpingDetector, ScalpingExecutor
-from core.utilities.event_bus import EventBus
+from core.utilities.event_bus import COALESCE, EventBus
 from core.utilities.logger import logger
+from core.utilities.profiler import profiler
+from core.utilities.startup import startup
 
 
 class TradeApp:
     def __init__(self, config: Settings):
-        self.broker = BrokerFactory.create(config)
-        self.bus = EventBus()
+        self.config = config
+        profiler.configure(
+            config.PROFILE_ENABLED, config.PROFILE_INTERVAL, config.PROFILE_DIR
+        )
+        with startup.phase("broker"):
+            self.broker = BrokerFactory.create(config)
+        self.bus = EventBus(config.EVENT_WORKERS)
+        # The CSV rewrite of a position no longer blocks whoever opened it,
+        # only its latest state is written when it changes faster
+        self.bus.route("LOG_POSITION", overflow=COALESCE, key=lambda p: p.id)
+        self.bus.route("RISK_VIOLATION", overflow=COALESCE, key=str, priority=True)
 
-        self.state = TradingState(self.broker, self.bus)
+        symbols = [config.SYMBOL] + [s for s in config.SYMBOLS if s != config.SYMBOL]
+        self.state = TradingState(
+            self.broker,
+            self.bus,
+            symbols,
+            config.CANDLE_CACHE_DIR,
+            config.TICK_POLL_INTERVAL if config.TICK_STREAM else None,
+            config.RECORD_DIR if self.broker.realtime else "",  # Replays never record
+            config.SESSION_OFFSET,
+        )
         self.position_logger = PositionLogger()
         self.bus.subscribe("LOG_POSITION", self.position_logger.log_position)
 
-        self.state.initialize()
+        with startup.phase("warmup"):
+            self.state.initialize()
 
         # Load in strategies
-        self.strategies = StrategyRegistry()
+        # Replays run the schedules and timeouts on the replayed time
+        clock = None if self.broker.realtime else lambda: self.broker.now
+        self.strategies = StrategyRegistry(
+            config.STRATEGY_WORKERS,
+            inline=not self.broker.realtime,
+            bus=self.bus,
+            clock=clock,
+        )
         self.strategies.load(
             "Major Trend Conf",
             MajorTrendConfidenceDetector(self.broker, self.state, config),
             MajorTrendConfidenceExecutor(self.broker, self.state, config),
             schedule_config={"type": "hourly", "at": ":00"},
             duration_minutes=15,
+            symbols=symbols,
+            processes=True,  # Quantile regression fits on detector.process_pool
+            time_budget=60,
         )
         self.strategies.load(
             "M1 Scalping",
             ScalpingDetector(self.broker, self.state, config),
             ScalpingExecutor(self.broker, self.state, config),
-            schedule_config={"type": "interval", "seconds": 10},
+            schedule_config={
+                "type": "bar_close",
+                "timeframe": mt5.TIMEFRAME_M1,
+                "delay_ms": 200,
+            },
             duration_minutes=0,  # Run continuously
+            symbols=symbols,
+            time_budget=2,
         )
 
         self.strategies.load(
             "M1 Scalping RM",
             ScalpingDetector(self.broker, self.state, config),
             ScalpingExecutor(self.broker, self.state, config),
-            schedule_config={"type": "interval", "seconds": 10},
+            schedule_config={
+                "type": "bar_close",
+                "timeframe": mt5.TIMEFRAME_M1,
+                "delay_ms": 200,
+            },
             duration_minutes=0,  # Run continuously
+            symbols=symbols,
+            time_budget=2,
         )
 
         self.risk = RiskManager(
             self.broker, self.state, config, self.bus, ["M1 Scalping"]
         )
 
+        # Warm restart, live sessions only so replays never touch it
+        self.snapshot = None
+        if config.SNAPSHOT_PATH and self.broker.realtime:
+            self.snapshot = StateSnapshot(
+                config.SNAPSHOT_PATH, config.SNAPSHOT_INTERVAL
+            )
+            with startup.phase("restore"):
+                self.snapshot.restore(self.state, self.strategies.strategies)
+
         # Event bindings
         self.bus.subscribe("RISK_VIOLATION", self.on_risk_violation)
-        # GUI
-        self.gui, self.gui_thread = start_position_monitor(self.state)
+        # GUI, tkinter is only imported here
+        with startup.phase("gui"):
+            from core.gui import start_position_monitor
+
+            self.gui, self.gui_thread = start_position_monitor(self.state)
+
+        self.metrics = None
+        if config.METRICS_PORT:
+            self.metrics = start_metrics(config.METRICS_PORT, self)
 
         self.running = True
+        startup.report(config.PROFILE_DIR)
 
     def on_risk_violation(self, msg):
         logger.critical(f"RISK: {msg}")
@@ -70,22 +132,84 @@ class TradeApp:
     def run(self):
         logger.info("📈 TradeApp Started")
 
+        if not self.broker.realtime:
+            self._replay()
+            return
+
+        wakeup = self.state.wakeup
+        next_update = 0.0
+        while self.running and not self.state.halt_trading:
+            try:
+                now = time.monotonic()
+                with profiler.phase("loop.iteration"):
+                    # Account checks on the update cadence, not every tick
+                    full = now >= next_update
+                    if full:
+                        with profiler.phase("loop.update"):
+                            self.state.update()
+                        next_update = now + self.config.UPDATE_INTERVAL
+                    else:
+                        with profiler.phase("loop.dispatch"):
+                            self.state.dispatch()
+                    with profiler.phase("loop.strategies"):
+                        self.strategies.run_pending()
+                    with profiler.phase("loop.risk"):
+                        self.risk.evaluate(full)
+                profiler.maybe_report()
+                if self.snapshot is not None:
+                    with profiler.phase("loop.snapshot"):
+                        self.snapshot.maybe_save(self.state, self.strategies.strategies)
+
+                # Sleep until the next refresh or scheduled strategy, or
+                # until a tick or order result arrives
+                deadline = next_update
+                idle = self.strategies.idle_seconds()
+                if idle is not None:
+                    deadline = min(deadline, now + max(idle, 0.0))
+                wakeup.wait(max(deadline - time.monotonic(), 0.0))
+            except Exception as e:
+                logger.exception(f"Loop Error: {e}")
+                wakeup.wait(0.1)
+
+    def _replay(self):
+        """One full iteration per replayed bar, without waiting"""
         while self.running and not self.state.halt_trading:
+            if not self.broker.advance():
+                logger.info("Replay data exhausted")
+                break
             try:
-                self.state.update()
-                self.strategies.run_pending()
-                self.risk.evaluate()
-                time.sleep(1)
+                with profiler.phase("loop.iteration"):
+                    with profiler.phase("loop.update"):
+                        self.state.update()
+                    with profiler.phase("loop.strategies"):
+                        self.strategies.run_pending()
+                    with profiler.phase("loop.risk"):
+                        self.risk.evaluate()
+                profiler.maybe_report()
             except Exception as e:
                 logger.exception(f"Loop Error: {e}")
-            finally:
-                time.sleep(0.1)
 
     def shutdown(self):
         self.running = False
+        self.state.wakeup.notify()
         if getattr(self, "gui", None):
             try:
                 self.gui.on_close()
             except Exception:
                 pass
+        if getattr(self, "metrics", None):
+            self.metrics.close()
+        self.strategies.close()
+        for name, stats in self.strategies.stats().items():
+            logger.info(f"Strategy {name}: {stats}")
+        for detector, stats in self.strategies.memo.stats().items():
+            logger.info(f"Detector memo {detector}: {stats}")
+        if self.snapshot is not None:
+            self.snapshot.save(self.state, self.strategies.strategies)
+        self.state.close()
+        self.bus.close()  # Deliver the queued position logs
+        for event, stats in self.bus.stats().items():
+            logger.info(f"Event {event}: {stats}")
+        if profiler.enabled and profiler.histograms:
+            profiler.report()
         logger.info("TradeApp Shutdown Complete")
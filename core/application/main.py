@@ -1,8 +1,11 @@
-from config.settings import config
-from core.application.app import TradeApp
-from core.utilities.logger import logger
+from core.utilities.startup import startup
 
 if __name__ == "__main__":
+    with startup.phase("import"):
+        from config.settings import config
+        from core.application.app import TradeApp
+        from core.utilities.logger import logger
+
     app = TradeApp(config)
     try:
         app.run()
@@ -0,0 +1,139 @@
+from core.utilities.metrics import Exposition, MetricsServer
+from core.utilities.profiler import profiler
+
+
+def collect_latencies(out: Exposition):
+    histograms = sorted(profiler.cumulative().items())
+    for name, histogram in histograms:
+        if name.startswith("mt5."):
+            out.histogram(
+                "broker_call_seconds",
+                histogram,
+                {"function": name[4:]},
+                "Latency of MetaTrader5 calls",
+            )
+    for name, histogram in histograms:
+        if not name.startswith("mt5."):
+            out.histogram(
+                "phase_seconds",
+                histogram,
+                {"phase": name},
+                "Latency of profiled phases, loop.iteration is one loop",
+            )
+
+
+def collect_positions(out: Exposition, state):
+    manager = state.position_manager
+    books = {
+        symbol: tuple(manager.books.get(symbol, {}).values())
+        for symbol in state.symbols
+    }
+    for symbol, positions in books.items():
+        out.gauge(
+            "open_positions", len(positions), {"symbol": symbol}, "Open positions"
+        )
+    for symbol, positions in books.items():
+        out.gauge(
+            "unrealized_pnl",
+            sum(p.unrealized_pnl for p in positions),
+            {"symbol": symbol},
+            "Floating PnL of open positions",
+        )
+    history = tuple(manager.position_history)
+    out.gauge(
+        "realized_pnl",
+        sum(p.unrealized_pnl for p in history),
+        help="PnL of positions closed this session",
+    )
+    out.counter("closed_positions", len(history), help="Positions closed this session")
+    out.gauge(
+        "consecutive_losses", manager.consecutive_losses, help="Current loss streak"
+    )
+    out.gauge("account_balance", state.account_balance, help="Account balance")
+    out.gauge("account_equity", state.account_equity, help="Account equity")
+
+
+def collect_strategies(out: Exposition, registry):
+    strategies = [
+        ({"strategy": s.name, "symbol": s.symbol}, s.stats) for s in registry.strategies
+    ]
+    for field, help in (
+        ("runs", "Completed strategy runs"),
+        ("skipped", "Runs skipped while the previous one was still going"),
+        ("overruns", "Runs longer than the strategy time budget"),
+        ("errors", "Runs that raised"),
+    ):
+        for labels, stats in strategies:
+            out.counter(f"strategy_{field}", getattr(stats, field), labels, help)
+    for labels, stats in strategies:
+        out.counter(
+            "strategy_run_seconds",
+            stats.total_seconds,
+            labels,
+            "Time spent in strategy runs",
+        )
+    for labels, stats in strategies:
+        out.gauge(
+            "strategy_last_run_seconds",
+            stats.last_seconds,
+            labels,
+            "Duration of the last strategy run",
+        )
+    memo = registry.memo.stats()
+    for kind in ("hits", "misses"):
+        for detector, stats in memo.items():
+            out.counter(
+                f"detector_memo_{kind}",
+                stats[kind],
+                {"detector": detector},
+                f"Detector memo {kind}",
+            )
+
+
+def collect_queues(out: Exposition, state, risk, bus):
+    orders = state.orders.stats()
+    modifications = risk.modifications.stats()
+    for queue, depth in (
+        ("orders", orders["queued"]),
+        ("sltp_pending", modifications["pending"]),
+        ("sltp_in_flight", modifications["in_flight"]),
+    ):
+        out.gauge("queue_depth", depth, {"queue": queue}, "Items waiting in a queue")
+    for result in ("submitted", "sent", "failed", "retries"):
+        out.counter(
+            "orders", orders.get(result, 0), {"result": result}, "Order intents"
+        )
+    events = bus.stats()
+    for event, stats in events.items():
+        out.gauge(
+            "event_queue_depth",
+            stats["depth"],
+            {"event": event},
+            "Events waiting for an EventBus dispatcher",
+        )
+    for field, help in (
+        ("published", "EventBus events published"),
+        ("dropped", "Events dropped by a full queue"),
+        ("coalesced", "Events replaced by a newer one with the same key"),
+        ("errors", "EventBus handler failures"),
+    ):
+        for event, stats in events.items():
+            out.counter(f"events_{field}", stats[field], {"event": event}, help)
+    for event, stats in sorted(dict(bus.topic_stats).items()):
+        out.histogram(
+            "event_handler_seconds",
+            stats.latency,
+            {"event": event},
+            "Time taken by all handlers of one event",
+        )
+
+
+def start_metrics(port: int, app) -> MetricsServer:
+    """Metrics endpoint on localhost:``port`` for a started ``TradeApp``"""
+    server = MetricsServer(port)
+    server.register(collect_latencies)
+    server.register(lambda out: collect_positions(out, app.state))
+    server.register(lambda out: collect_strategies(out, app.strategies))
+    server.register(lambda out: collect_queues(out, app.state, app.risk, app.bus))
+    server.start()
+    return server
@@ -0,0 +1,172 @@
+import io
+import json
+import os
+import time
+
+import numpy as np
+
+from core.application.state import TradingState
+from core.utilities.logger import logger
+from models import Position
+
+SNAPSHOT_VERSION = 1
+HISTORY_LIMIT = 1000  # Closed positions kept in a snapshot
+
+POSITION_RECORD = np.dtype(
+    [
+        ("id", "i8"),
+        ("symbol", "U16"),
+        ("direction", "i1"),
+        ("entry_price", "f8"),
+        ("stop_loss", "f8"),
+        ("take_profit", "f8"),
+        ("size", "f8"),
+        ("pip_point", "f8"),
+        ("time_out", "f8"),
+        ("entry_time", "f8"),
+        ("current_price", "f8"),
+        ("close_price", "f8"),  # NaN while open
+        ("close_time", "f8"),
+        ("close_reason", "U32"),
+        ("comment", "U32"),
+    ]
+)
+
+
+def _nan(value):
+    return np.nan if value is None else value
+
+
+def _none(value):
+    return None if np.isnan(value) else float(value)
+
+
+def positions_to_records(positions) -> np.ndarray:
+    records = np.empty(len(positions), dtype=POSITION_RECORD)
+    for i, p in enumerate(positions):
+        records[i] = (
+            p.id,
+            p.symbol or "",
+            p.direction,
+            p.entry_price,
+            p.stop_loss,
+            p.take_profit,
+            p.size,
+            p.pip_point,
+            p.time_out,
+            p.entry_time,
+            p.current_price,
+            _nan(p.close_price),
+            _nan(p.close_time),
+            p.close_reason or "",
+            p.comment or "",
+        )
+    return records
+
+
+def records_to_positions(records) -> list[Position]:
+    positions = []
+    for r in records:
+        position = Position(
+            id=int(r["id"]),
+            symbol=str(r["symbol"]),
+            direction=int(r["direction"]),
+            entry_price=float(r["entry_price"]),
+            stop_loss=float(r["stop_loss"]),
+            take_profit=float(r["take_profit"]),
+            size=float(r["size"]),
+            pip_point=float(r["pip_point"]),
+            time_out=float(r["time_out"]),
+            comment=str(r["comment"]),
+        )
+        position.entry_time = float(r["entry_time"])
+        position.current_price = float(r["current_price"])
+        position.close_price = _none(r["close_price"])
+        position.close_time = _none(r["close_time"])
+        position.close_reason = str(r["close_reason"]) or None
+        positions.append(position)
+    return positions
+
+
+class StateSnapshot:
+    """Binary warm-restart snapshot of the trading and strategy state.
+
+    Open positions with their timeouts and entry times, the closed
+    position history, the loss streak and every detector's ``get_state``
+    are saved to one ``.npz`` file, replaced atomically so a crash never
+    leaves a torn snapshot. Candles persist through ``CandleStore``.
+    """
+
+    def __init__(self, path: str, interval: float = 30.0):
+        self.path = path
+        self.interval = interval
+        self.saved_at = time.monotonic()
+
+    def maybe_save(self, state: TradingState, strategies=(), now=None) -> bool:
+        now = time.monotonic() if now is None else now
+        if now - self.saved_at < self.interval:
+            return False
+        self.save(state, strategies)
+        self.saved_at = now
+        return True
+
+    def save(self, state: TradingState, strategies=()):
+        manager = state.position_manager
+        detectors = {f"{s.name}.{s.symbol}": s.detector.get_state() for s in strategies}
+        buffer = io.BytesIO()
+        np.savez(
+            buffer,
+            meta=np.array(
+                [SNAPSHOT_VERSION, time.time(), manager.consecutive_losses],
+                dtype=np.float64,
+            ),
+            positions=positions_to_records(list(manager.open_positions.values())),
+            history=positions_to_records(manager.position_history[-HISTORY_LIMIT:]),
+            detectors=np.frombuffer(json.dumps(detectors).encode(), dtype=np.uint8),
+        )
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(buffer.getbuffer())
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        for candle_manager in state.candle_managers.values():
+            candle_manager.flush()
+
+    def restore(self, state: TradingState, strategies=()) -> bool:
+        """Load the last snapshot into ``state`` and the strategies' detectors.
+
+        Positions closed while the app was down are dropped by the next
+        ``sync_positions`` like any externally closed position."""
+        if not os.path.exists(self.path):
+            return False
+        try:
+            with np.load(self.path) as data:
+                meta = data["meta"]
+                positions = records_to_positions(data["positions"])
+                history = records_to_positions(data["history"])
+                detectors = json.loads(data["detectors"].tobytes().decode())
+        except Exception as e:
+            # Torn or damaged zips included, any of them means a cold start
+            logger.warning(f"Snapshot {self.path} unreadable, cold start: {e}")
+            return False
+        if int(meta[0]) != SNAPSHOT_VERSION:
+            logger.info(f"Snapshot {self.path} has an old layout, ignored")
+            return False
+
+        positions = [p for p in positions if p.symbol in state.symbols]
+        state.position_manager.restore(positions, history, int(meta[2]))
+        for strategy in strategies:
+            detector_state = detectors.get(f"{strategy.name}.{strategy.symbol}")
+            if detector_state:
+                strategy.detector.set_state(detector_state)
+
+        logger.info(
+            f"Restored snapshot from {time.time() - meta[1]:.0f}s ago: "
+            f"{len(positions)} open positions, {len(history)} closed"
+        )
+        return True
@@ -1,45 +1,222 @@
-import MetaTrader5 as mt5
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 
+from core.infrastructure.brokers import OrderGateway
+from core.infrastructure.brokers import mt5_constants as mt5
 from core.infrastructure.brokers.base import BaseBroker
-from core.infrastructure.candle import CandleManager
+from core.infrastructure.brokers.timeframes import TIMEFRAME_SECONDS
+from core.infrastructure.candle import CandleManager, CandleStore
 from core.infrastructure.position import PositionManager
+from core.infrastructure.recorder import MarketRecorder
+from core.infrastructure.tick import TickStream
 from core.utilities.event_bus import EventBus
+from core.utilities.logger import logger
+from core.utilities.profiler import profiler
+from core.utilities.startup import startup, timed
+from core.utilities.wakeup import Wakeup
+from models import BarEvent, TickEvent
 
 
 class TradingState:
-    def __init__(self, broker: BaseBroker, bus: EventBus):
+    def __init__(
+        self,
+        broker: BaseBroker,
+        bus: EventBus,
+        symbols: list[str],
+        candle_cache_dir: str | None = None,
+        tick_poll_interval: float | None = None,
+        record_dir: str | None = None,
+        session_offset: int = 0,
+    ):
+        """``tick_poll_interval`` enables a ``TickStream`` polled that often,
+        otherwise one tick per symbol is read on every ``update``.
+        ``record_dir`` records every tick and closed bar seen there.
+        ``session_offset`` aligns the locally built bars, see ``BarAggregator``."""
         self.broker = broker
         self.bus = bus
-        self.candle_manager = CandleManager(broker)
-        self.position_manager = PositionManager(broker, bus)
+        self.symbols = list(symbols)
+        self.symbol = self.symbols[0]  # Default for symbol-less callers
+        self.candle_managers = {
+            symbol: CandleManager(
+                broker,
+                session_offset=session_offset,
+                store=(
+                    CandleStore(symbol, candle_cache_dir) if candle_cache_dir else None
+                ),
+                symbol=symbol,
+                bus=bus,
+            )
+            for symbol in self.symbols
+        }
+        self.wakeup = Wakeup()  # Notified on new ticks and order results
+        # Held while candles and indicators change, strategies running on
+        # worker threads take it to copy a consistent window
+        self.lock = threading.RLock()
+        self.ticks = {}  # Latest tick per symbol
+        self.tick_stream = None
+        if tick_poll_interval is not None:
+            self.tick_stream = TickStream(
+                broker,
+                bus,
+                self.symbols,
+                poll_interval=tick_poll_interval,
+                wakeup=self.wakeup,
+            )
+            bus.subscribe("TICK", self.on_tick)
+        self.recorder = None
+        if record_dir:
+            self.recorder = MarketRecorder(record_dir)
+            bus.subscribe("BAR_CLOSED", self._record_bar)
+        self.orders = OrderGateway(broker, bus, wakeup=self.wakeup)
+        self.position_manager = PositionManager(broker, bus, self.symbols, self.orders)
         self.account_balance = 10000  # Default starting balance
         self.account_equity = 10000  # Default starting equity
         self.halt_trading = False
 
+    @property
+    def candle_manager(self) -> CandleManager:
+        return self.candle_managers[self.symbol]
+
     def update_account_info(self):
         balance, equity = self.broker.get_account_info()
         self.account_balance = balance
         self.account_equity = equity
 
     def initialize(self):
-        self.update_account_info()
-        self.candle_manager.initialize_all()
+        self.orders.start()
+        # Account info loads while the candles warm up
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            account = pool.submit(timed, self.update_account_info)
+            for symbol, candle_manager in self.candle_managers.items():
+                start = time.perf_counter()
+                for timeframe, seconds in candle_manager.initialize_all().items():
+                    startup.record(f"candles.{symbol}.{timeframe}", seconds)
+                startup.record(f"candles.{symbol}", time.perf_counter() - start)
+            startup.record("account", account.result())
+        if self.tick_stream is not None:
+            self.tick_stream.start()
+        for symbol, nbytes in self.memory_usage().items():
+            logger.info(f"{symbol} candle memory: {nbytes / 1024**2:.2f} MB")
+
+    def close(self):
+        if self.tick_stream is not None:
+            self.tick_stream.stop()
+        self.orders.stop()
+        if self.recorder is not None:
+            self.recorder.close()
+        for candle_manager in self.candle_managers.values():
+            candle_manager.flush()
+
+    def memory_usage(self) -> dict[str, int]:
+        """Bytes held per symbol"""
+        usage = {
+            symbol: candle_manager.nbytes
+            for symbol, candle_manager in self.candle_managers.items()
+        }
+        if self.tick_stream is not None:
+            for symbol, buffer in self.tick_stream.buffers.items():
+                usage[symbol] += buffer.nbytes
+        return usage
+
+    def _record_bar(self, event: BarEvent):
+        """Record the closed bar and the flat bars filled in after it."""
+        buffer = self.get_candle_buffer(event.timeframe, event.symbol)
+        seconds = TIMEFRAME_SECONDS[event.timeframe]
+        for i in range(event.gap_bars + 1):
+            index = buffer.index_of(event.timestamp + i * seconds)
+            if index is None:
+                continue
+            candle = buffer.candle_at(index)
+            self.recorder.write_bar(
+                event.symbol,
+                event.timeframe,
+                candle.timestamp,
+                candle.open,
+                candle.high,
+                candle.low,
+                candle.close,
+                candle.volume,
+            )
 
     # Candle manager
-    def get_candles(self, timeframe, count=None):
-        return self.candle_manager.get_candles(timeframe, count)
+    def get_candles(self, timeframe, count=None, symbol=None):
+        with self.lock:
+            return self.candle_managers[symbol or self.symbol].get_candles(
+                timeframe, count
+            )
 
-    def calculate_atr(self, timeframe, period=14):
-        return self.candle_manager.calculate_atr(timeframe, period)
+    def candle_version(self, timeframe, symbol=None) -> int:
+        """Changes whenever the candles of ``timeframe`` change"""
+        return self.candle_managers[symbol or self.symbol].version(timeframe)
+
+    def get_candle_buffer(self, timeframe, symbol=None):
+        return self.candle_managers[symbol or self.symbol].get_buffer(timeframe)
+
+    def calculate_atr(self, timeframe, period=14, symbol=None):
+        with self.lock:
+            return self.candle_managers[symbol or self.symbol].calculate_atr(
+                timeframe, period
+            )
+
+    def indicator(self, timeframe, kind, *params, symbol=None):
+        candle_manager = self.candle_managers[symbol or self.symbol]
+        with self.lock:
+            return candle_manager.indicators.get(timeframe, kind, *params)
 
     def update(self):
-        self.update_account_info()
-        self.candle_manager.update_candles()
-        self.position_manager.sync_positions()
+        """Full refresh: account, candles, positions and ticks"""
+        # Positions are read from the terminal once per update
+        self.broker.invalidate_positions()
+        self.orders.dispatch()
+        with profiler.phase("state.account"):
+            self.update_account_info()
+        for symbol, candle_manager in self.candle_managers.items():
+            with profiler.phase(f"state.candles.{symbol}"), self.lock:
+                candle_manager.update_candles()
+        with profiler.phase("state.positions"):
+            self.position_manager.sync_positions()
+        self.dispatch()
+
+    def dispatch(self):
+        """Apply order results and ticks that arrived since the last call"""
+        with profiler.phase("state.orders"):
+            self.orders.dispatch()
+        if self.tick_stream is not None:
+            with profiler.phase("state.ticks"):
+                self.tick_stream.dispatch()
+        else:
+            for symbol in self.symbols:
+                tick = self.broker.get_tick(symbol)
+                if tick:
+                    previous = self.ticks.get(symbol)
+                    self.ticks[symbol] = tick
+                    self.position_manager.update_price(tick, symbol)
+                    # The cached tick comes back until a new one arrives
+                    if self.recorder is not None and (
+                        previous is None or tick.time_msc > previous.time_msc
+                    ):
+                        self.recorder.write_ticks(
+                            symbol,
+                            [tick.time_msc],
+                            [tick.bid],
+                            [tick.ask],
+                            [tick.volume],
+                        )
+        if self.recorder is not None:
+            self.recorder.flush()
 
-        tick = self.broker.get_tick()
-        if tick:
-            self.position_manager.update_price(tick)
+    def on_tick(self, event: TickEvent):
+        """Feed streamed ticks to the candles and mark positions to the last"""
+        buffer = self.tick_stream.buffers[event.symbol]
+        ticks = buffer.since(event.first_seq, event.seq + 1)
+        with self.lock:
+            self.candle_managers[event.symbol].on_ticks(ticks)
+        if self.recorder is not None:
+            self.recorder.write_ticks(event.symbol, *ticks)
+        tick = buffer.last
+        self.ticks[event.symbol] = tick
+        self.position_manager.update_price(tick, event.symbol)
 
     # Helper / Converter
     def _trend_to_text(self, trend):
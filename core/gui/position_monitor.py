@@ -12,10 +12,11 @@ class PositionMonitor(tk.Tk):
         self.state = state
         self.refresh_ms = refresh_ms
         self.title("TradeManager - Open Positions")
-        self.geometry("800x200")
+        self.geometry("890x200")
 
         columns = (
             "id",
+            "symbol",
             "type",
             "open",
             "current",
@@ -46,6 +47,7 @@ class PositionMonitor(tk.Tk):
                 tk.END,
                 values=(
                     pos.id,
+                    pos.symbol,
                     "BUY" if pos.direction == 1 else "SELL",
                     f"{pos.entry_price:.2f}",
                     f"{pos.current_price:.2f}",
@@ -1,10 +1,28 @@
-from .mt5_client import MT5Client
+from .order_gateway import OrderGateway
+from .sim_broker import SimBroker
 
 
 class BrokerFactory:
     @staticmethod
     def create(config):
-        broker = MT5Client(config)
+        if config.BROKER in ("SIM", "REPLAY"):
+            load = (
+                SimBroker.from_directory
+                if config.BROKER == "SIM"
+                else SimBroker.from_recording
+            )
+            broker = load(
+                config,
+                config.SIM_DATA_DIR,
+                spread_points=config.SIM_SPREAD_POINTS,
+                slippage_points=config.SIM_SLIPPAGE_POINTS,
+                warmup_bars=config.SIM_WARMUP_BARS,
+            )
+        else:
+            # Imported here, MetaTrader5 only installs on Windows
+            from .mt5_client import MT5Client
+
+            broker = MT5Client(config)
         if broker.connect():
             return broker
         raise ConnectionError("Failed to connect to broker")
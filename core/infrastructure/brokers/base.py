@@ -1,22 +1,46 @@
+import time
 from abc import ABC, abstractmethod
 from typing import Any, Dict, List, Optional
 
 
 class BaseBroker(ABC):
+    realtime = True  # False when the broker replays data as fast as it is read
+    order_attempts = 1  # Sends per order call, retries happen in place above 1
+    retryable_retcodes = frozenset()  # Retcodes worth sending again
+    last_retcode = None  # Retcode of the latest order call, None if nothing was sent
+
+    @property
+    def now(self) -> float:
+        """Epoch seconds of the market, the replayed time in replays."""
+        return time.time()
+
+    def advance(self) -> bool:
+        """Move a replayed market forward, False once it is exhausted."""
+        return True
+
+    def get_ticks_since(self, since_msc, count, symbol=None):
+        """Up to ``count`` ticks from ``since_msc`` on (a structured array
+        with ``time_msc``, ``bid``, ``ask`` and ``volume``), None when the
+        broker keeps no tick history."""
+        return None
+
+    def invalidate_positions(self):
+        """Drop cached positions so the next query reads the terminal."""
+
     @abstractmethod
     def connect(self) -> bool: ...
     @abstractmethod
-    def get_tick(self): ...
+    def get_tick(self, symbol=None): ...
     @abstractmethod
     def get_candles(
-        self, timeframe: str, count: int
+        self, timeframe: str, count: int, symbol=None
     ) -> Optional[List[Dict[str, Any]]]: ...
     @abstractmethod
     def get_historical_candles(
-        self, timeframe, start_time, end_time
+        self, timeframe, start_time, end_time, symbol=None
     ) -> Optional[List[Dict[str, Any]]]: ...
     @abstractmethod
-    def add_order(self, direction, volume, sl, tp, comment): ...
+    def add_order(self, direction, volume, sl, tp, comment, symbol=None): ...
     @abstractmethod
     def modify_position(self, position, new_sl, new_tp): ...
     @abstractmethod
@@ -24,7 +48,7 @@ class BaseBroker(ABC):
     @abstractmethod
     def close_position(self, position): ...
     @abstractmethod
-    def get_pip_value(self) -> float: ...
+    def get_pip_value(self, symbol=None) -> float: ...
     @abstractmethod
     def get_account_info(self) -> tuple[float, float]: ...
     @abstractmethod
@@ -0,0 +1,74 @@
+import time
+from collections import namedtuple
+
+# Symbol properties that do not change while the terminal is connected
+SymbolSpec = namedtuple(
+    "SymbolSpec", "point digits contract_size volume_min volume_max volume_step"
+)
+
+
+class MarketDataCache:
+    """Caches symbol specs until refreshed and ticks for ``tick_ttl`` seconds.
+
+    ``fetch_tick`` and ``fetch_spec`` are called with a symbol on a miss; a
+    None result is returned but not cached.
+    """
+
+    def __init__(self, fetch_tick, fetch_spec, tick_ttl=0.5, clock=time.monotonic):
+        self.fetch_tick = fetch_tick
+        self.fetch_spec = fetch_spec
+        self.tick_ttl = tick_ttl
+        self.clock = clock
+        self._ticks = {}  # symbol -> (fetched at, tick)
+        self._specs = {}
+        self.counters = {
+            "tick_hits": 0,
+            "tick_misses": 0,
+            "spec_hits": 0,
+            "spec_misses": 0,
+        }
+
+    def tick(self, symbol):
+        cached = self._ticks.get(symbol)
+        if cached is not None and self.clock() - cached[0] < self.tick_ttl:
+            self.counters["tick_hits"] += 1
+            return cached[1]
+        return self.refresh_tick(symbol)
+
+    def refresh_tick(self, symbol):
+        """Fetch ``symbol``'s tick now, regardless of its age."""
+        self.counters["tick_misses"] += 1
+        tick = self.fetch_tick(symbol)
+        if tick:
+            self._ticks[symbol] = (self.clock(), tick)
+        else:
+            self._ticks.pop(symbol, None)
+        return tick
+
+    def spec(self, symbol):
+        spec = self._specs.get(symbol)
+        if spec is not None:
+            self.counters["spec_hits"] += 1
+            return spec
+        return self.refresh_spec(symbol)
+
+    def refresh_spec(self, symbol):
+        self.counters["spec_misses"] += 1
+        spec = self.fetch_spec(symbol)
+        if spec is not None:
+            self._specs[symbol] = spec
+        return spec
+
+    def invalidate(self, symbol=None):
+        """Forget cached ticks of ``symbol``, or of every symbol when None."""
+        if symbol is None:
+            self._ticks.clear()
+        else:
+            self._ticks.pop(symbol, None)
+
+    def stats(self) -> dict:
+        stats = dict(self.counters)
+        for kind in ("tick", "spec"):
+            total = stats[f"{kind}_hits"] + stats[f"{kind}_misses"]
+            stats[f"{kind}_hit_rate"] = stats[f"{kind}_hits"] / total if total else 0.0
+        return stats
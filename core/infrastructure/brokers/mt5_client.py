@@ -1,19 +1,39 @@
-import logging
 import time
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timezone
 
 import MetaTrader5 as mt5
+import numpy as np
 
 from config.settings import Settings
 from core.utilities.logger import logger
+from core.utilities.profiler import profiler
 
 from .base import BaseBroker
+from .market_data_cache import MarketDataCache, SymbolSpec
+from .position_snapshot import PositionSnapshot
+
+
+def _timed(name, fn, *args):
+    """``fn(*args)``, its latency recorded as the profiler phase ``name``"""
+    start = time.perf_counter()
+    try:
+        return fn(*args)
+    finally:
+        profiler.record(name, time.perf_counter() - start)
 
 
 class MT5Client(BaseBroker):
     def __init__(self, config: Settings):
         self.config = config
         self.connected = False
+        self._snapshot = None  # PositionSnapshot, read lazily once per loop
+        self.order_attempts = 3  # Set to 1 when an OrderGateway retries instead
+        self.retryable_retcodes = frozenset(
+            (mt5.TRADE_RETCODE_REQUOTE, mt5.TRADE_RETCODE_PRICE_CHANGED)
+        )
+        self.market_data = MarketDataCache(
+            self._fetch_tick, self._fetch_spec, config.TICK_CACHE_TTL
+        )
 
     def connect(self):
         if not mt5.initialize():  # type: ignore
@@ -31,65 +51,104 @@ class MT5Client(BaseBroker):
         self.connected = True
         return True
 
-    def get_tick(self):
-        return mt5.symbol_info_tick(self.config.SYMBOL)  # type: ignore
+    def _fetch_tick(self, symbol):
+        return _timed("mt5.symbol_info_tick", mt5.symbol_info_tick, symbol)
+
+    def _fetch_spec(self, symbol):
+        info = _timed("mt5.symbol_info", mt5.symbol_info, symbol)
+        if info is None:
+            return None
+        return SymbolSpec(
+            info.point,
+            info.digits,
+            info.trade_contract_size,
+            info.volume_min,
+            info.volume_max,
+            info.volume_step,
+        )
 
-    def get_candles(self, timeframe, count):
-        return mt5.copy_rates_from_pos(  # type: ignore
-            self.config.SYMBOL, timeframe, 0, count
+    def get_tick(self, symbol=None, refresh=False):
+        """Latest tick, at most TICK_CACHE_TTL seconds old unless ``refresh``"""
+        symbol = symbol or self.config.SYMBOL
+        if refresh:
+            return self.market_data.refresh_tick(symbol)
+        return self.market_data.tick(symbol)
+
+    def get_ticks_since(self, since_msc, count, symbol=None):
+        # None on failure, the caller then falls back to the latest tick
+        return _timed(
+            "mt5.copy_ticks_from",
+            mt5.copy_ticks_from,
+            symbol or self.config.SYMBOL,
+            datetime.fromtimestamp(since_msc // 1000, tz=timezone.utc),
+            count,
+            mt5.COPY_TICKS_ALL,
         )
 
-    def get_historical_candles(self, timeframe, start_time, end_time):
-        symbol = self.config.SYMBOL
-        results = []
-        chunk_size = timedelta(days=30)
-        gmt8 = timezone(timedelta(hours=8))
-        current_start = datetime.fromtimestamp(start_time, tz=gmt8)
-        end_dt = datetime.fromtimestamp(end_time, tz=gmt8)
-
-        while current_start < end_dt:
-            current_end = min(current_start + chunk_size, end_dt)
-            rates = mt5.copy_rates_range(  # type: ignore
+    def get_symbol_spec(self, symbol=None) -> SymbolSpec:
+        return self.market_data.spec(symbol or self.config.SYMBOL)
+
+    def get_candles(self, timeframe, count, symbol=None):
+        return _timed(
+            "mt5.copy_rates_from_pos",
+            mt5.copy_rates_from_pos,
+            symbol or self.config.SYMBOL,
+            timeframe,
+            0,
+            count,
+        )
+
+    def get_historical_candles(self, timeframe, start_time, end_time, symbol=None):
+        """Rates between two epoch times as one structured array, or None.
+
+        The range is read in 30-day chunks to stay under the terminal's bar
+        limit and the chunks are concatenated without per-row work.
+        """
+        symbol = symbol or self.config.SYMBOL
+        chunks = []
+        chunk_size = 30 * 86400
+        current_start = start_time
+
+        while current_start < end_time:
+            current_end = min(current_start + chunk_size, end_time)
+            rates = _timed(
+                "mt5.copy_rates_range",
+                mt5.copy_rates_range,
                 symbol,
                 timeframe,
-                current_start.astimezone(timezone.utc).replace(tzinfo=None),
-                current_end.astimezone(timezone.utc).replace(tzinfo=None),
+                datetime.fromtimestamp(current_start, tz=timezone.utc),
+                datetime.fromtimestamp(current_end, tz=timezone.utc),
             )
 
             if rates is not None:
-                for rate in rates:
-                    utc_time = datetime.utcfromtimestamp(rate["time"]).replace(
-                        tzinfo=timezone.utc
-                    )
-                    gmt8_time = utc_time.astimezone(gmt8)
-
-                    results.append(
-                        {
-                            "time": gmt8_time.timestamp(),
-                            "open": rate["open"],
-                            "high": rate["high"],
-                            "low": rate["low"],
-                            "close": rate["close"],
-                            "tick_volume": rate["tick_volume"],
-                        }
-                    )
+                if len(rates):
+                    chunks.append(rates)
             else:
                 error = mt5.last_error()  # type: ignore
                 logger.error(f"MT5 error ({error})")  # type: ignore
-            current_start = current_end + timedelta(seconds=1)
-            time.sleep(0.1)
-
-        return results
+            current_start = current_end + 1
 
-    def add_order(self, direction, volume, sl, tp, comment="None"):
+        if not chunks:
+            return None
+        rates = np.concatenate(chunks)
+        # Chunk edges are inclusive on both sides, keep increasing times only
+        keep = np.ones(len(rates), dtype=bool)
+        keep[1:] = rates["time"][1:] > np.maximum.accumulate(rates["time"])[:-1]
+        return rates[keep]
+
+    def add_order(self, direction, volume, sl, tp, comment="None", symbol=None):
+        self.last_retcode = None  # Stays None when nothing is sent
+        symbol = symbol or self.config.SYMBOL
         trade_type = mt5.ORDER_TYPE_BUY if direction == 1 else mt5.ORDER_TYPE_SELL
-        for _ in range(3):
-
-            tick = self.get_tick()
+        for attempt in range(self.order_attempts):
+            # A requote means the cached price is stale
+            tick = self.get_tick(symbol, refresh=attempt > 0)
+            if not tick:
+                return None
             price = tick.ask if direction == 1 else tick.bid
             request = {
                 "action": mt5.TRADE_ACTION_DEAL,
-                "symbol": self.config.SYMBOL,
+                "symbol": symbol,
                 "volume": volume,
                 "type": trade_type,
                 "price": price,
@@ -102,27 +161,26 @@ class MT5Client(BaseBroker):
                 "type_filling": mt5.ORDER_FILLING_IOC,
             }
 
-            result = mt5.order_send(request)  # type: ignore
+            result = _timed("mt5.order_send", mt5.order_send, request)
+            self.last_retcode = result.retcode if result else None
             if result:
                 if result.retcode == mt5.TRADE_RETCODE_DONE:
+                    self.invalidate_positions()
                     return result
                 else:
-                    logging.error(f"Error order send: {result.comment}")
+                    logger.error(f"Error order send: {result.comment}")
 
                 # Only retry if the error is due to a requote or temporary market condition
-                if result and result.retcode not in [
-                    mt5.TRADE_RETCODE_REQUOTE,
-                    mt5.TRADE_RETCODE_PRICE_CHANGED,
-                ]:
+                if result.retcode not in self.retryable_retcodes:
                     break
             else:
                 error = mt5.last_error()  # type: ignore
-                self.logger.error(f"Order failed: {error}")  # type: ignore
+                logger.error(f"Order failed: {error}")
                 return None
-                time.sleep(0.5)
         return None
 
     def modify_position(self, position_id, new_sl, new_tp):
+        self.last_retcode = None
         position = self.get_position_by_id(position_id, self.config.MAGIC_NUMBER)
         if position is not None:
             modify_request = {
@@ -136,34 +194,35 @@ class MT5Client(BaseBroker):
         return None
 
     def send_order(self, request):
-
+        self.last_retcode = None
         error_message = []
-        for attempt in range(3):
-            result = mt5.order_send(request)  # type: ignore
-            if result.retcode == mt5.TRADE_RETCODE_DONE:
+        for attempt in range(self.order_attempts):
+            result = _timed("mt5.order_send", mt5.order_send, request)
+            self.last_retcode = result.retcode if result else None
+            if result and result.retcode == mt5.TRADE_RETCODE_DONE:
+                self.invalidate_positions()
                 return result
 
             error_message.append(
                 f"Attempt {attempt + 1} failed: {result.comment if result else 'No result'}"
             )
 
-            if result and result.retcode not in [
-                mt5.TRADE_RETCODE_REQUOTE,
-                mt5.TRADE_RETCODE_PRICE_CHANGED,
-            ]:
+            if result and result.retcode not in self.retryable_retcodes:
                 break
-            time.sleep(0.5)
+            if attempt + 1 < self.order_attempts:
+                time.sleep(0.5)
 
         if error_message is not None:
             logger.error(error_message)
         return None
 
     def close_position(self, position_id):
-        tick = self.get_tick()
-        if not tick:
-            return False
+        self.last_retcode = None
         position = self.get_position_by_id(position_id, self.config.MAGIC_NUMBER)
         if position is not None:
+            tick = self.get_tick(position.symbol)
+            if not tick:
+                return False
             price = tick.ask if position.type == mt5.ORDER_TYPE_BUY else tick.bid
             request = {
                 "action": mt5.TRADE_ACTION_DEAL,
@@ -181,47 +240,47 @@ class MT5Client(BaseBroker):
             return self.send_order(request)
         return False
 
-    def get_pip_value(self):
-        symbol_info = mt5.symbol_info(self.config.SYMBOL)  # type: ignore
-        return symbol_info.point
+    def get_pip_value(self, symbol=None):
+        return self.get_symbol_spec(symbol).point
 
     def get_account_info(self):
         try:
-            account_info = mt5.account_info()  # type: ignore
+            account_info = _timed("mt5.account_info", mt5.account_info)
             if account_info:
                 return account_info.balance, account_info.equity
         except Exception as e:
             logger.error(f"Failed to get account info: {e}")
         return 0, 0
 
+    def invalidate_positions(self):
+        self._snapshot = None
+
+    def positions_snapshot(self) -> PositionSnapshot:
+        """Every open position, queried once until invalidated."""
+        if self._snapshot is None:
+            try:
+                positions = _timed("mt5.positions_get", mt5.positions_get)
+            except Exception as e:
+                logger.error(f"Error getting positions: {e}")
+                return PositionSnapshot(())
+            if positions is None:
+                # Do not cache a failed query, the next lookup retries it
+                return PositionSnapshot(())
+            self._snapshot = PositionSnapshot(positions)
+        return self._snapshot
+
     def get_position_by_id(self, position_id, magic=None):
         if magic is None:
             magic = self.config.MAGIC_NUMBER
-        try:
-            all_positions = mt5.positions_get(magic=magic)  # type: ignore
-            if all_positions is None:
-                return None
-
-            for pos in all_positions:
-                if pos.ticket == position_id:
-                    return pos
-
-            return None
-        except:
-            return None
+        return self.positions_snapshot().get(position_id, magic)
 
     def get_positions(self, symbol=None, magic=None):
+        """Positions of ``symbol`` (default SYMBOL), ``""`` for every symbol."""
         if magic is None:
             magic = self.config.MAGIC_NUMBER
         if symbol is None:
             symbol = self.config.SYMBOL
-
-        try:
-            if symbol:
-                return mt5.positions_get(symbol=symbol, magic=magic)  # type: ignore
-            return mt5.positions_get(magic=magic)  # type: ignore
-        except:
-            return None
+        return self.positions_snapshot().of_symbol(magic, symbol)
 
     def has_open_position(self, direction):
         positions = self.get_positions(self.config.SYMBOL, magic=666) or []
@@ -237,17 +296,11 @@ class MT5Client(BaseBroker):
             magic = self.config.MAGIC_NUMBER
         if symbol is None:
             symbol = self.config.SYMBOL
-
-        try:
-            positions = mt5.positions_get(symbol=symbol, magic=magic)  # type: ignore
-            if positions is None:
-                return []
-            return [pos for pos in positions if pos.comment == comment]
-
-        except Exception as e:
-            logger.error(f"Error getting positions by comment: {e}")
-            return []
+        return list(self.positions_snapshot().of_comment(magic, symbol, comment))
 
     def has_positions_by_comment(self, comment, symbol=None, magic=None):
-        positions = self.get_positions_by_comment(comment, symbol, magic)
-        return len(positions) > 0
+        if magic is None:
+            magic = self.config.MAGIC_NUMBER
+        if symbol is None:
+            symbol = self.config.SYMBOL
+        return bool(self.positions_snapshot().of_comment(magic, symbol, comment))
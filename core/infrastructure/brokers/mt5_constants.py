@@ -0,0 +1,24 @@
+"""MetaTrader 5 constants, repeated so replays and tests run without the
+terminal's Windows-only ``MetaTrader5`` package. Values match the package."""
+
+TIMEFRAME_M1 = 1
+TIMEFRAME_M5 = 5
+TIMEFRAME_M15 = 15
+TIMEFRAME_M30 = 30
+TIMEFRAME_H1 = 16385
+TIMEFRAME_H4 = 16388
+TIMEFRAME_D1 = 16408
+
+ORDER_TYPE_BUY = 0
+ORDER_TYPE_SELL = 1
+ORDER_TIME_GTC = 0
+ORDER_FILLING_IOC = 1
+TRADE_ACTION_DEAL = 1
+TRADE_ACTION_SLTP = 6
+
+TRADE_RETCODE_REQUOTE = 10004
+TRADE_RETCODE_DONE = 10009
+TRADE_RETCODE_INVALID = 10013
+TRADE_RETCODE_PRICE_CHANGED = 10020
+
+COPY_TICKS_ALL = -1
@@ -0,0 +1,206 @@
+import queue
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+from core.utilities.event_bus import EventBus
+from core.utilities.logger import logger
+from core.utilities.profiler import profiler
+from core.utilities.wakeup import Wakeup
+from models import OrderEvent
+
+from .base import BaseBroker
+
+
+@dataclass
+class OrderIntent:
+    kind: str
+    call: Callable[[], Any]
+    symbol: Optional[str] = None
+    comment: Optional[str] = None
+    position_id: Optional[int] = None
+    on_done: Optional[Callable[[OrderEvent], None]] = None
+    future: Future = field(default_factory=Future)
+
+
+class OrderGateway:
+    """Sends orders from a worker thread so retries never block the loop.
+
+    Open, modify and close intents are queued and sent with up to
+    ``max_attempts`` tries, backing off exponentially on the broker's
+    retryable retcodes. The futures resolve on the worker; ``dispatch``
+    runs on the main loop, publishing ``ORDER_RESULT`` and calling the
+    ``on_done`` callbacks there. Non-realtime brokers are served inline.
+    """
+
+    def __init__(
+        self,
+        broker: BaseBroker,
+        bus: EventBus,
+        max_attempts: int = 3,
+        backoff: float = 0.25,
+        wakeup: Wakeup | None = None,
+    ):
+        self.broker = broker
+        self.bus = bus
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.wakeup = wakeup
+        self.inline = not broker.realtime
+        broker.order_attempts = 1  # The gateway owns the retries
+
+        self._intents = queue.Queue()
+        self._done = queue.Queue()
+        self._pending = Counter()  # (symbol, comment) of queued opens
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+        self.counters = Counter()
+        self.latencies = deque(maxlen=1000)  # Seconds per attempt
+
+    def start(self):
+        if self.inline or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._worker, name="order-gateway", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout=5.0):
+        """Finish queued intents, then stop the worker."""
+        if self._thread is None:
+            return
+        self._intents.put(None)
+        self._thread.join(timeout)
+        self._stop.set()
+        self._thread = None
+        self.dispatch()
+
+    # Intents
+    def open(
+        self, direction, volume, sl, tp, comment, symbol=None, on_done=None
+    ) -> Future:
+        intent = OrderIntent(
+            "open",
+            lambda: self.broker.add_order(direction, volume, sl, tp, comment, symbol),
+            symbol,
+            comment,
+            on_done=on_done,
+        )
+        with self._lock:
+            self._pending[(symbol, comment)] += 1
+        return self._submit(intent)
+
+    def modify(self, position_id, sl, tp, on_done=None) -> Future:
+        intent = OrderIntent(
+            "modify",
+            lambda: self.broker.modify_position(position_id, sl, tp),
+            position_id=position_id,
+            on_done=on_done,
+        )
+        return self._submit(intent)
+
+    def close(self, position_id, on_done=None) -> Future:
+        intent = OrderIntent(
+            "close",
+            lambda: self.broker.close_position(position_id),
+            position_id=position_id,
+            on_done=on_done,
+        )
+        return self._submit(intent)
+
+    def has_pending(self, comment, symbol=None) -> bool:
+        """True while an open for ``comment`` on ``symbol`` awaits dispatch."""
+        with self._lock:
+            return self._pending[(symbol, comment)] > 0
+
+    def _submit(self, intent: OrderIntent) -> Future:
+        self.counters["submitted"] += 1
+        if self.inline:
+            self._execute(intent)
+            self.dispatch()
+        else:
+            self._intents.put(intent)
+        return intent.future
+
+    # Worker
+    def _worker(self):
+        while True:
+            intent = self._intents.get()
+            if intent is None:
+                return
+            self._execute(intent)
+
+    def _execute(self, intent: OrderIntent):
+        latencies = []
+        result = None
+        for attempt in range(self.max_attempts):
+            start = time.perf_counter()
+            try:
+                result = intent.call()
+            except Exception as e:
+                logger.error(f"Order {intent.kind} failed: {e}")
+                result = None
+            latencies.append(time.perf_counter() - start)
+            profiler.record(f"order.{intent.kind}", latencies[-1])
+
+            if result or self.broker.last_retcode not in self.broker.retryable_retcodes:
+                break
+            if attempt + 1 < self.max_attempts:
+                self.counters["retries"] += 1
+                if self._stop.wait(self.backoff * 2**attempt):
+                    break
+
+        self.latencies.extend(latencies)
+        position_id = intent.position_id
+        if intent.kind == "open" and result:
+            position_id = result.order
+        event = OrderEvent(
+            kind=intent.kind,
+            symbol=intent.symbol,
+            comment=intent.comment,
+            position_id=position_id,
+            ok=bool(result),
+            result=result or None,
+            retcode=self.broker.last_retcode,
+            latencies=tuple(latencies),
+        )
+        self.counters["sent" if event.ok else "failed"] += 1
+        intent.future.set_result(event)
+        self._done.put((intent, event))
+        if self.wakeup is not None and not self.inline:
+            self.wakeup.notify()
+
+    # Main loop
+    def dispatch(self) -> int:
+        """Publish finished intents on the calling thread."""
+        count = 0
+        while True:
+            try:
+                intent, event = self._done.get_nowait()
+            except queue.Empty:
+                return count
+            count += 1
+            if intent.kind == "open":
+                with self._lock:
+                    self._pending[(intent.symbol, intent.comment)] -= 1
+            if intent.on_done is not None:
+                try:
+                    intent.on_done(event)
+                except Exception as e:
+                    logger.exception(f"Order callback failed: {e}")
+            self.bus.publish("ORDER_RESULT", event)
+
+    def stats(self) -> dict:
+        latencies = sorted(self.latencies)
+        stats = dict(self.counters)
+        stats["queued"] = self._intents.qsize()
+        if latencies:
+            stats["latency_p50_ms"] = latencies[len(latencies) // 2] * 1000
+            stats["latency_max_ms"] = latencies[-1] * 1000
+        return stats
@@ -0,0 +1,48 @@
+from collections import defaultdict
+
+
+class PositionSnapshot:
+    """Open positions read once from the terminal and indexed for lookups.
+
+    Strategies tag their orders with their name as comment, so the comment
+    index doubles as the per-strategy index.
+    """
+
+    __slots__ = ("positions", "by_ticket", "by_symbol", "by_comment", "by_magic")
+
+    def __init__(self, positions):
+        self.positions = tuple(positions or ())
+        self.by_ticket = {}
+        by_symbol = defaultdict(list)
+        by_comment = defaultdict(list)
+        by_magic = defaultdict(list)
+        for pos in self.positions:
+            self.by_ticket[pos.ticket] = pos
+            by_symbol[(pos.magic, pos.symbol)].append(pos)
+            by_comment[(pos.magic, pos.symbol, pos.comment)].append(pos)
+            by_magic[pos.magic].append(pos)
+        self.by_symbol = {key: tuple(value) for key, value in by_symbol.items()}
+        self.by_comment = {key: tuple(value) for key, value in by_comment.items()}
+        self.by_magic = {key: tuple(value) for key, value in by_magic.items()}
+
+    def __len__(self):
+        return len(self.positions)
+
+    def get(self, ticket, magic=None):
+        pos = self.by_ticket.get(ticket)
+        if pos is None or (magic is not None and pos.magic != magic):
+            return None
+        return pos
+
+    def of_symbol(self, magic, symbol=""):
+        """Positions of ``magic`` on ``symbol``, every symbol when empty."""
+        if not symbol:
+            return self.by_magic.get(magic, ())
+        return self.by_symbol.get((magic, symbol), ())
+
+    def of_comment(self, magic, symbol, comment):
+        if not symbol:
+            return tuple(
+                pos for pos in self.by_magic.get(magic, ()) if pos.comment == comment
+            )
+        return self.by_comment.get((magic, symbol, comment), ())
@@ -0,0 +1,376 @@
+import itertools
+import os
+from collections import namedtuple
+from dataclasses import dataclass
+
+import numpy as np
+
+from config.settings import Settings
+from core.infrastructure.recorder import MarketReader
+from core.utilities.logger import logger
+
+from .base import BaseBroker
+from .mt5_constants import (
+    ORDER_TYPE_BUY,
+    ORDER_TYPE_SELL,
+    TRADE_ACTION_DEAL,
+    TRADE_ACTION_SLTP,
+    TRADE_RETCODE_DONE,
+    TRADE_RETCODE_INVALID,
+)
+from .timeframes import TIMEFRAME_SECONDS
+
+RATE_DTYPE = np.dtype(
+    [
+        ("time", "i8"),
+        ("open", "f8"),
+        ("high", "f8"),
+        ("low", "f8"),
+        ("close", "f8"),
+        ("tick_volume", "u8"),
+        ("spread", "i4"),
+        ("real_volume", "u8"),
+    ]
+)
+
+Tick = namedtuple("Tick", "time bid ask last volume time_msc")
+OrderResult = namedtuple("OrderResult", "retcode order price volume comment request")
+
+
+@dataclass
+class SimPosition:
+    """Open position with the attributes of an MT5 ``TradePosition``."""
+
+    ticket: int
+    time: int
+    type: int
+    magic: int
+    volume: float
+    price_open: float
+    sl: float
+    tp: float
+    price_current: float
+    profit: float
+    symbol: str
+    comment: str
+
+
+def load_rates(path) -> np.ndarray:
+    """Load M1 rates saved as a structured array or as a CandleStore file."""
+    data = np.load(path)
+    if data.dtype.names:
+        return data
+
+    # CandleStore layout: (6, 2 * capacity) mirrored columns plus a count
+    meta_path = path[: -len(".npy")] + ".meta.npy"
+    count = int(np.load(meta_path)[0])
+    capacity = data.shape[1] // 2
+    size = min(count, capacity)
+    end = (count - 1) % capacity + capacity + 1
+    columns = data[:, end - size : end]
+    rates = np.zeros(size, dtype=RATE_DTYPE)
+    for i, name in enumerate(("time", "open", "high", "low", "close", "tick_volume")):
+        rates[name] = columns[i]
+    return rates
+
+
+class SimBroker(BaseBroker):
+    """Replay broker filling orders against recorded M1 bars.
+
+    Every ``advance`` moves the clock to the next M1 bar of any symbol. The
+    tick is that bar's close as bid with ``spread_points`` added for the ask,
+    fills pay ``slippage_points`` against the trader, and SL/TP are checked
+    against the bar's high and low. Higher timeframes are aggregated from
+    M1, the current bucket being returned as the forming bar.
+    """
+
+    realtime = False
+
+    def __init__(
+        self,
+        config: Settings,
+        rates: dict[str, np.ndarray],
+        spread_points: int = 20,
+        slippage_points: int = 0,
+        point: float = 0.01,
+        contract_size: float = 100.0,
+        balance: float = 10000.0,
+        warmup_bars: int = 1440,
+    ):
+        self.config = config
+        self.connected = False
+        self.spread_points = spread_points
+        self.slippage_points = slippage_points
+        self.point = point
+        self.contract_size = contract_size
+        self.balance = balance
+
+        self.rates = {symbol: np.sort(r, order="time") for symbol, r in rates.items()}
+        self.clock = np.unique(np.concatenate([r["time"] for r in self.rates.values()]))
+        self.step = min(warmup_bars, len(self.clock) - 1)
+        self._index = {}  # Current M1 row per symbol
+        self._buckets = {}  # (symbol, timeframe) -> aggregated bars
+        self.positions: dict[int, SimPosition] = {}
+        self.history = []
+        self._tickets = itertools.count(1)
+        self._sync_index()
+
+    @classmethod
+    def from_directory(cls, config: Settings, base_dir: str, **kwargs):
+        """Load ``<base_dir>/<symbol>/M1.npy`` for SYMBOL and SYMBOLS."""
+        symbols = [config.SYMBOL] + [s for s in config.SYMBOLS if s != config.SYMBOL]
+        rates = {}
+        for symbol in symbols:
+            path = os.path.join(base_dir, symbol, "M1.npy")
+            if os.path.exists(path):
+                rates[symbol] = load_rates(path)
+            else:
+                logger.warning(f"No replay data for {symbol} at {path}")
+        if not rates:
+            raise FileNotFoundError(f"No replay data in {base_dir}")
+        return cls(config, rates, **kwargs)
+
+    @classmethod
+    def from_recording(cls, config: Settings, base_dir: str, **kwargs):
+        """Replay the M1 bars a ``MarketRecorder`` wrote to ``base_dir``."""
+        reader = MarketReader(base_dir)
+        rates = {}
+        for symbol in reader.symbols():
+            bars = reader.read(symbol, timeframe=1)
+            if len(bars):
+                rates[symbol] = np.zeros(len(bars), dtype=RATE_DTYPE)
+                for name in bars.dtype.names:
+                    rates[symbol][name] = bars[name]
+        if not rates:
+            raise FileNotFoundError(f"No recorded M1 bars in {base_dir}")
+        return cls(config, rates, **kwargs)
+
+    @property
+    def now(self) -> int:
+        return int(self.clock[self.step])
+
+    def _sync_index(self):
+        for symbol, rates in self.rates.items():
+            self._index[symbol] = int(
+                np.searchsorted(rates["time"], self.now, side="right") - 1
+            )
+
+    def advance(self) -> bool:
+        """Step to the next M1 bar, False once the data is exhausted."""
+        if self.step + 1 >= len(self.clock):
+            return False
+        self.step += 1
+        self._sync_index()
+        self._check_stops()
+        return True
+
+    # Market data
+    def _symbol(self, symbol):
+        return symbol or self.config.SYMBOL
+
+    def _bar(self, symbol):
+        index = self._index.get(symbol, -1)
+        if index < 0:
+            return None
+        return self.rates[symbol][index]
+
+    def connect(self):
+        self.connected = True
+        return True
+
+    def get_tick(self, symbol=None):
+        bar = self._bar(self._symbol(symbol))
+        if bar is None:
+            return None
+        bid = float(bar["close"])
+        ask = bid + self.spread_points * self.point
+        return Tick(self.now, bid, ask, bid, int(bar["tick_volume"]), self.now * 1000)
+
+    def _aggregate(self, symbol, timeframe):
+        key = (symbol, timeframe)
+        if key not in self._buckets:
+            rates = self.rates[symbol]
+            seconds = TIMEFRAME_SECONDS[timeframe]
+            buckets = rates["time"] // seconds * seconds
+            starts = np.flatnonzero(np.r_[True, np.diff(buckets) != 0])
+            self._buckets[key] = (buckets[starts], starts)
+        return self._buckets[key]
+
+    def _rates_between(self, symbol, timeframe, first, last):
+        """Bars of ``timeframe`` over M1 rows ``first..last``, last one forming.
+
+        ``first`` must be the first row of a bucket.
+        """
+        rates = self.rates[symbol][first : last + 1]
+        if timeframe == 1:
+            return rates
+        times, starts = self._aggregate(symbol, timeframe)
+        selected = (starts >= first) & (starts <= last)
+        offsets = starts[selected] - first
+        bars = np.zeros(len(offsets), dtype=RATE_DTYPE)
+        bars["time"] = times[selected]
+        bars["open"] = rates["open"][offsets]
+        bars["high"] = np.maximum.reduceat(rates["high"], offsets)
+        bars["low"] = np.minimum.reduceat(rates["low"], offsets)
+        bars["close"] = rates["close"][np.r_[offsets[1:] - 1, len(rates) - 1]]
+        bars["tick_volume"] = np.add.reduceat(rates["tick_volume"], offsets)
+        return bars
+
+    def get_candles(self, timeframe, count, symbol=None):
+        symbol = self._symbol(symbol)
+        index = self._index.get(symbol, -1)
+        if index < 0:
+            return None
+        if timeframe == 1:
+            return self.rates[symbol][max(0, index - count + 1) : index + 1]
+
+        # Aggregate only the M1 rows the requested bars cover
+        _, starts = self._aggregate(symbol, timeframe)
+        current = int(np.searchsorted(starts, index, side="right") - 1)
+        first = int(starts[max(0, current - count + 1)])
+        return self._rates_between(symbol, timeframe, first, index)
+
+    def get_historical_candles(self, timeframe, start_time, end_time, symbol=None):
+        symbol = self._symbol(symbol)
+        rates = self.rates[symbol]
+        index = int(np.searchsorted(rates["time"], end_time, side="right") - 1)
+        if index < 0:
+            return None
+        bars = self._rates_between(symbol, timeframe, 0, index)
+        return bars[bars["time"] >= start_time]
+
+    def get_pip_value(self, symbol=None):
+        return self.point
+
+    def get_account_info(self):
+        floating = sum(p.profit for p in self.positions.values())
+        return self.balance, self.balance + floating
+
+    # Orders
+    def _fill_price(self, symbol, order_type):
+        tick = self.get_tick(symbol)
+        slippage = self.slippage_points * self.point
+        if order_type == ORDER_TYPE_BUY:
+            return tick.ask + slippage
+        return tick.bid - slippage
+
+    def _result(self, retcode, order=0, price=0.0, volume=0.0, request=None):
+        comment = "Request executed" if retcode == TRADE_RETCODE_DONE else "Invalid"
+        self.last_retcode = retcode
+        return OrderResult(retcode, order, price, volume, comment, request)
+
+    def add_order(self, direction, volume, sl, tp, comment="None", symbol=None):
+        self.last_retcode = None  # Stays None when nothing is sent
+        symbol = self._symbol(symbol)
+        if self._bar(symbol) is None:
+            return None
+        order_type = ORDER_TYPE_BUY if direction == 1 else ORDER_TYPE_SELL
+        price = self._fill_price(symbol, order_type)
+        ticket = next(self._tickets)
+        self.positions[ticket] = SimPosition(
+            ticket=ticket,
+            time=self.now,
+            type=order_type,
+            magic=self.config.MAGIC_NUMBER,
+            volume=volume,
+            price_open=price,
+            sl=sl,
+            tp=tp,
+            price_current=price,
+            profit=0.0,
+            symbol=symbol,
+            comment=comment[:31],
+        )
+        return self._result(TRADE_RETCODE_DONE, ticket, price, volume)
+
+    def modify_position(self, position_id, new_sl, new_tp):
+        return self.send_order(
+            {
+                "action": TRADE_ACTION_SLTP,
+                "position": position_id,
+                "sl": new_sl,
+                "tp": new_tp,
+            }
+        )
+
+    def send_order(self, request):
+        position = self.positions.get(request.get("position"))
+        if request.get("action") == TRADE_ACTION_SLTP and position is not None:
+            position.sl = request.get("sl", position.sl)
+            position.tp = request.get("tp", position.tp)
+            return self._result(TRADE_RETCODE_DONE, position.ticket, request=request)
+        if request.get("action") == TRADE_ACTION_DEAL and position is not None:
+            close_type = 1 - position.type
+            price = self._fill_price(position.symbol, close_type)
+            self._close(position, price, request.get("comment", ""))
+            return self._result(
+                TRADE_RETCODE_DONE, position.ticket, price, position.volume, request
+            )
+        return self._result(TRADE_RETCODE_INVALID, request=request)
+
+    def close_position(self, position_id):
+        self.last_retcode = None
+        position = self.positions.get(position_id)
+        if position is None:
+            return False
+        return self.send_order(
+            {
+                "action": TRADE_ACTION_DEAL,
+                "position": position_id,
+                "comment": "Risk Close",
+            }
+        )
+
+    def _profit(self, position, price):
+        direction = 1 if position.type == ORDER_TYPE_BUY else -1
+        diff = (price - position.price_open) * direction
+        return diff * position.volume * self.contract_size
+
+    def _close(self, position, price, reason):
+        position.price_current = price
+        position.profit = self._profit(position, price)
+        self.balance += position.profit
+        self.positions.pop(position.ticket, None)
+        self.history.append((self.now, position, reason))
+
+    def _check_stops(self):
+        for position in list(self.positions.values()):
+            bar = self._bar(position.symbol)
+            if bar is None:
+                continue
+            bid = float(bar["close"])
+            if position.type == ORDER_TYPE_BUY:
+                if position.sl and bar["low"] <= position.sl:
+                    self._close(position, position.sl, "sl")
+                elif position.tp and bar["high"] >= position.tp:
+                    self._close(position, position.tp, "tp")
+                else:
+                    position.price_current = bid
+            else:
+                ask = bid + self.spread_points * self.point
+                if position.sl and bar["high"] + ask - bid >= position.sl:
+                    self._close(position, position.sl, "sl")
+                elif position.tp and bar["low"] + ask - bid <= position.tp:
+                    self._close(position, position.tp, "tp")
+                else:
+                    position.price_current = ask
+            if position.ticket in self.positions:
+                position.profit = self._profit(position, position.price_current)
+
+    # Positions
+    def get_position_by_id(self, position_id, magic=None):
+        return self.positions.get(position_id)
+
+    def get_positions(self, symbol=None, magic=None):
+        """Positions of ``symbol`` (default SYMBOL), ``""`` for every symbol."""
+        if symbol is None:
+            symbol = self.config.SYMBOL
+        return tuple(
+            p for p in self.positions.values() if not symbol or p.symbol == symbol
+        )
+
+    def get_positions_by_comment(self, comment, symbol=None, magic=None):
+        return [p for p in self.get_positions(symbol, magic) if p.comment == comment]
+
+    def has_positions_by_comment(self, comment, symbol=None, magic=None):
+        return len(self.get_positions_by_comment(comment, symbol, magic)) > 0
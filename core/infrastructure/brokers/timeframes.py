@@ -0,0 +1,20 @@
+from .mt5_constants import (
+    TIMEFRAME_D1,
+    TIMEFRAME_H1,
+    TIMEFRAME_H4,
+    TIMEFRAME_M1,
+    TIMEFRAME_M5,
+    TIMEFRAME_M15,
+    TIMEFRAME_M30,
+)
+
+# Bar length of every supported timeframe
+TIMEFRAME_SECONDS = {
+    TIMEFRAME_M1: 60,
+    TIMEFRAME_M5: 300,
+    TIMEFRAME_M15: 900,
+    TIMEFRAME_M30: 1800,
+    TIMEFRAME_H1: 3600,
+    TIMEFRAME_H4: 14400,
+    TIMEFRAME_D1: 86400,
+}
@@ -1,3 +1,16 @@
+from .bar_aggregator import BarAggregator
+from .candle_buffer import CandleBuffer
 from .candle_patterns import CandlestickPatterns
-from .candle_plotter import CandlePlotter
+from .candle_store import CandleStore
+from .indicator_engine import IndicatorEngine
+from .indicators import ATR, RSI, EWMAVolatility, ExpWeightedMA, StreamingIndicator
 from .manger import CandleManager
+
+
+def __getattr__(name):
+    # matplotlib and pandas load on the first plot, not with the package
+    if name == "CandlePlotter":
+        from .candle_plotter import CandlePlotter
+
+        return CandlePlotter
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,145 @@
+import numpy as np
+
+from .candle_buffer import CLOSE, HIGH, LOW, OPEN, VOLUME, CandleBuffer
+
+
+class BarAggregator:
+    """Build the base (M1) timeframe and derive every higher timeframe locally.
+
+    Timestamps are broker server time, so bucketing by the timeframe length
+    lines bars up with the broker's own. ``session_offset`` shifts the bucket
+    origin (in seconds) for servers whose trading day does not start at
+    midnight. Every ``on_*`` call returns the ``(timeframe, timestamp)`` of
+    the bars it closed so the caller can reconcile them with the broker.
+    """
+
+    def __init__(
+        self,
+        buffers: dict[int, CandleBuffer],
+        timeframe_seconds: dict[int, int],
+        base_timeframe: int,
+        session_offset: int = 0,
+    ):
+        self.buffers = buffers
+        self.timeframe_seconds = timeframe_seconds
+        self.base_timeframe = base_timeframe
+        self.session_offset = session_offset
+        self.derived = [tf for tf in buffers if tf != base_timeframe]
+
+    def bucket(self, timeframe, timestamp) -> int:
+        seconds = self.timeframe_seconds[timeframe]
+        offset = self.session_offset
+        return int((timestamp - offset) // seconds * seconds + offset)
+
+    def on_tick(self, timestamp, price, volume=1) -> list[tuple[int, int]]:
+        """Fold a tick into the forming base bar."""
+        base = self.buffers[self.base_timeframe]
+        bar_time = self.bucket(self.base_timeframe, timestamp)
+        if base and int(base.timestamps(1)[0]) == bar_time:
+            last = base.columns(1)[:, 0]
+            return self.on_bar(
+                bar_time,
+                price,
+                max(last[HIGH], price),
+                min(last[LOW], price),
+                price,
+                last[VOLUME] + volume,
+            )
+        return self.on_bar(bar_time, price, price, price, price, volume)
+
+    def on_bar(self, timestamp, open, high, low, close, volume):
+        """Apply a snapshot of a base bar, forming or just closed."""
+        closed = []
+        base = self.buffers[self.base_timeframe]
+        timestamp = int(timestamp)
+
+        if not base:
+            base.append(timestamp, open, high, low, close, volume)
+            delta_volume = volume
+        else:
+            last_timestamp = int(base.timestamps(1)[0])
+            if timestamp < last_timestamp:
+                return closed  # Already closed and reconciled
+            if timestamp == last_timestamp:
+                delta_volume = volume - base.volumes(1)[0]
+                base.update_last(high, low, close, volume)
+            else:
+                self._roll(base, last_timestamp, timestamp)
+                base.append(timestamp, open, high, low, close, volume)
+                delta_volume = volume
+                closed.append((self.base_timeframe, last_timestamp))
+
+        for timeframe in self.derived:
+            closed.extend(
+                self._apply(timeframe, timestamp, open, high, low, close, delta_volume)
+            )
+        return closed
+
+    def rebuild(self, timestamp) -> list[int]:
+        """Recompute the forming derived bars holding base bar ``timestamp``.
+
+        For a closed base bar overwritten after the fact (e.g. the broker's
+        values replacing a tick-built bar). Closed derived bars are left to
+        ``reconcile``; returns the timeframes rebuilt.
+        """
+        base = self.buffers[self.base_timeframe]
+        times = base.timestamps()
+        rebuilt = []
+        for timeframe in self.derived:
+            buffer = self.buffers[timeframe]
+            bar_time = self.bucket(timeframe, timestamp)
+            if not buffer or int(buffer.timestamps(1)[0]) != bar_time:
+                continue
+            if not len(times) or times[0] > bar_time:
+                continue  # Base bars do not cover the whole bucket
+            first, last = np.searchsorted(
+                times, (bar_time, bar_time + self.timeframe_seconds[timeframe])
+            )
+            bars = base.columns(len(times) - first)[:, : last - first]
+            buffer.replace(
+                -1,
+                bars[OPEN, 0],
+                bars[HIGH].max(),
+                bars[LOW].min(),
+                bars[CLOSE, -1],
+                bars[VOLUME].sum(),
+            )
+            rebuilt.append(timeframe)
+        return rebuilt
+
+    def _apply(self, timeframe, timestamp, open, high, low, close, delta_volume):
+        buffer = self.buffers[timeframe]
+        bar_time = self.bucket(timeframe, timestamp)
+
+        if not buffer:
+            buffer.append(bar_time, open, high, low, close, delta_volume)
+            return []
+
+        last = buffer.columns(1)[:, 0]
+        last_timestamp = int(last[0])
+        if bar_time == last_timestamp:
+            buffer.update_last(
+                max(last[HIGH], high),
+                min(last[LOW], low),
+                close,
+                last[VOLUME] + delta_volume,
+            )
+            return []
+        if bar_time < last_timestamp:
+            return []
+
+        self._roll(buffer, last_timestamp, bar_time)
+        buffer.append(bar_time, open, high, low, close, delta_volume)
+        return [(timeframe, last_timestamp)]
+
+    def _roll(self, buffer: CandleBuffer, last_timestamp, new_timestamp):
+        """Fill missing candles between last candle and new candle"""
+        seconds = self.timeframe_seconds.get(buffer.timeframe, 60)
+        if new_timestamp - last_timestamp <= seconds * 1.5:
+            return
+
+        last_close = buffer.closes(1)[0]
+        missing_count = int((new_timestamp - last_timestamp) // seconds) - 1
+        for i in range(1, missing_count + 1):
+            gap_time = last_timestamp + i * seconds
+            buffer.append(gap_time, last_close, last_close, last_close, last_close, 0)
@@ -0,0 +1,200 @@
+import numpy as np
+
+from models import Candle
+
+# Column layout of the buffer storage
+FIELDS = ("timestamp", "open", "high", "low", "close", "volume")
+TIMESTAMP, OPEN, HIGH, LOW, CLOSE, VOLUME = range(len(FIELDS))
+
+
+class CandleBuffer:
+    """Fixed capacity columnar ring buffer of OHLCV bars.
+
+    Every row is written twice (at ``i`` and ``i + capacity``) so the last
+    ``n`` bars are always one contiguous slice and can be returned as numpy
+    views without copying. Views alias the storage: they stay valid until
+    the buffer wraps over them, copy them if they must outlive the next bar.
+    """
+
+    def __init__(self, timeframe, capacity: int, data=None, meta=None):
+        """``data``/``meta`` let the buffer live in caller owned (e.g.
+        memory-mapped) arrays of shape ``(6, 2 * capacity)`` and ``(1,)``."""
+        if capacity <= 0:
+            raise ValueError("Capacity must be positive.")
+        self.timeframe = timeframe
+        self.capacity = capacity
+        if data is None:
+            data = np.zeros((len(FIELDS), 2 * capacity), dtype=np.float64)
+        if meta is None:
+            meta = np.zeros(1, dtype=np.int64)
+        if data.shape != (len(FIELDS), 2 * capacity):
+            raise ValueError(f"Storage shape {data.shape} does not fit capacity.")
+        self._data = data
+        self._meta = meta
+        self._count = int(meta[0])  # Total bars ever written
+        self.version = 0  # Bumped on every change
+
+    @property
+    def maxlen(self) -> int:
+        return self.capacity
+
+    def __len__(self) -> int:
+        return min(self._count, self.capacity)
+
+    def __bool__(self) -> bool:
+        return self._count > 0
+
+    def append(self, timestamp, open, high, low, close, volume):
+        """Append a bar, overwriting the oldest one when full."""
+        i = self._count % self.capacity
+        row = (timestamp, open, high, low, close, volume)
+        self._data[:, i] = row
+        self._data[:, i + self.capacity] = row
+        self._set_count(self._count + 1)
+
+    def extend(self, rates):
+        """Bulk append MT5 style rates (``time``/``tick_volume`` fields)."""
+        if rates is None or len(rates) == 0:
+            return
+        rates = rates[-self.capacity :]
+        n = len(rates)
+        columns = np.empty((len(FIELDS), n), dtype=np.float64)
+        columns[TIMESTAMP] = rates["time"]
+        columns[OPEN] = rates["open"]
+        columns[HIGH] = rates["high"]
+        columns[LOW] = rates["low"]
+        columns[CLOSE] = rates["close"]
+        columns[VOLUME] = rates["tick_volume"]
+
+        # Write in at most two runs, splitting where the ring wraps
+        start = self._count % self.capacity
+        first = min(n, self.capacity - start)
+        for offset in (0, self.capacity):
+            self._data[:, start + offset : start + offset + first] = columns[:, :first]
+            self._data[:, offset : offset + n - first] = columns[:, first:]
+        self._set_count(self._count + n)
+
+    def update_last(self, high, low, close, volume):
+        """Overwrite the forming (last) bar."""
+        if not self._count:
+            raise IndexError("Update on empty buffer.")
+        i = (self._count - 1) % self.capacity
+        bar = self._data[:, i]
+        if (bar[HIGH], bar[LOW], bar[CLOSE], bar[VOLUME]) == (high, low, close, volume):
+            return
+        self.version += 1
+        for j in (i, i + self.capacity):
+            self._data[HIGH, j] = high
+            self._data[LOW, j] = low
+            self._data[CLOSE, j] = close
+            self._data[VOLUME, j] = volume
+
+    def replace(self, index: int, open, high, low, close, volume):
+        """Overwrite the OHLCV values of the bar at ``index``."""
+        j = self._slot(index)
+        bar = self._data[:, j]
+        if tuple(bar[OPEN:]) == (open, high, low, close, volume):
+            return
+        self.version += 1
+        for k in (j, j + self.capacity):
+            self._data[OPEN, k] = open
+            self._data[HIGH, k] = high
+            self._data[LOW, k] = low
+            self._data[CLOSE, k] = close
+            self._data[VOLUME, k] = volume
+
+    def index_of(self, timestamp):
+        """Index of the bar opened at ``timestamp``, None when not buffered."""
+        timestamps = self.timestamps()
+        i = int(np.searchsorted(timestamps, timestamp))
+        if i < len(timestamps) and timestamps[i] == timestamp:
+            return i
+        return None
+
+    def clear(self):
+        self._set_count(0)
+
+    def _set_count(self, count: int):
+        self._count = count
+        self._meta[0] = count
+        self.version += 1
+
+    def _slot(self, index: int) -> int:
+        size = len(self)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("Candle index out of range.")
+        return (self._count - size + index) % self.capacity
+
+    def _window(self, count=None) -> slice:
+        size = len(self)
+        if count is None or count > size:
+            count = size
+        end = (self._count - 1) % self.capacity + self.capacity + 1
+        return slice(end - count, end)
+
+    def column(self, field: int, count=None) -> np.ndarray:
+        """Zero-copy view of the last ``count`` values of one column."""
+        return self._data[field, self._window(count)]
+
+    def columns(self, count=None) -> np.ndarray:
+        """Zero-copy ``(6, count)`` view of the last ``count`` bars."""
+        return self._data[:, self._window(count)]
+
+    def timestamps(self, count=None) -> np.ndarray:
+        return self.column(TIMESTAMP, count)
+
+    def opens(self, count=None) -> np.ndarray:
+        return self.column(OPEN, count)
+
+    def highs(self, count=None) -> np.ndarray:
+        return self.column(HIGH, count)
+
+    def lows(self, count=None) -> np.ndarray:
+        return self.column(LOW, count)
+
+    def closes(self, count=None) -> np.ndarray:
+        return self.column(CLOSE, count)
+
+    def volumes(self, count=None) -> np.ndarray:
+        return self.column(VOLUME, count)
+
+    # Candle compatible accessors for callers working with objects
+    def candle_at(self, index: int) -> Candle:
+        j = self._slot(index)
+        return Candle(
+            timestamp=int(self._data[TIMESTAMP, j]),
+            open=float(self._data[OPEN, j]),
+            high=float(self._data[HIGH, j]),
+            low=float(self._data[LOW, j]),
+            close=float(self._data[CLOSE, j]),
+            volume=float(self._data[VOLUME, j]),
+            timeframe=self.timeframe,
+        )
+
+    @property
+    def last(self) -> Candle:
+        return self.candle_at(-1)
+
+    def to_candles(self, count=None) -> list[Candle]:
+        data = self.columns(count).T.tolist()
+        return [
+            Candle(
+                timestamp=int(ts),
+                open=o,
+                high=h,
+                low=lo,
+                close=c,
+                volume=v,
+                timeframe=self.timeframe,
+            )
+            for ts, o, h, lo, c, v in data
+        ]
+
+    def __iter__(self):
+        return iter(self.to_candles())
+
+    @property
+    def nbytes(self) -> int:
+        return self._data.nbytes
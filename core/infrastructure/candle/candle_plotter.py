@@ -1,21 +1,27 @@
 import os
 from datetime import datetime
 
-import matplotlib.pyplot as plt
 import matplotlib.ticker as mticker
 import pandas as pd
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 from matplotlib.dates import DateFormatter
+from matplotlib.figure import Figure
 from matplotlib.patches import Rectangle
 
 from models import Candle
 
 
 class CandlePlotter:
+    """Candlestick chart on its own Agg figure.
+
+    pyplot and its global style are left alone, so strategies can plot from
+    worker threads; only ``plot(show=True)`` goes through pyplot.
+    """
+
     def __init__(self, title="Candlestick Chart", show_volume=False, dark_theme=True):
         self.title = title
         self.show_volume = show_volume
-        if dark_theme:
-            plt.style.use("dark_background")
+        self.dark_theme = dark_theme
 
         self.h_lines = []
         self.v_lines = []
@@ -23,11 +29,27 @@ class CandlePlotter:
         self._init_figure()
 
     def _init_figure(self):
-        self.fig, self.ax = plt.subplots(figsize=(12, 7))
+        self.fig = Figure(figsize=(12, 7))
+        FigureCanvasAgg(self.fig)
+        self.ax = self.fig.add_subplot()
         self.ax2 = self.ax.twinx()
+        if self.dark_theme:
+            self._apply_dark_theme()
         self.ax2.set_ylabel("Volume", color="gray")
         self.ax2.tick_params(axis="y", colors="gray")
 
+    def _apply_dark_theme(self):
+        # What the "dark_background" style sets, on this figure only
+        self.fig.set_facecolor("black")
+        self.ax.set_facecolor("black")
+        for ax in (self.ax, self.ax2):
+            for spine in ax.spines.values():
+                spine.set_edgecolor("white")
+            ax.tick_params(colors="white")
+            ax.xaxis.label.set_color("white")
+            ax.yaxis.label.set_color("white")
+        self.ax.title.set_color("white")
+
     def add_horizontal_line(self, price, **kwargs):
         self.h_lines.append(
             (price, {"color": "white", "linestyle": "--", "alpha": 0.7, **kwargs})
@@ -72,14 +94,23 @@ class CandlePlotter:
         self._style_plot()
 
         if show:
-            plt.show()
+            self._show()
 
         self._clear_annotations()
 
+    def _show(self):
+        """Display the figure in a pyplot window, main thread only."""
+        import matplotlib.pyplot as plt
+
+        manager = plt.figure(figsize=self.fig.get_size_inches()).canvas.manager
+        manager.canvas.figure = self.fig
+        self.fig.set_canvas(manager.canvas)
+        plt.show()
+        plt.close(manager.canvas.figure)
+
     def plot_and_save(self, candles: list[Candle], filename="candle_chart.png"):
         self.plot(candles, show=False)
         self.save(filename)
-        plt.close()
 
     def save(self, filename="candle_chart.png"):
         output_dir = "out/figure/"
@@ -145,8 +176,8 @@ class CandlePlotter:
         self.ax.set_title(self.title, fontsize=16, pad=20)
         self.ax.xaxis.set_major_formatter(DateFormatter("%m-%d %H:%M"))
         self.ax.xaxis.set_major_locator(mticker.MaxNLocator(10))
-        plt.xticks(rotation=45)
-        plt.tight_layout()
+        self.ax.tick_params(axis="x", labelrotation=45)
+        self.fig.tight_layout()
 
     def _clear_annotations(self):
         self.h_lines.clear()
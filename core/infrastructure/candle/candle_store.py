@@ -0,0 +1,60 @@
+import os
+
+import numpy as np
+
+from core.utilities.logger import logger
+
+from .candle_buffer import FIELDS, CandleBuffer
+
+
+class CandleStore:
+    """Memory-mapped on-disk home for candle buffers.
+
+    Each timeframe of a symbol is a pair of ``.npy`` files under
+    ``base_dir/<symbol>``: the buffer columns and a one-value header holding
+    the bar count. Buffers opened from the store write straight into the
+    mapping, so the latest bars survive a restart without any export step.
+    """
+
+    def __init__(self, symbol: str, base_dir="out/candle"):
+        self.symbol = symbol
+        self.base_dir = os.path.join(base_dir, symbol)
+        os.makedirs(self.base_dir, exist_ok=True)
+        self._maps: list[np.memmap] = []
+
+    def _paths(self, name):
+        data_path = os.path.join(self.base_dir, f"{name}.npy")
+        meta_path = os.path.join(self.base_dir, f"{name}.meta.npy")
+        return data_path, meta_path
+
+    def open(self, timeframe, name: str, capacity: int) -> CandleBuffer:
+        """Map the buffer for one timeframe, creating or resetting its files."""
+        data_path, meta_path = self._paths(name)
+        shape = (len(FIELDS), 2 * capacity)
+
+        data = meta = None
+        if os.path.exists(data_path) and os.path.exists(meta_path):
+            try:
+                data = np.load(data_path, mmap_mode="r+")
+                meta = np.load(meta_path, mmap_mode="r+")
+                if data.shape != shape or data.dtype != np.float64:
+                    logger.info(f"Candle cache {data_path} has a stale layout")
+                    data = meta = None
+            except (OSError, ValueError) as e:
+                logger.warning(f"Candle cache {data_path} unreadable: {e}")
+                data = meta = None
+
+        if data is None or meta is None:
+            data = np.lib.format.open_memmap(
+                data_path, mode="w+", dtype=np.float64, shape=shape
+            )
+            meta = np.lib.format.open_memmap(
+                meta_path, mode="w+", dtype=np.int64, shape=(1,)
+            )
+
+        self._maps.extend((data, meta))
+        return CandleBuffer(timeframe, capacity, data=data, meta=meta)
+
+    def flush(self):
+        for mapping in self._maps:
+            mapping.flush()
@@ -0,0 +1,112 @@
+import copy
+
+import numpy as np
+
+from .candle_buffer import TIMESTAMP, CandleBuffer
+from .indicators import StreamingIndicator
+
+
+class IndicatorEngine:
+    """Shared cache of streaming indicators keyed by timeframe and params.
+
+    Indicators are created on first use, seeded from the buffered history
+    and afterwards only fed the bars that closed since the last update plus
+    the forming bar, so reading a value never rescans the window.
+    """
+
+    def __init__(self, buffers: dict[int, CandleBuffer]):
+        self.buffers = buffers
+        self.indicators: dict[int, dict[tuple, StreamingIndicator]] = {}
+        self._committed: dict[int, float] = {}  # Last closed bar fed, per timeframe
+        # Indicator states before that bar, to redo it when it is overwritten
+        self._checkpoints: dict[int, dict[StreamingIndicator, dict]] = {}
+
+    def get(self, timeframe, kind: type[StreamingIndicator], *params):
+        """Return the indicator, registering and seeding it on first use."""
+        registered = self.indicators.setdefault(timeframe, {})
+        key = (kind, params)
+        indicator = registered.get(key)
+        if indicator is None:
+            indicator = kind(*params)
+            registered[key] = indicator
+            self._seed(timeframe, [indicator])
+        return indicator
+
+    def update(self, timeframe):
+        """Feed new closed bars and the forming bar of one timeframe."""
+        registered = self.indicators.get(timeframe)
+        if not registered:
+            return
+
+        buffer = self.buffers[timeframe]
+        if not buffer:
+            return
+
+        timestamps = buffer.timestamps()
+        committed = self._committed.get(timeframe)
+        start = (
+            int(np.searchsorted(timestamps, committed, side="right"))
+            if committed is not None
+            else 0
+        )
+        if start == 0 or start == len(timestamps) or timestamps[start - 1] != committed:
+            # History was replaced (reload, resync), start over
+            self._seed(timeframe, list(registered.values()))
+            return
+
+        self._feed(timeframe, registered.values(), buffer.columns(len(buffer) - start))
+
+    def invalidate(self, timeframe, timestamp):
+        """Refeed the closed bar at ``timestamp`` after it was overwritten.
+
+        The last closed bar is redone from the checkpoint taken before it,
+        older ones reseed the whole history.
+        """
+        registered = self.indicators.get(timeframe)
+        if not registered:
+            return
+        indicators = list(registered.values())
+        checkpoints = self._checkpoints.get(timeframe, {})
+        bars = self.buffers[timeframe].columns(2)
+        if (
+            self._committed.get(timeframe) != timestamp
+            or bars.shape[1] < 2
+            or bars[TIMESTAMP, 0] != timestamp
+            or any(indicator not in checkpoints for indicator in indicators)
+        ):
+            self._seed(timeframe, indicators)
+            return
+        for indicator in indicators:
+            indicator.__dict__.update(copy.deepcopy(checkpoints[indicator]))
+        self._feed(timeframe, indicators, bars)
+
+    def update_all(self):
+        for timeframe in self.indicators:
+            self.update(timeframe)
+
+    def _seed(self, timeframe, indicators):
+        for indicator in indicators:
+            indicator.reset()
+            self._checkpoints.get(timeframe, {}).pop(indicator, None)
+        self._committed.pop(timeframe, None)
+        buffer = self.buffers[timeframe]
+        if buffer:
+            self._feed(timeframe, indicators, buffer.columns())
+
+    def _feed(self, timeframe, indicators, bars):
+        """Push all but the last bar as closed and preview the last one."""
+        count = bars.shape[1]
+        for i in range(count - 1):
+            bar = bars[:, i]
+            if i == count - 2:
+                checkpoints = self._checkpoints.setdefault(timeframe, {})
+                for indicator in indicators:
+                    checkpoints[indicator] = copy.deepcopy(indicator.__dict__)
+            for indicator in indicators:
+                indicator.push(bar)
+        if count > 1:
+            self._committed[timeframe] = bars[TIMESTAMP, count - 2]
+
+        forming = bars[:, count - 1]
+        for indicator in indicators:
+            indicator.preview(forming)
@@ -0,0 +1,237 @@
+import math
+from abc import ABC, abstractmethod
+from collections import deque
+
+import numpy as np
+
+from .candle_buffer import CLOSE, HIGH, LOW
+
+
+class StreamingIndicator(ABC):
+    """Indicator updated one bar at a time.
+
+    ``push`` commits a closed bar, ``preview`` evaluates the forming bar on
+    top of the committed state without changing it. ``previous`` holds the
+    value as of the last closed bar, ``before`` the one as of the closed bar
+    before it and ``value`` the one including the forming bar, all ``None``
+    until enough bars were seen.
+    """
+
+    def __init__(self):
+        self.before = None
+        self.previous = None
+        self.value = None
+
+    def reset(self):
+        self.__init__(*self.params)
+
+    @property
+    @abstractmethod
+    def params(self) -> tuple: ...
+
+    @abstractmethod
+    def push(self, bar): ...
+
+    @abstractmethod
+    def preview(self, bar): ...
+
+
+class ATR(StreamingIndicator):
+    """Simple average of the last ``period`` true ranges."""
+
+    def __init__(self, period: int = 14):
+        super().__init__()
+        self.period = period
+        self._ranges = deque(maxlen=period)
+        self._sum = 0.0
+        self._prev_close = None
+
+    @property
+    def params(self):
+        return (self.period,)
+
+    def _true_range(self, bar):
+        high, low = bar[HIGH], bar[LOW]
+        if self._prev_close is None:
+            return None
+        return max(
+            high - low, abs(high - self._prev_close), abs(low - self._prev_close)
+        )
+
+    def push(self, bar):
+        self.before = self.previous
+        tr = self._true_range(bar)
+        self._prev_close = bar[CLOSE]
+        if tr is None:
+            return
+        if len(self._ranges) == self.period:
+            self._sum -= self._ranges[0]
+        self._ranges.append(tr)
+        self._sum += tr
+        if len(self._ranges) == self.period:
+            self.previous = self._sum / self.period
+
+    def preview(self, bar):
+        tr = self._true_range(bar)
+        if tr is None or len(self._ranges) < self.period - 1:
+            self.value = None
+        else:
+            window_sum = self._sum + tr
+            if len(self._ranges) == self.period:
+                window_sum -= self._ranges[0]
+            self.value = window_sum / self.period
+        return self.value
+
+
+class ExpWeightedMA(StreamingIndicator):
+    """Moving average over ``period`` closes with exponentially decaying weights.
+
+    Same weighting as ``ScalpingDetector``'s original convolution: the newest
+    close gets weight 1 and the oldest ``exp(-1)`` before normalisation.
+    """
+
+    def __init__(self, period: int):
+        super().__init__()
+        self.period = period
+        weights = np.exp(np.linspace(0, -1, period))
+        self._weights = (weights / weights.sum())[::-1].tolist()  # Oldest first
+        self._closes = deque(maxlen=period)
+
+    @property
+    def params(self):
+        return (self.period,)
+
+    def _average(self, closes):
+        return sum(w * c for w, c in zip(self._weights, closes))
+
+    def push(self, bar):
+        self.before = self.previous
+        self._closes.append(bar[CLOSE])
+        if len(self._closes) == self.period:
+            self.previous = self._average(self._closes)
+
+    def preview(self, bar):
+        if len(self._closes) < self.period - 1:
+            self.value = None
+        else:
+            window = list(self._closes)[-(self.period - 1) :] + [bar[CLOSE]]
+            self.value = self._average(window)
+        return self.value
+
+
+class RSI(StreamingIndicator):
+    """RSI from simple averages of the last ``period`` gains and losses."""
+
+    def __init__(self, period: int = 14):
+        super().__init__()
+        self.period = period
+        self._moves = deque(maxlen=period)
+        self._gain = 0.0
+        self._loss = 0.0
+        self._prev_close = None
+
+    @property
+    def params(self):
+        return (self.period,)
+
+    def _rsi(self, gain, loss):
+        rs = (gain / self.period) / (loss / self.period + 1e-10)
+        return 100 - (100 / (1 + rs))
+
+    def push(self, bar):
+        self.before = self.previous
+        close = bar[CLOSE]
+        if self._prev_close is not None:
+            delta = close - self._prev_close
+            if len(self._moves) == self.period:
+                old_gain, old_loss = self._moves[0]
+                self._gain -= old_gain
+                self._loss -= old_loss
+            move = (max(delta, 0.0), max(-delta, 0.0))
+            self._moves.append(move)
+            self._gain += move[0]
+            self._loss += move[1]
+            if len(self._moves) == self.period:
+                self.previous = self._rsi(self._gain, self._loss)
+        self._prev_close = close
+
+    def preview(self, bar):
+        if self._prev_close is None or len(self._moves) < self.period - 1:
+            self.value = None
+            return None
+
+        delta = bar[CLOSE] - self._prev_close
+        gain = self._gain + max(delta, 0.0)
+        loss = self._loss + max(-delta, 0.0)
+        if len(self._moves) == self.period:
+            gain -= self._moves[0][0]
+            loss -= self._moves[0][1]
+        self.value = self._rsi(gain, loss)
+        return self.value
+
+
+class EWMAVolatility(StreamingIndicator):
+    """Per-bar volatility of log returns, EWMA weighted over a finite window.
+
+    Keeps decayed sums of the weights, returns and squared returns, so each
+    bar costs O(1) instead of rebuilding the ``lambda_ ** i`` weight vector.
+    ``count`` is the number of returns in the latest window.
+    """
+
+    def __init__(self, window: int = 299, lambda_: float = 0.94):
+        super().__init__()
+        self.window = window
+        self.lambda_ = lambda_
+        self._returns = deque()
+        self._sums = [0.0, 0.0, 0.0]
+        self._tail = lambda_ ** (window - 1)  # Weight of a return leaving
+        self._prev_close = None
+        self.count = 0
+
+    @property
+    def params(self):
+        return (self.window, self.lambda_)
+
+    @staticmethod
+    def _log_return(close, prev_close):
+        if close <= 0 or prev_close <= 0:
+            return 0.0  # Empty or corrupt bar
+        return math.log(close / prev_close)
+
+    @staticmethod
+    def _std(s0, s1, s2):
+        if s0 <= 0:
+            return None
+        mean = s1 / s0
+        return math.sqrt(max(s2 / s0 - mean * mean, 0.0))
+
+    def push(self, bar):
+        self.before = self.previous
+        close = bar[CLOSE]
+        if self._prev_close is not None:
+            r = self._log_return(close, self._prev_close)
+            s0, s1, s2 = (self.lambda_ * s for s in self._sums)
+            s0, s1, s2 = s0 + 1.0, s1 + r, s2 + r * r
+
+            # Committed window keeps room for the forming bar's return
+            self._returns.append(r)
+            if len(self._returns) > self.window - 1:
+                old = self._returns.popleft()
+                s0 -= self._tail
+                s1 -= self._tail * old
+                s2 -= self._tail * old * old
+            self._sums = [s0, s1, s2]
+            self.previous = self._std(s0, s1, s2)
+        self._prev_close = close
+
+    def preview(self, bar):
+        if self._prev_close is None:
+            self.value = None
+            self.count = len(self._returns)
+            return None
+
+        r = self._log_return(bar[CLOSE], self._prev_close)
+        s0, s1, s2 = (self.lambda_ * s for s in self._sums)
+        self.value = self._std(s0 + 1.0, s1 + r, s2 + r * r)
+        self.count = len(self._returns) + 1
+        return self.value
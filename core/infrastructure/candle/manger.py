@@ -1,38 +1,49 @@
 import time
-from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
-import MetaTrader5 as mt5
 import numpy as np
 
+from core.infrastructure.brokers import mt5_constants as mt5
 from core.infrastructure.brokers.base import BaseBroker
+from core.infrastructure.brokers.timeframes import TIMEFRAME_SECONDS
+from core.infrastructure.tick.tick_buffer import BID, TIME_MSC
+from core.utilities.event_bus import EventBus
 from core.utilities.logger import logger
-from models import Candle
+from models import BarEvent, Candle
+
+from .bar_aggregator import BarAggregator
+from .candle_buffer import CandleBuffer
+from .candle_store import CandleStore
+from .indicator_engine import IndicatorEngine
+from .indicators import ATR
 
 
 class CandleManager:
-    def __init__(self, broker: BaseBroker):
+    def __init__(
+        self,
+        broker: BaseBroker,
+        session_offset: int = 0,
+        store: CandleStore | None = None,
+        symbol: str | None = None,
+        bus: EventBus | None = None,
+    ):
         self.broker = broker
+        self.store = store
+        self.symbol = symbol
+        self.bus = bus
+        self.base_timeframe = mt5.TIMEFRAME_M1
 
-        # Total estimated memory: ~1.3 MB
-        self.candle_cache = {
-            mt5.TIMEFRAME_M1: deque(maxlen=10080),  # 1 week of 1-minute candles
-            mt5.TIMEFRAME_M5: deque(maxlen=2016),  # 1 week of 5-minute candles
-            mt5.TIMEFRAME_M15: deque(maxlen=672),  # 1 week of 15-minute candles
-            mt5.TIMEFRAME_M30: deque(maxlen=336),  # 1 week of 30-minute candles
-            mt5.TIMEFRAME_H1: deque(maxlen=168),  # 1 week of 1-hour candles
-            mt5.TIMEFRAME_H4: deque(maxlen=84),  # 2 weeks of 4-hour candles
-            mt5.TIMEFRAME_D1: deque(maxlen=90),  # 3 months of daily candles
-        }
-
-        self.timeframe_seconds = {
-            mt5.TIMEFRAME_M1: 60,
-            mt5.TIMEFRAME_M5: 300,
-            mt5.TIMEFRAME_M15: 900,
-            mt5.TIMEFRAME_M30: 1800,
-            mt5.TIMEFRAME_H1: 3600,
-            mt5.TIMEFRAME_H4: 14400,
-            mt5.TIMEFRAME_D1: 86400,
+        # 13,446 bars x 6 float64 columns, stored twice: ~1.3 MB
+        capacities = {
+            mt5.TIMEFRAME_M1: 10080,  # 1 week of 1-minute candles
+            mt5.TIMEFRAME_M5: 2016,  # 1 week of 5-minute candles
+            mt5.TIMEFRAME_M15: 672,  # 1 week of 15-minute candles
+            mt5.TIMEFRAME_M30: 336,  # 1 week of 30-minute candles
+            mt5.TIMEFRAME_H1: 168,  # 1 week of 1-hour candles
+            mt5.TIMEFRAME_H4: 84,  # 2 weeks of 4-hour candles
+            mt5.TIMEFRAME_D1: 90,  # 3 months of daily candles
         }
+        self.timeframe_seconds = TIMEFRAME_SECONDS
         self.timeframe_text = {
             mt5.TIMEFRAME_M1: "M1",
             mt5.TIMEFRAME_M5: "M5",
@@ -43,134 +54,283 @@ class CandleManager:
             mt5.TIMEFRAME_D1: "D1",
         }
 
+        if store is None:
+            self.candle_cache = {
+                tf: CandleBuffer(tf, capacity) for tf, capacity in capacities.items()
+            }
+        else:
+            self.candle_cache = {
+                tf: store.open(tf, self.timeframe_text[tf], capacity)
+                for tf, capacity in capacities.items()
+            }
+
+        # M5 to D1 are built from M1 instead of being polled one by one
+        self.aggregator = BarAggregator(
+            self.candle_cache,
+            self.timeframe_seconds,
+            self.base_timeframe,
+            session_offset,
+        )
+        self.indicators = IndicatorEngine(self.candle_cache)
+
     def initialize_timeframe(self, timeframe):
         """Initialize candle cache for a specific timeframe"""
-        if len(self.candle_cache[timeframe]) == 0:
+        buffer = self.candle_cache[timeframe]
+        if len(buffer) == 0:
             start = time.time()
             candles = self.broker.get_candles(
-                timeframe, self.candle_cache[timeframe].maxlen or 0
+                timeframe, buffer.maxlen, symbol=self.symbol
             )
             if candles is not None:
-                for c in candles:
-                    self.add_candle(
-                        Candle(
-                            timestamp=c["time"],
-                            open=c["open"],
-                            high=c["high"],
-                            low=c["low"],
-                            close=c["close"],
-                            volume=c["tick_volume"],
-                            timeframe=timeframe,
-                        )
-                    )
+                buffer.extend(candles)
             logger.debug(
                 f"Initialized {self.timeframe_text.get(timeframe, timeframe)} "
-                f"with {len(candles)} candles "  # type: ignore
+                f"with {len(buffer)} candles "
                 f"in {time.time() - start:.2f}s"
             )
 
-    def initialize_all(self):
-        """Initialize all timeframes"""
-        for timeframe in self.candle_cache.keys():
+    def sync_timeframe(self, timeframe, server_time):
+        """Fetch only the bars missing since the last cached one"""
+        buffer = self.candle_cache[timeframe]
+        start = time.time()
+        last_timestamp = int(buffer.timestamps(1)[0])
+        missing = int(
+            (server_time - last_timestamp) // self.timeframe_seconds[timeframe]
+        )
+
+        # Too old to patch, download everything again
+        if missing >= buffer.maxlen:
+            buffer.clear()
             self.initialize_timeframe(timeframe)
+            return
+
+        rates = self.broker.get_candles(timeframe, missing + 1, symbol=self.symbol)
+        if rates is None or len(rates) == 0:
+            return
+        rates = rates[rates["time"] >= last_timestamp]
+        if len(rates) and int(rates[0]["time"]) == last_timestamp:
+            c = rates[0]
+            buffer.replace(
+                -1, c["open"], c["high"], c["low"], c["close"], c["tick_volume"]
+            )
+            rates = rates[1:]
+        buffer.extend(rates)
+        logger.debug(
+            f"Synced {self.timeframe_text.get(timeframe, timeframe)} "
+            f"with {len(rates)} new candles "
+            f"in {time.time() - start:.2f}s"
+        )
+
+    def initialize_all(self) -> dict[str, float]:
+        """Initialize all timeframes, reusing cached candles when present.
+
+        The timeframes are independent and fetched concurrently; returns
+        the seconds each one took."""
+        versions = self._versions()
+        server_time = None
+        if any(self.candle_cache.values()):
+            latest = self.broker.get_candles(self.base_timeframe, 1, symbol=self.symbol)
+            if latest is not None and len(latest):
+                server_time = int(latest[0]["time"])
+
+        def warm(timeframe):
+            start = time.perf_counter()
+            buffer = self.candle_cache[timeframe]
+            if buffer and server_time is not None:
+                self.sync_timeframe(timeframe, server_time)
+            else:
+                buffer.clear()
+                self.initialize_timeframe(timeframe)
+            return self.timeframe_text[timeframe], time.perf_counter() - start
+
+        with ThreadPoolExecutor(
+            max_workers=len(self.candle_cache), thread_name_prefix="candle-warmup"
+        ) as pool:
+            timings = dict(pool.map(warm, self.candle_cache))
+        self.indicators.update_all()
+        self._publish(versions)
+        return timings
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the candle buffers"""
+        return sum(buffer.nbytes for buffer in self.candle_cache.values())
+
+    def flush(self):
+        """Write cached candles through to disk"""
+        if self.store is not None:
+            self.store.flush()
 
     def add_candle(self, candle: Candle):
         """Add a new candle to the appropriate timeframe cache"""
-        self.candle_cache[candle.timeframe].append(candle)
+        buffer = self.candle_cache[candle.timeframe]
+        versions = self._versions()
+        closed = [(candle.timeframe, int(buffer.timestamps(1)[0]))] if buffer else []
+        buffer.append(
+            candle.timestamp,
+            candle.open,
+            candle.high,
+            candle.low,
+            candle.close,
+            candle.volume,
+        )
+        self.indicators.update(candle.timeframe)
+        self._publish(versions, closed)
 
-    def get_candles(self, timeframe, count=None):
-        """Get candles for a specific timeframe"""
-        candles = self.candle_cache.get(timeframe, deque())
-        candles_list = list(candles)
+    def version(self, timeframe) -> int:
+        """Change counter of a timeframe, increases on every bar update"""
+        return self.candle_cache[timeframe].version
+
+    def _versions(self):
+        return {tf: buffer.version for tf, buffer in self.candle_cache.items()}
 
-        if count is None or count >= len(candles_list):
-            return candles_list
+    def _publish(self, versions, closed=()):
+        """Publish bar events for timeframes changed since ``versions``"""
+        if self.bus is None:
+            return
+
+        closed_timeframes = set()
+        for timeframe, timestamp in closed:
+            buffer = self.candle_cache[timeframe]
+            forming = int(buffer.timestamps(1)[0])
+            gap_bars = (forming - timestamp) // self.timeframe_seconds[timeframe] - 1
+            closed_timeframes.add(timeframe)
+            self.bus.publish(
+                "BAR_CLOSED",
+                BarEvent(
+                    self.symbol, timeframe, timestamp, buffer.version, max(gap_bars, 0)
+                ),
+            )
+
+        for timeframe, buffer in self.candle_cache.items():
+            if timeframe in closed_timeframes or buffer.version == versions[timeframe]:
+                continue
+            if not buffer:
+                continue
+            self.bus.publish(
+                "BAR_UPDATED",
+                BarEvent(
+                    self.symbol,
+                    timeframe,
+                    int(buffer.timestamps(1)[0]),
+                    buffer.version,
+                ),
+            )
+
+    def get_buffer(self, timeframe) -> CandleBuffer:
+        """Get the columnar candle buffer for a specific timeframe"""
+        return self.candle_cache[timeframe]
 
-        return candles_list[-count:]
+    def get_candles(self, timeframe, count=None):
+        """Get candles for a specific timeframe"""
+        buffer = self.candle_cache.get(timeframe)
+        if buffer is None:
+            return []
+        return buffer.to_candles(count)
 
     def update_candles(self):
-        for timeframe in self.candle_cache.keys():
-            self.update_timeframe(timeframe)
+        """Poll the base timeframe once and derive the others locally"""
+        if not self.candle_cache[self.base_timeframe]:
+            self.initialize_all()
+            return
 
-    def update_timeframe(self, timeframe):
-        """Update candle cache for a specific timeframe"""
-        latest = self.broker.get_candles(timeframe, 1)
-        if not latest:
+        # Last closed bar and the forming one
+        latest = self.broker.get_candles(self.base_timeframe, 2, symbol=self.symbol)
+        if latest is None or len(latest) == 0:
             return
 
-        c = latest[0]
-        new_candle = Candle(
-            timestamp=c["time"],
-            open=c["open"],
-            high=c["high"],
-            low=c["low"],
-            close=c["close"],
-            volume=c["tick_volume"],
-            timeframe=timeframe,
-        )
+        versions = self._versions()
+        closed = []
+        base = self.candle_cache[self.base_timeframe]
+        for c in latest:
+            index = base.index_of(int(c["time"]))
+            if index is not None and index < len(base) - 1:
+                # Closed from streamed ticks already, keep the broker's values
+                version = base.version
+                base.replace(
+                    index,
+                    c["open"],
+                    c["high"],
+                    c["low"],
+                    c["close"],
+                    c["tick_volume"],
+                )
+                if base.version != version:
+                    # Higher timeframes and indicators still hold the ticks'
+                    self.aggregator.rebuild(int(c["time"]))
+                    self.indicators.invalidate(self.base_timeframe, int(c["time"]))
+                continue
+            closed.extend(
+                self.aggregator.on_bar(
+                    c["time"],
+                    c["open"],
+                    c["high"],
+                    c["low"],
+                    c["close"],
+                    c["tick_volume"],
+                )
+            )
 
-        # Initialize if empty
-        if not self.candle_cache[timeframe]:
-            self.initialize_timeframe(timeframe)
+        for timeframe, timestamp in closed:
+            if timeframe != self.base_timeframe:
+                self.reconcile(timeframe, timestamp)
+        self.indicators.update_all()
+        self._publish(versions, closed)
+
+    def on_ticks(self, ticks):
+        """Fold ``TickBuffer`` rows into the forming bars between polls.
+
+        Bars are built from bid prices and count one volume per tick, like the
+        broker's tick volume; the next poll overwrites them with its values.
+        """
+        if not self.candle_cache[self.base_timeframe] or ticks.shape[1] == 0:
             return
+        versions = self._versions()
+        closed = []
+        for time_msc, bid in zip(ticks[TIME_MSC], ticks[BID]):
+            closed.extend(self.aggregator.on_tick(int(time_msc) // 1000, bid))
 
-        last_candle = self.candle_cache[timeframe][-1]
+        for timeframe, timestamp in closed:
+            if timeframe != self.base_timeframe:
+                self.reconcile(timeframe, timestamp)
+        self.indicators.update_all()
+        self._publish(versions, closed)
 
-        # New candle detected
-        if new_candle.timestamp != last_candle.timestamp:
-            self.add_candle(new_candle)
-            # Handle gaps (especially important for daily candles)
-            gap = new_candle.timestamp - last_candle.timestamp
-            timeframe_sec = self.timeframe_seconds.get(timeframe, 60)
-            if gap > timeframe_sec * 1.5:
-                self._fill_gap(timeframe, last_candle, new_candle)
+    def reconcile(self, timeframe, timestamp):
+        """Replace a locally aggregated closed bar with the broker's bar"""
+        rates = self.broker.get_candles(timeframe, 2, symbol=self.symbol)
+        if rates is None or len(rates) == 0:
+            return
 
-        # Update current candle
-        else:
-            last_candle.high = max(last_candle.high, new_candle.high)
-            last_candle.low = min(last_candle.low, new_candle.low)
-            last_candle.close = new_candle.close
-            last_candle.volume += new_candle.volume
-
-    def _fill_gap(self, timeframe, last_candle, new_candle):
-        """Fill missing candles between last candle and new candle"""
-        gap_duration = new_candle.timestamp - last_candle.timestamp
-        timeframe_sec = self.timeframe_seconds.get(timeframe, 60)
-        missing_count = int(gap_duration // timeframe_sec) - 1
-
-        for i in range(1, missing_count + 1):
-            gap_time = last_candle.timestamp + i * timeframe_sec
-            self.candle_cache[timeframe].append(
-                Candle(
-                    timestamp=gap_time,
-                    open=last_candle.close,
-                    high=last_candle.close,
-                    low=last_candle.close,
-                    close=last_candle.close,
-                    volume=0,
-                    timeframe=timeframe,
+        buffer = self.candle_cache[timeframe]
+        for c in rates:
+            if int(c["time"]) != timestamp:
+                continue
+            index = buffer.index_of(timestamp)
+            if index is not None:
+                buffer.replace(
+                    index,
+                    c["open"],
+                    c["high"],
+                    c["low"],
+                    c["close"],
+                    c["tick_volume"],
                 )
-            )
-
-    def calculate_atr(self, timeframe: int, lookback_period: int) -> float:
-        candles = self.get_candles(timeframe, lookback_period + 1)
-        if not candles or len(candles) < lookback_period + 1:
-            return 0.0
+            return
 
-        true_ranges = []
-        for i in range(1, len(candles)):
-            high = candles[i].high
-            low = candles[i].low
-            prev_close = candles[i - 1].close
-            tr = max(high - low, abs(high - prev_close), abs(low - prev_close))
-            true_ranges.append(tr)
+        logger.warning(
+            f"{self.timeframe_text.get(timeframe, timeframe)} bar {timestamp} "
+            "not found at broker, check SESSION_OFFSET"
+        )
 
-        return float(np.mean(true_ranges)) if true_ranges else 0.0
+    def calculate_atr(self, timeframe: int, lookback_period: int) -> float:
+        atr = self.indicators.get(timeframe, ATR, lookback_period).value
+        return float(atr) if atr is not None else 0.0
 
     def calculate_volatility(self, timeframe):
-        candles = list(self.candle_cache[timeframe])
-        if len(candles) < 2:
+        buffer = self.candle_cache[timeframe]
+        if len(buffer) < 2:
             return 0
 
-        returns = np.log([c.close / c.open for c in candles])
-        return np.std(returns) * np.sqrt(len(candles))
+        returns = np.log(buffer.closes() / buffer.opens())
+        return np.std(returns) * np.sqrt(len(buffer))
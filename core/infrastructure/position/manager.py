@@ -1,28 +1,60 @@
+from collections import defaultdict
+
 from core.infrastructure.brokers.base import BaseBroker
+from core.infrastructure.brokers.order_gateway import OrderGateway
 from core.utilities.event_bus import EventBus
-from models import Position
+from models import OrderEvent, Position
 
 
 class PositionManager:
-    def __init__(self, broker: BaseBroker, bus: EventBus):
+    def __init__(
+        self,
+        broker: BaseBroker,
+        bus: EventBus,
+        symbols=None,
+        orders: OrderGateway | None = None,
+    ):
         self.broker = broker
         self.bus = bus
+        self.orders = orders
+        self.closing = set()  # Ids with a close request in flight
+        self.symbols = list(symbols or [])
         self.open_positions = {}
+        self.books = defaultdict(dict)  # Open positions per symbol
         self.position_history = []
         self.consecutive_losses = 0
         self.session_volatility = 0
 
-    def update_price(self, tick):
-        for position in self.open_positions.values():
+    def get_positions(self, symbol) -> list[Position]:
+        return list(self.books.get(symbol, {}).values())
+
+    def update_price(self, tick, symbol=None):
+        """Mark positions of ``symbol`` (all positions when None) to ``tick``"""
+        positions = (
+            self.open_positions.values()
+            if symbol is None
+            else self.books.get(symbol, {}).values()
+        )
+        for position in positions:
             position: Position
             position.update_mark_price(
                 tick.bid if position.direction == 1 else tick.ask
             )
-            position.pip_point = self.broker.get_pip_value()
+            position.pip_point = self.broker.get_pip_value(position.symbol)
 
     def sync_positions(self):
         current_ids = set()
-        positions = self.broker.get_positions()
+        # One query for every traded symbol instead of one per symbol
+        if len(self.symbols) > 1:
+            positions = [
+                pos
+                for pos in self.broker.get_positions(symbol="") or []
+                if pos.symbol in self.symbols
+            ]
+        else:
+            positions = self.broker.get_positions(
+                self.symbols[0] if self.symbols else None
+            )
         if positions:
             for pos in positions:
                 pos_id = pos.ticket
@@ -38,33 +70,67 @@ class PositionManager:
                             stop_loss=pos.sl,
                             take_profit=pos.tp,
                             size=pos.volume,
-                            pip_point=self.broker.get_pip_value(),
+                            pip_point=self.broker.get_pip_value(pos.symbol),
                             time_out=0,
                             comment=pos.comment,
+                            entry_time=self.broker.now,
                         )
                     )
 
         existing_ids = set(self.open_positions.keys())
         closed_ids = existing_ids - current_ids
-        for pos_id in closed_ids:
+        for pos_id in closed_ids - self.closing:
             if pos_id in self.open_positions:
-                closed_pos: Position = self.open_positions.pop(pos_id)
-                closed_pos.close("Closed externally")
+                closed_pos: Position = self._remove(pos_id)
+                closed_pos.close("Closed externally", self.broker.now)
                 self.bus.publish("LOG_POSITION", closed_pos)
                 self.position_history.append(closed_pos)
 
     def add_position(self, position: Position):
         self.open_positions[position.id] = position
+        self.books[position.symbol][position.id] = position
         self.bus.publish("LOG_POSITION", position)
 
+    def restore(self, positions, history, consecutive_losses):
+        """Reinstate a snapshot taken before a restart, without logging"""
+        for position in positions:
+            if position.id not in self.open_positions:
+                self.open_positions[position.id] = position
+                self.books[position.symbol][position.id] = position
+        self.position_history[:0] = history
+        self.consecutive_losses = consecutive_losses
+
+    def _remove(self, position_id) -> Position:
+        position: Position = self.open_positions.pop(position_id)
+        book = self.books.get(position.symbol)
+        if book is not None:
+            book.pop(position_id, None)
+        return position
+
     def close_position(self, position_id, reason):
-        if self.broker.close_position(position_id):
-            position: Position = self.open_positions.pop(position_id)
-            position.close(reason)
-            self.bus.publish("LOG_POSITION", position)
-            self.position_history.append(position)
+        if self.orders is None:
+            if self.broker.close_position(position_id):
+                self._closed(position_id, reason)
+            return
+        if position_id in self.closing:
+            return
+        self.closing.add(position_id)
+        self.orders.close(
+            position_id, on_done=lambda event: self._on_close(event, reason)
+        )
+
+    def _on_close(self, event: OrderEvent, reason):
+        self.closing.discard(event.position_id)
+        if event.ok and event.position_id in self.open_positions:
+            self._closed(event.position_id, reason)
+
+    def _closed(self, position_id, reason):
+        position: Position = self._remove(position_id)
+        position.close(reason, self.broker.now)
+        self.bus.publish("LOG_POSITION", position)
+        self.position_history.append(position)
 
-            if position.unrealized_pnl < 0:
-                self.consecutive_losses += 1
-            else:
-                self.consecutive_losses = 0
+        if position.unrealized_pnl < 0:
+            self.consecutive_losses += 1
+        else:
+            self.consecutive_losses = 0
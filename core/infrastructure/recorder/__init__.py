@@ -0,0 +1,2 @@
+from .market_reader import MarketReader
+from .market_recorder import MarketRecorder
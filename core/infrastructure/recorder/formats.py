@@ -0,0 +1,41 @@
+from datetime import datetime, timezone
+
+import numpy as np
+
+# Fixed-width little-endian records in <base>/<symbol>/<YYYYMMDD>/<series>.bin,
+# the series being "ticks" or "bars_<timeframe>"
+TICK_RECORD = np.dtype(
+    [("time_msc", "<i8"), ("bid", "<f8"), ("ask", "<f8"), ("volume", "<f8")]
+)
+BAR_RECORD = np.dtype(
+    [
+        ("time", "<i8"),
+        ("open", "<f8"),
+        ("high", "<f8"),
+        ("low", "<f8"),
+        ("close", "<f8"),
+        ("tick_volume", "<f8"),
+    ]
+)
+# First record of every INDEX_STEP seconds present in a data file
+INDEX_RECORD = np.dtype([("time", "<i8"), ("offset", "<i8")])
+INDEX_STEP = 60
+
+
+def series_name(timeframe=None) -> str:
+    return "ticks" if timeframe is None else f"bars_{timeframe}"
+
+
+def series_dtype(series) -> np.dtype:
+    return TICK_RECORD if series == "ticks" else BAR_RECORD
+
+
+def record_seconds(records) -> np.ndarray:
+    """Timestamps of tick or bar ``records`` in seconds."""
+    if "time_msc" in records.dtype.names:
+        return records["time_msc"] // 1000
+    return records["time"]
+
+
+def day_name(seconds) -> str:
+    return datetime.fromtimestamp(int(seconds), tz=timezone.utc).strftime("%Y%m%d")
@@ -0,0 +1,83 @@
+import os
+
+import numpy as np
+
+from .formats import INDEX_RECORD, record_seconds, series_dtype, series_name
+
+
+class MarketReader:
+    """Memory-maps the files written by ``MarketRecorder``.
+
+    Every method returns read-only views into the mapped files; ranges
+    spanning several days are concatenated into one array.
+    """
+
+    def __init__(self, base_dir):
+        self.base_dir = base_dir
+
+    def symbols(self) -> list[str]:
+        if not os.path.isdir(self.base_dir):
+            return []
+        return sorted(
+            name
+            for name in os.listdir(self.base_dir)
+            if os.path.isdir(os.path.join(self.base_dir, name))
+        )
+
+    def days(self, symbol) -> list[str]:
+        path = os.path.join(self.base_dir, symbol)
+        return sorted(os.listdir(path)) if os.path.isdir(path) else []
+
+    def _map(self, symbol, day, series, suffix, dtype):
+        path = os.path.join(self.base_dir, symbol, day, f"{series}.{suffix}")
+        if not os.path.exists(path):
+            return np.empty(0, dtype=dtype)
+        count = os.path.getsize(path) // dtype.itemsize
+        if count == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(path, dtype=dtype, mode="r", shape=(count,))
+
+    def day(self, symbol, day, timeframe=None) -> np.ndarray:
+        """Every record of one day: ticks, or bars of ``timeframe``."""
+        series = series_name(timeframe)
+        return self._map(symbol, day, series, "bin", series_dtype(series))
+
+    def _slice(self, symbol, day, series, start, end):
+        """Records of ``day`` with ``start <= seconds < end``."""
+        data = self._map(symbol, day, series, "bin", series_dtype(series))
+        index = self._map(symbol, day, series, "idx", INDEX_RECORD)
+        if len(data) == 0:
+            return data
+
+        # Narrow down with the index, then search inside the bucket
+        lo, hi = 0, len(data)
+        if len(index):
+            i = np.searchsorted(index["time"], start, side="right") - 1
+            if i >= 0:
+                lo = int(index["offset"][i])
+            j = np.searchsorted(index["time"], end, side="left")
+            if j < len(index):
+                hi = int(index["offset"][j])
+        window = data[lo:hi]
+        seconds = record_seconds(window)
+        return window[
+            np.searchsorted(seconds, start, side="left") : np.searchsorted(
+                seconds, end, side="left"
+            )
+        ]
+
+    def read(self, symbol, start=None, end=None, timeframe=None) -> np.ndarray:
+        """Ticks, or bars of ``timeframe``, with ``start <= time < end``
+        (seconds, open ended when None)."""
+        series = series_name(timeframe)
+        start = -(2**62) if start is None else start
+        end = 2**62 if end is None else end
+        parts = [
+            self._slice(symbol, day, series, start, end) for day in self.days(symbol)
+        ]
+        parts = [part for part in parts if len(part)]
+        if len(parts) == 1:
+            return parts[0]
+        if not parts:
+            return np.empty(0, dtype=series_dtype(series))
+        return np.concatenate(parts)
@@ -0,0 +1,139 @@
+import os
+
+import numpy as np
+
+from .formats import INDEX_RECORD, INDEX_STEP, day_name, record_seconds, series_dtype
+
+
+class SeriesWriter:
+    """Appends fixed-width records of one series, rotating files daily.
+
+    Records must arrive in time order. The index gets the offset of the
+    first record of every ``INDEX_STEP`` seconds bucket.
+    """
+
+    def __init__(self, symbol_dir, series):
+        self.symbol_dir = symbol_dir
+        self.series = series
+        self.dtype = series_dtype(series)
+        self.day = None
+        self._data = None
+        self._index = None
+        self._count = 0
+        self._bucket = None  # Last indexed bucket
+
+    def _open(self, day):
+        self.close()
+        path = os.path.join(self.symbol_dir, day)
+        os.makedirs(path, exist_ok=True)
+        data_path = os.path.join(path, f"{self.series}.bin")
+        index_path = os.path.join(path, f"{self.series}.idx")
+
+        # Resume a file written before a restart, dropping a torn last record
+        size = os.path.getsize(data_path) if os.path.exists(data_path) else 0
+        self._count = size // self.dtype.itemsize
+        if size % self.dtype.itemsize:
+            with open(data_path, "r+b") as f:
+                f.truncate(self._count * self.dtype.itemsize)
+        self._bucket = None
+        if os.path.exists(index_path):
+            # Same for the index, and entries of records just dropped
+            size = os.path.getsize(index_path)
+            index = np.fromfile(
+                index_path, dtype=INDEX_RECORD, count=size // INDEX_RECORD.itemsize
+            )
+            index = index[: int(np.searchsorted(index["offset"], self._count))]
+            if size != index.nbytes:
+                with open(index_path, "r+b") as f:
+                    f.truncate(index.nbytes)
+            if len(index):
+                self._bucket = int(index["time"][-1])
+
+        self._data = open(data_path, "ab")
+        self._index = open(index_path, "ab")
+        self.day = day
+
+    def write(self, records: np.ndarray):
+        seconds = record_seconds(records)
+        day = day_name(seconds[0])
+        if day != day_name(seconds[-1]):
+            # Split at the day boundaries, rare enough to do per record
+            names = np.array([day_name(s) for s in seconds])
+            starts = np.flatnonzero(np.r_[True, names[1:] != names[:-1]])
+            for start, end in zip(starts, np.r_[starts[1:], len(records)]):
+                self._write_day(names[start], records[start:end], seconds[start:end])
+            return
+        self._write_day(day, records, seconds)
+
+    def _write_day(self, day, records, seconds):
+        if day != self.day:
+            self._open(day)
+        buckets = seconds // INDEX_STEP * INDEX_STEP
+        first = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+        if self._bucket is not None:
+            first = first[buckets[first] > self._bucket]
+        if len(first):
+            index = np.empty(len(first), dtype=INDEX_RECORD)
+            index["time"] = buckets[first]
+            index["offset"] = self._count + first
+            self._index.write(index.tobytes())
+            self._bucket = int(buckets[first[-1]])
+
+        self._data.write(records.astype(self.dtype, copy=False).tobytes())
+        self._count += len(records)
+
+    def flush(self):
+        if self._data is not None:
+            self._data.flush()
+            self._index.flush()
+
+    def close(self):
+        if self._data is not None:
+            self._data.close()
+            self._index.close()
+            self._data = self._index = None
+
+
+class MarketRecorder:
+    """Records the ticks and closed bars the live system saw.
+
+    Files live in ``<base_dir>/<symbol>/<YYYYMMDD>/`` as ``ticks.bin`` and
+    ``bars_<timeframe>.bin`` with a ``.idx`` timestamp index each, see
+    ``MarketReader`` to replay them.
+    """
+
+    def __init__(self, base_dir):
+        self.base_dir = base_dir
+        self.writers = {}
+
+    def _writer(self, symbol, series) -> SeriesWriter:
+        key = (symbol, series)
+        if key not in self.writers:
+            symbol_dir = os.path.join(self.base_dir, symbol)
+            self.writers[key] = SeriesWriter(symbol_dir, series)
+        return self.writers[key]
+
+    def write_ticks(self, symbol, time_msc, bid, ask, volume):
+        """Record equally long arrays of ticks."""
+        if len(time_msc) == 0:
+            return
+        writer = self._writer(symbol, "ticks")
+        records = np.empty(len(time_msc), dtype=writer.dtype)
+        records["time_msc"] = time_msc
+        records["bid"] = bid
+        records["ask"] = ask
+        records["volume"] = volume
+        writer.write(records)
+
+    def write_bar(self, symbol, timeframe, time, open, high, low, close, volume):
+        writer = self._writer(symbol, f"bars_{timeframe}")
+        record = np.array([(time, open, high, low, close, volume)], dtype=writer.dtype)
+        writer.write(record)
+
+    def flush(self):
+        for writer in self.writers.values():
+            writer.flush()
+
+    def close(self):
+        for writer in self.writers.values():
+            writer.close()
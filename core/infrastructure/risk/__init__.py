@@ -1,2 +1,3 @@
 from .calculator import RiskCalculator
 from .manager import RiskManager
+from .modification_queue import ModificationQueue
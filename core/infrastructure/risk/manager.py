@@ -2,9 +2,10 @@ from config.settings import Settings
 from core.application.state import TradingState
 from core.infrastructure.brokers.base import BaseBroker
 from core.utilities.event_bus import EventBus
-from core.utilities.logger import logger
 from models import Position
 
+from .modification_queue import ModificationQueue
+
 
 class RiskManager:
     def __init__(
@@ -20,10 +21,17 @@ class RiskManager:
         self.config = config
         self.bus = bus
         self.skip_monitor_position = skip_monitor_position
+        self.modifications = ModificationQueue(
+            state.orders, config.SLTP_MIN_STEP, config.SLTP_MAX_PER_SECOND
+        )
 
-    def evaluate(self):
+    def evaluate(self, full: bool = True):
+        """Per tick position checks, the circuit breaker only when ``full``."""
         self.monitor_positions()
-        self.circuit_breaker_check()
+        self.modifications.retain(self.state.position_manager.open_positions)
+        self.modifications.flush()
+        if full:
+            self.circuit_breaker_check()
 
     def monitor_positions(self):
         """Monitor exisitnig position on MT5 broker."""
@@ -37,8 +45,11 @@ class RiskManager:
             self.check_position_risk(position)
 
     def check_position_risk(self, position: Position):
-        if position.time_out != 0 and position.age > position.time_out:
+        age = position.age_at(self.broker.now)
+        if position.time_out != 0 and age > position.time_out:
+            self.modifications.discard(position.id)
             self.state.position_manager.close_position(position.id, "Timeout")
+            return
 
         if position.unrealized_pnl_pips > self.config.TRAIL_START:
             self.apply_trailing_stop(position)
@@ -53,10 +64,8 @@ class RiskManager:
         if (position.direction == 1 and position.stop_loss < breakeven_sl) or (
             position.direction == -1 and position.stop_loss > breakeven_sl
         ):
-            self.broker.modify_position(position.id, breakeven_sl, position.take_profit)
-            position.update_sl(breakeven_sl)
-            logger.info(
-                f"Breakeven SL updated for position {position.id}: {breakeven_sl}"
+            self.modifications.request(
+                position, breakeven_sl, position.take_profit, "Breakeven"
             )
 
     def apply_trailing_stop(self, position: Position):
@@ -69,9 +78,7 @@ class RiskManager:
             ):
                 return
 
-        self.broker.modify_position(position.id, new_sl, position.take_profit)
-        position.update_sl(new_sl)
-        logger.info(f"Trailing SL updated for position {position.id}: {new_sl:.2f}")
+        self.modifications.request(position, new_sl, position.take_profit, "Trailing")
 
     def circuit_breaker_check(self):
         if self.state.account_balance <= 100:
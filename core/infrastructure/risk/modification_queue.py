@@ -0,0 +1,132 @@
+import time
+from collections import Counter
+
+from core.infrastructure.brokers.order_gateway import OrderGateway
+from core.utilities.logger import logger
+from models import OrderEvent, Position
+
+
+class ModificationQueue:
+    """Coalesces SL/TP changes into at most one pending modify per ticket.
+
+    Only the latest target of a ticket is kept, targets closer than
+    ``min_step_pips`` to the confirmed (or in flight) SL/TP are dropped,
+    and ``flush`` sends no more than ``max_per_second`` modifies. A ticket
+    is not sent again while its previous modify is in flight; the
+    position's SL/TP are updated once the broker confirms. The SL never
+    moves back: a target looser than the pending, in flight or confirmed
+    SL keeps the tightest of them.
+    """
+
+    def __init__(
+        self,
+        orders: OrderGateway,
+        min_step_pips: float = 2.0,
+        max_per_second: float = 5.0,
+        clock=time.monotonic,
+    ):
+        self.orders = orders
+        self.min_step_pips = min_step_pips
+        self.max_per_second = max_per_second
+        self.clock = clock
+        self.targets = {}  # ticket -> (position, sl, tp, reason)
+        self.in_flight = {}  # ticket -> (sl, tp) sent
+        self.tokens = max_per_second
+        self.last_refill = clock()
+        self.counters = Counter()
+
+    def __len__(self):
+        return len(self.targets)
+
+    def request(self, position: Position, sl, tp, reason="Modify"):
+        self.counters["requested"] += 1
+        pending = self.targets.get(position.id)
+        sl = _tightest(position, sl, position.stop_loss)
+        if pending is not None:
+            sl = _tightest(position, sl, pending[1])
+        if position.id in self.in_flight:
+            sl = _tightest(position, sl, self.in_flight[position.id][0])
+        if self._below_step(position, sl, tp):
+            # A pending target, if any, still stands
+            self.counters["below_step"] += 1
+            return
+        if pending is not None:
+            self.counters["coalesced"] += 1
+        self.targets[position.id] = (position, sl, tp, reason)
+
+    def _below_step(self, position: Position, sl, tp) -> bool:
+        """Whether ``sl``/``tp`` are within a step of the in flight target,
+        or of the confirmed SL/TP when none is."""
+        sent_sl, sent_tp = self.in_flight.get(
+            position.id, (position.stop_loss, position.take_profit)
+        )
+        step = self.min_step_pips * position.pips_point
+        return abs(sl - sent_sl) < step and abs(tp - sent_tp) < step
+
+    def discard(self, position_id):
+        self.targets.pop(position_id, None)
+
+    def retain(self, position_ids):
+        """Drop targets of positions no longer open."""
+        for ticket in [t for t in self.targets if t not in position_ids]:
+            del self.targets[ticket]
+
+    def flush(self) -> int:
+        """Send pending targets the rate limit allows, oldest ticket first."""
+        now = self.clock()
+        self.tokens = min(
+            self.max_per_second,
+            self.tokens + (now - self.last_refill) * self.max_per_second,
+        )
+        self.last_refill = now
+
+        sent = 0
+        for ticket in list(self.targets):
+            if self.tokens < 1:
+                self.counters["throttled"] += 1
+                break
+            if ticket in self.in_flight:
+                continue
+            position, sl, tp, reason = self.targets.pop(ticket)
+            # The SL confirmed since the request may be tighter
+            sl = _tightest(position, sl, position.stop_loss)
+            if self._below_step(position, sl, tp):
+                self.counters["below_step"] += 1
+                continue
+            self.in_flight[ticket] = (sl, tp)
+            self.tokens -= 1
+            sent += 1
+            self.counters["sent"] += 1
+            self.orders.modify(
+                ticket,
+                sl,
+                tp,
+                on_done=lambda event, p=position, sl=sl, tp=tp, r=reason: (
+                    self._on_done(event, p, sl, tp, r)
+                ),
+            )
+        return sent
+
+    def _on_done(self, event: OrderEvent, position: Position, sl, tp, reason):
+        self.in_flight.pop(position.id, None)
+        if not event.ok:
+            self.counters["failed"] += 1
+            return
+        position.update_sl(sl)
+        position.update_tp(tp)
+        logger.info(f"{reason} SL updated for position {position.id}: {sl:.2f}")
+
+    def stats(self) -> dict:
+        stats = dict(self.counters)
+        stats["pending"] = len(self.targets)
+        stats["in_flight"] = len(self.in_flight)
+        return stats
+
+
+def _tightest(position: Position, sl, other):
+    """The SL closer to the price of ``sl`` and ``other``, 0 meaning none."""
+    if not other:
+        return sl
+    if not sl:
+        return other
+    return max(sl, other) if position.direction == 1 else min(sl, other)
@@ -0,0 +1,2 @@
+from .tick_buffer import Tick, TickBuffer
+from .tick_stream import TickStream
@@ -0,0 +1,95 @@
+from collections import namedtuple
+
+import numpy as np
+
+# Column layout of the buffer storage
+FIELDS = ("time_msc", "bid", "ask", "volume")
+TIME_MSC, BID, ASK, VOLUME = range(len(FIELDS))
+
+Tick = namedtuple("Tick", "time time_msc bid ask volume")
+
+
+class TickBuffer:
+    """Fixed capacity columnar ring buffer of ticks for one writer thread.
+
+    Same mirrored layout as ``CandleBuffer``: rows are written at ``i`` and
+    ``i + capacity`` so any recent run of ticks is a contiguous view. The
+    writer fills a row before publishing it through ``count``, so readers
+    on other threads need no lock as long as they consume ticks before
+    ``capacity`` newer ones overwrite them.
+    """
+
+    def __init__(self, capacity: int):
+        if capacity <= 0:
+            raise ValueError("Capacity must be positive.")
+        self.capacity = capacity
+        self._data = np.zeros((len(FIELDS), 2 * capacity), dtype=np.float64)
+        self.count = 0  # Ticks ever written, also the next sequence number
+
+    def __len__(self) -> int:
+        return min(self.count, self.capacity)
+
+    def __bool__(self) -> bool:
+        return self.count > 0
+
+    @property
+    def nbytes(self) -> int:
+        return self._data.nbytes
+
+    @property
+    def oldest(self) -> int:
+        """Sequence number of the oldest tick still held."""
+        return max(0, self.count - self.capacity)
+
+    def extend(self, time_msc, bid, ask, volume):
+        """Append equally long arrays of ticks, keeping the newest on overflow."""
+        n = len(time_msc)
+        if n == 0:
+            return
+        columns = np.empty((len(FIELDS), n), dtype=np.float64)
+        columns[TIME_MSC] = time_msc
+        columns[BID] = bid
+        columns[ASK] = ask
+        columns[VOLUME] = volume
+        count = self.count
+        if n > self.capacity:
+            columns = columns[:, -self.capacity :]
+            count += n - self.capacity
+            n = self.capacity
+
+        start = count % self.capacity
+        first = min(n, self.capacity - start)
+        for offset in (0, self.capacity):
+            self._data[:, start + offset : start + offset + first] = columns[:, :first]
+            self._data[:, offset : offset + n - first] = columns[:, first:]
+        self.count = count + n
+
+    def append(self, time_msc, bid, ask, volume=1):
+        i = self.count % self.capacity
+        row = (time_msc, bid, ask, volume)
+        self._data[:, i] = row
+        self._data[:, i + self.capacity] = row
+        self.count += 1
+
+    def since(self, seq, end=None) -> np.ndarray:
+        """View of ticks ``seq`` up to ``end`` (default: latest), shape (4, n).
+
+        Ticks already overwritten are skipped, compare ``oldest`` to
+        ``seq`` to detect them.
+        """
+        end = self.count if end is None else end
+        start = max(seq, end - self.capacity)
+        if start >= end:
+            return self._data[:, :0]
+        stop = (end - 1) % self.capacity + self.capacity + 1
+        return self._data[:, stop - (end - start) : stop]
+
+    def latest(self, count: int) -> np.ndarray:
+        return self.since(self.count - count)
+
+    @property
+    def last(self) -> Tick | None:
+        if not self.count:
+            return None
+        time_msc, bid, ask, volume = self.latest(1)[:, 0]
+        return Tick(int(time_msc) // 1000, int(time_msc), bid, ask, volume)
@@ -0,0 +1,158 @@
+import threading
+
+import numpy as np
+
+from core.infrastructure.brokers.base import BaseBroker
+from core.utilities.event_bus import EventBus
+from core.utilities.logger import logger
+from core.utilities.wakeup import Wakeup
+from models import TickEvent
+
+from .tick_buffer import TickBuffer
+
+
+class TickStream:
+    """Polls ticks of every symbol on its own thread into ``TickBuffer``s.
+
+    Each poll asks the broker for every tick since the last one stored
+    (``get_ticks_since``), so ticks between polls and gaps after a stall
+    are backfilled. Brokers without tick history fall back to the latest
+    tick. ``dispatch`` runs on the main loop and publishes one ``TICK``
+    event per symbol that received ticks, ``wakeup`` is notified whenever a
+    poll stored some. Non-realtime brokers are polled from ``dispatch``
+    instead of a thread.
+    """
+
+    def __init__(
+        self,
+        broker: BaseBroker,
+        bus: EventBus,
+        symbols: list[str],
+        capacity: int = 100_000,
+        poll_interval: float = 0.05,
+        backfill_seconds: int = 60,
+        batch: int = 10_000,
+        wakeup: Wakeup | None = None,
+    ):
+        self.broker = broker
+        self.bus = bus
+        self.symbols = list(symbols)
+        self.poll_interval = poll_interval
+        self.backfill_seconds = backfill_seconds
+        self.batch = batch
+        self.wakeup = wakeup
+        self.inline = not broker.realtime
+        self.buffers = {symbol: TickBuffer(capacity) for symbol in self.symbols}
+        self.dispatched = {symbol: 0 for symbol in self.symbols}  # Next seq
+        self._last = {}  # symbol -> (time_msc, ticks stored at that ms)
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def nbytes(self) -> int:
+        return sum(buffer.nbytes for buffer in self.buffers.values())
+
+    def start(self):
+        if self.inline or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="tick-stream", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout=2.0):
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout)
+        self._thread = None
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                if self.poll() and self.wakeup is not None:
+                    self.wakeup.notify()
+            except Exception as e:
+                logger.exception(f"Tick stream error: {e}")
+            self._stop.wait(self.poll_interval)
+
+    # Writer
+    def poll(self) -> int:
+        """Store new ticks of every symbol, returns how many were stored."""
+        return sum(self._poll_symbol(symbol) for symbol in self.symbols)
+
+    def _poll_symbol(self, symbol) -> int:
+        if symbol not in self._last:
+            tick = self.broker.get_tick(symbol)
+            if not tick:
+                return 0
+            self._last[symbol] = (tick.time_msc - self.backfill_seconds * 1000, 0)
+
+        stored = 0
+        count = self.batch
+        while True:
+            last_msc, same = self._last[symbol]
+            ticks = self.broker.get_ticks_since(last_msc, count, symbol)
+            if ticks is None:
+                return stored + self._poll_latest(symbol)
+
+            # The broker answers from the start of the second, skip older
+            # ticks and those of the last millisecond already stored
+            skip = np.searchsorted(ticks["time_msc"], last_msc, side="left") + same
+            new = ticks[skip:]
+            if len(ticks) < count:
+                if len(new):
+                    self._store(symbol, new)
+                return stored + len(new)
+            if len(new) == 0:
+                # A full batch inside one second, ask for more at once
+                count *= 2
+                continue
+            self._store(symbol, new)
+            stored += len(new)
+            count = self.batch
+
+    def _poll_latest(self, symbol) -> int:
+        tick = self.broker.get_tick(symbol)
+        last = self._last.get(symbol)
+        if not tick or (last is not None and tick.time_msc <= last[0]):
+            return 0
+        ticks = np.array(
+            [(tick.time_msc, tick.bid, tick.ask, tick.volume)],
+            dtype=[("time_msc", "i8"), ("bid", "f8"), ("ask", "f8"), ("volume", "f8")],
+        )
+        self._store(symbol, ticks)
+        return 1
+
+    def _store(self, symbol, ticks):
+        times = ticks["time_msc"]
+        self.buffers[symbol].extend(times, ticks["bid"], ticks["ask"], ticks["volume"])
+        last_msc = int(times[-1])
+        previous = self._last.get(symbol, (None, 0))
+        same = int(np.count_nonzero(times == last_msc))
+        if previous[0] == last_msc and same == len(times):
+            same += previous[1]
+        self._last[symbol] = (last_msc, same)
+
+    # Main loop
+    def dispatch(self) -> list[TickEvent]:
+        """Publish a ``TICK`` event for every symbol with new ticks."""
+        if self.inline:
+            self.poll()
+        events = []
+        for symbol, buffer in self.buffers.items():
+            seq = buffer.count
+            first = self.dispatched[symbol]
+            if seq == first:
+                continue
+            dropped = max(0, buffer.oldest - first)
+            first += dropped
+            time_msc, bid, ask, _ = buffer.since(seq - 1, seq)[:, 0]
+            events.append(
+                TickEvent(symbol, seq - 1, first, int(time_msc), bid, ask, dropped)
+            )
+            self.dispatched[symbol] = seq
+        for event in events:
+            self.bus.publish("TICK", event)
+        return events
@@ -1,22 +1,55 @@
 from abc import ABC, abstractmethod
-from typing import Tuple
+from concurrent.futures import Executor
+from typing import Optional, Tuple
 
 from config.settings import Settings
 from core.application.state import TradingState
 from core.infrastructure.brokers.base import BaseBroker
 from core.infrastructure.risk import RiskCalculator
+from models import OrderEvent, Position
+
+from .memo import DetectorMemo
 
 
 class BaseDetector(ABC):
+    # Set by the registry for strategies loaded with processes=True
+    process_pool: Optional[Executor] = None
+    # Set by the registry, shared by all its detectors
+    memo: Optional[DetectorMemo] = None
+    # Set by the registry for bar_close schedules: runs start right after a
+    # bar closed, when the forming bar holds a tick or two
+    bar_close: bool = False
+
     @abstractmethod
     def detect(self, name: str) -> Tuple[int, str]: ...
 
+    def close(self):
+        """Release resources held across runs."""
+
+    def get_state(self) -> dict:
+        """JSON serialisable state to keep across restarts."""
+        return {}
+
+    def set_state(self, state: dict):
+        """Restore what ``get_state`` returned before a restart."""
+
+    def _memoized(self, key: tuple, compute):
+        """``compute()``, shared with detectors asking for the same ``key``.
+
+        The key must hold everything the result depends on: detector type,
+        parameters, symbol, candle versions and any instance state read.
+        """
+        if self.memo is None:
+            return compute()
+        return self.memo.get(key, compute)
+
 
 class BaseExecutor(ABC):
     def __init__(self, broker: BaseBroker, state: TradingState, config: Settings):
         self.broker = broker
         self.state = state
         self.config = config
+        self.symbol = config.SYMBOL
 
     @abstractmethod
     def execute(self, name: str, direction: int) -> bool: ...
@@ -40,14 +73,41 @@ class BaseExecutor(ABC):
             self.state.account_balance,
             sl_distance,
             risk_pct,
-            self.broker.get_pip_value(),
+            self.broker.get_pip_value(self.symbol),
             self.config.MIN_LOT_SIZE,
             self.config.MAX_LOT_SIZE,
         )
 
     def _price(self, direction):
-        tick = self.broker.get_tick()
+        tick = self.broker.get_tick(self.symbol)
         if not tick:
             return False
 
         return tick.ask if direction == 1 else tick.bid
+
+    def _open(self, name, direction, size, stop_loss, take_profit, pip_point, time_out):
+        """Queue a market order, tracking the position once it is filled."""
+
+        def on_done(event: OrderEvent):
+            if not event.ok:
+                return
+            self.state.position_manager.add_position(
+                Position(
+                    id=event.position_id,
+                    symbol=event.symbol,
+                    direction=direction,
+                    entry_price=float(event.result.price),
+                    stop_loss=stop_loss,
+                    take_profit=take_profit,
+                    size=size,
+                    pip_point=pip_point,
+                    time_out=time_out,
+                    comment=name,
+                    entry_time=self.broker.now,
+                )
+            )
+
+        self.state.orders.open(
+            direction, size, stop_loss, take_profit, name, self.symbol, on_done
+        )
+        return True
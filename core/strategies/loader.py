@@ -1,12 +1,77 @@
+import copy
 import time
-from datetime import datetime, timedelta
-from typing import Any, Dict, Optional
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Optional
 
 import schedule
 
 from core.strategies.base import BaseDetector, BaseExecutor
-from core.utilities.event_bus import event_bus
+from core.strategies.memo import DetectorMemo
+from core.utilities.event_bus import EventBus, event_bus
 from core.utilities.logger import logger
+from core.utilities.profiler import profiler
+from models import BarEvent
+
+
+@dataclass
+class StrategyStats:
+    runs: int = 0
+    skipped: int = 0  # Due while the previous run was still going
+    overruns: int = 0  # Runs longer than the time budget
+    errors: int = 0
+    last_seconds: float = 0.0
+    max_seconds: float = 0.0
+    total_seconds: float = 0.0
+
+    def record(self, seconds: float):
+        self.runs += 1
+        self.last_seconds = seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        self.total_seconds += seconds
+
+    def as_dict(self) -> dict:
+        return {
+            "runs": self.runs,
+            "skipped": self.skipped,
+            "overruns": self.overruns,
+            "errors": self.errors,
+            "last_ms": self.last_seconds * 1000,
+            "mean_ms": self.total_seconds / self.runs * 1000 if self.runs else 0.0,
+            "max_ms": self.max_seconds * 1000,
+        }
+
+
+def next_run(schedule_config: Dict[str, Any], now: float) -> float:
+    """Epoch seconds of the first run after ``now`` of a clock schedule.
+
+    Mirrors the ``schedule`` jobs built by ``StrategyRegistry`` for replays,
+    where ``now`` is the replayed time (broker server time, read as UTC).
+    """
+    kind = schedule_config.get("type", "default")
+    if kind == "default":
+        return now + 10
+    if kind == "interval":
+        return now + schedule_config["seconds"]
+
+    current = datetime.fromtimestamp(now, timezone.utc)
+    if kind == "hourly":
+        minute, _, second = schedule_config.get("at", ":00").lstrip(":").partition(":")
+        run = current.replace(minute=int(minute), second=int(second or 0))
+        step = timedelta(hours=1)
+    elif kind == "daily":
+        hour, minute, *second = schedule_config["at"].split(":")
+        run = current.replace(
+            hour=int(hour), minute=int(minute), second=int(second[0] if second else 0)
+        )
+        step = timedelta(days=1)
+    else:
+        raise ValueError(f"Unknown schedule type: {kind}")
+    run = run.replace(microsecond=0)
+    if run <= current:
+        run += step
+    return run.timestamp()
 
 
 class Strategy:
@@ -17,20 +82,41 @@ class Strategy:
         executor: BaseExecutor,
         schedule_config: Dict[str, Any] = None,  # type: ignore
         duration_minutes: Optional[int] = None,
+        symbol: Optional[str] = None,
+        processes: bool = False,
+        time_budget: Optional[float] = None,
     ) -> None:
         self.name = name[:16]  # prevent long text, Important!
+        self.symbol = symbol or getattr(detector, "symbol", None)
         self.detector = detector
         self.executor = executor
         self.bus = event_bus
         self.schedule = schedule_config or {"type": "default"}
         self.duration_minutes = duration_minutes
-        self.start_time = datetime.now()
+        self.clock: Optional[Callable[[], float]] = None  # Wall clock when None
+        self.start_time = self.now()
         self.enabled = True
+        self.phase_name = f"strategy.{self.name}.{self.symbol}"
+        self.processes = processes
+        self.time_budget = time_budget
+        self.stats = StrategyStats()
+        self.future: Optional[Future] = None  # Current run on the worker pool
+        self.started = 0.0
+        self.elapsed: Optional[float] = None  # Seconds the last run took
+        self.overrun = False
+        self.last_bar = None  # Open time of the last bar run on (bar_close)
+        self.due: Optional[float] = None  # Monotonic time of the next run
+        self.next_run: Optional[float] = None  # Clock time of the next run
+
+    def now(self) -> datetime:
+        if self.clock is None:
+            return datetime.now()
+        return datetime.fromtimestamp(self.clock(), timezone.utc).replace(tzinfo=None)
 
     def should_stop(self) -> bool:
         if self.duration_minutes is None or self.duration_minutes == 0:
             return False
-        elapsed = datetime.now() - self.start_time
+        elapsed = self.now() - self.start_time
         return elapsed >= timedelta(minutes=self.duration_minutes)
 
     def run(self) -> Optional[schedule.CancelJob]:
@@ -42,21 +128,23 @@ class Strategy:
         if self.should_stop():
             return schedule.CancelJob  # type: ignore
 
-        direction, reason = self.detector.detect(self.name)
+        with profiler.phase(f"{self.phase_name}.detect"):
+            direction, reason = self.detector.detect(self.name)
         if direction in (-1, 1):
             try:
-                self.executor.execute(self.name, direction)
+                with profiler.phase(f"{self.phase_name}.execute"):
+                    self.executor.execute(self.name, direction)
                 execution_time = time.time() - start_time
 
                 logger.info(
-                    f"Successfully executed {self.name} strategy | "
+                    f"Successfully executed {self.name} strategy on {self.symbol} | "
                     f"Direction: {'LONG' if direction == 1 else 'SHORT'} | "
                     f"Execution time: {execution_time:.2f}s | "
                     f"Signal reason: {reason}"
                 )
             except Exception as e:
                 logger.error(
-                    f"Failed to execute {self.name} strategy | "
+                    f"Failed to execute {self.name} strategy on {self.symbol} | "
                     f"Direction: {'LONG' if direction == 1 else 'SHORT'} | "
                     f"Error: {str(e)} | "
                     f"Original signal reason: {reason}"
@@ -65,9 +153,42 @@ class Strategy:
 
 
 class StrategyRegistry:
-    def __init__(self) -> None:
+    """Schedules strategies and runs them on a worker pool.
+
+    ``run_pending`` only submits due strategies, so a slow detector no
+    longer holds up the loop; a strategy still running when it is due again
+    is skipped. ``dispatch`` runs on the main loop, collecting finished runs
+    and flagging those over their ``time_budget``. Every strategy runs on
+    the thread pool; those loaded with ``processes=True`` also get a shared
+    process pool on ``detector.process_pool`` for their picklable CPU heavy
+    work. ``inline`` runs everything on the calling thread, as replays need.
+
+    Besides the wall clock schedules, ``{"type": "bar_close", "timeframe":
+    tf, "delay_ms": 200}`` runs a strategy once per closed bar of ``tf`` on
+    its symbol, ``delay_ms`` after the ``BAR_CLOSED`` event on ``bus``.
+    With a ``clock`` (the replayed time), the wall clock schedules and
+    ``duration_minutes`` follow that clock instead.
+    """
+
+    def __init__(
+        self,
+        workers: int = 4,
+        inline: bool = False,
+        bus: Optional[EventBus] = None,
+        clock: Optional[Callable[[], float]] = None,
+    ) -> None:
         self.strategies = []
         self.default_strategy = None
+        self.workers = workers
+        self.inline = inline
+        self.bus = bus
+        self.clock = clock
+        self._clocked: list[Strategy] = []
+        self._threads = None
+        self._processes = None
+        self._bar_strategies: dict[tuple, list[Strategy]] = {}  # (symbol, tf)
+        self.memo = DetectorMemo()
+        self._due: list[Strategy] = []
 
     def load(
         self,
@@ -76,31 +197,213 @@ class StrategyRegistry:
         executor: BaseExecutor,
         schedule_config: Dict[str, Any] = None,  # type: ignore
         duration_minutes: Optional[int] = None,
+        symbols: Optional[list[str]] = None,
+        processes: bool = False,
+        time_budget: Optional[float] = None,
     ) -> "StrategyRegistry":
-        strategy = Strategy(name, detector, executor, schedule_config, duration_minutes)
+        """Register a strategy, once per symbol when ``symbols`` is given.
+
+        Each extra symbol gets a shallow copy of the detector and executor so
+        per-instrument state (e.g. ``prev_rsi``) is not shared.
+        ``processes`` sets ``detector.process_pool``, ``time_budget`` is the
+        seconds a run may take.
+        """
+        if symbols:
+            for i, symbol in enumerate(symbols):
+                symbol_detector = detector if i == 0 else copy.copy(detector)
+                symbol_executor = executor if i == 0 else copy.copy(executor)
+                symbol_detector.symbol = symbol  # type: ignore
+                symbol_executor.symbol = symbol  # type: ignore
+                self._add(
+                    Strategy(
+                        name,
+                        symbol_detector,
+                        symbol_executor,
+                        schedule_config,
+                        duration_minutes,
+                        symbol,
+                        processes,
+                        time_budget,
+                    )
+                )
+            return self
+
+        self._add(
+            Strategy(
+                name,
+                detector,
+                executor,
+                schedule_config,
+                duration_minutes,
+                processes=processes,
+                time_budget=time_budget,
+            )
+        )
+        return self
+
+    def _add(self, strategy: Strategy) -> None:
+        schedule_config = strategy.schedule
         self.strategies.append(strategy)
+        strategy.detector.memo = self.memo
+        strategy.detector.bar_close = schedule_config.get("type") == "bar_close"
+        if strategy.processes and not self.inline:
+            strategy.detector.process_pool = self._process_pool()
+        if schedule_config.get("type") == "default" and self.default_strategy is None:
+            self.default_strategy = strategy
+        if self.clock is not None:
+            strategy.clock = self.clock
+            strategy.start_time = strategy.now()
+            if schedule_config.get("type") != "bar_close":
+                strategy.next_run = next_run(schedule_config, self.clock())
+                self._clocked.append(strategy)
+                return
 
-        if schedule_config is None or schedule_config.get("type") == "default":
-            if self.default_strategy is None:
-                self.default_strategy = strategy
-            schedule.every(10).seconds.do(strategy.run)
+        if schedule_config.get("type") == "default":
+            schedule.every(10).seconds.do(self.submit, strategy)
         else:
             self._schedule_strategy(strategy)
 
-        return self
-
     def _schedule_strategy(self, strategy: Strategy) -> None:
         cfg = strategy.schedule
 
         if cfg["type"] == "interval":
-            schedule.every(cfg["seconds"]).seconds.do(strategy.run)
+            schedule.every(cfg["seconds"]).seconds.do(self.submit, strategy)
         elif cfg["type"] == "daily":
-            schedule.every().day.at(cfg["at"]).do(strategy.run)
+            schedule.every().day.at(cfg["at"]).do(self.submit, strategy)
         elif cfg["type"] == "hourly":
             at_time = cfg.get("at", ":00")
             if not at_time.startswith(":"):
                 at_time = f":{at_time}"
-            schedule.every().hour.at(at_time).do(strategy.run)
+            schedule.every().hour.at(at_time).do(self.submit, strategy)
+        elif cfg["type"] == "bar_close":
+            if self.bus is None:
+                raise ValueError("bar_close schedules need the registry's bus")
+            if not self._bar_strategies:
+                self.bus.subscribe("BAR_CLOSED", self.on_bar_closed)
+            key = (strategy.symbol, cfg["timeframe"])
+            self._bar_strategies.setdefault(key, []).append(strategy)
+
+    def on_bar_closed(self, event: BarEvent) -> None:
+        """Queue the bar_close strategies of the event's symbol/timeframe."""
+        for strategy in self._bar_strategies.get((event.symbol, event.timeframe), ()):
+            if strategy.last_bar is not None and event.timestamp <= strategy.last_bar:
+                continue  # Bar already seen, e.g. reconciled after the close
+            strategy.last_bar = event.timestamp
+            delay = 0.0 if self.inline else strategy.schedule.get("delay_ms", 0) / 1000
+            strategy.due = time.monotonic() + delay
+            if strategy not in self._due:
+                self._due.append(strategy)
+
+    def _run_clocked(self) -> None:
+        now = self.clock()
+        for strategy in self._clocked:
+            if not strategy.enabled or strategy.next_run > now:
+                continue
+            strategy.next_run = next_run(strategy.schedule, now)
+            if self.submit(strategy) is schedule.CancelJob:
+                strategy.enabled = False
+
+    def _run_due(self) -> None:
+        now = time.monotonic()
+        for strategy in [s for s in self._due if s.due <= now]:
+            self._due.remove(strategy)
+            strategy.due = None
+            if self.submit(strategy) is schedule.CancelJob:
+                strategy.enabled = False
+
+    def _process_pool(self) -> ProcessPoolExecutor:
+        if self._processes is None:
+            self._processes = ProcessPoolExecutor(max_workers=self.workers)
+        return self._processes
+
+    def submit(self, strategy: Strategy) -> Optional[schedule.CancelJob]:
+        """Start a run of ``strategy`` unless the previous one is going."""
+        if not strategy.enabled:
+            return None
+        if strategy.should_stop():
+            return schedule.CancelJob  # type: ignore
+        if strategy.future is not None:
+            strategy.stats.skipped += 1
+            logger.warning(
+                f"{strategy.name} on {strategy.symbol} still running after "
+                f"{time.monotonic() - strategy.started:.2f}s, skipping this run"
+            )
+            return None
+
+        strategy.started = time.monotonic()
+        strategy.elapsed = None
+        strategy.overrun = False
+        if self.inline:
+            future = Future()
+            try:
+                future.set_result(self._run(strategy))
+            except Exception as e:
+                future.set_exception(e)
+            strategy.future = future
+            self.dispatch()
+            return None
+
+        if self._threads is None:
+            self._threads = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="strategy"
+            )
+        strategy.future = self._threads.submit(self._run, strategy)
+        return None
+
+    @staticmethod
+    def _run(strategy: Strategy):
+        try:
+            return strategy.run()
+        finally:
+            strategy.elapsed = time.monotonic() - strategy.started
+
+    def dispatch(self) -> None:
+        """Collect finished runs and flag those over budget."""
+        now = time.monotonic()
+        for strategy in self.strategies:
+            future = strategy.future
+            if future is None:
+                continue
+            if future.cancelled():
+                strategy.future = None
+                continue
+            done = future.done()
+            elapsed = strategy.elapsed if done else now - strategy.started
+            budget = strategy.time_budget
+            if budget is not None and elapsed > budget and not strategy.overrun:
+                strategy.overrun = True
+                strategy.stats.overruns += 1
+                logger.warning(
+                    f"{strategy.name} on {strategy.symbol} exceeded its "
+                    f"{budget:.2f}s budget ({elapsed:.2f}s)"
+                )
+            if not done:
+                continue
+
+            strategy.future = None
+            strategy.stats.record(elapsed)
+            error = future.exception()
+            if error is not None:
+                strategy.stats.errors += 1
+                logger.error(
+                    f"{strategy.name} on {strategy.symbol} failed: {error}",
+                    exc_info=error,
+                )
+
+    def stats(self) -> dict[str, dict]:
+        return {
+            f"{strategy.name}.{strategy.symbol}": strategy.stats.as_dict()
+            for strategy in self.strategies
+        }
+
+    def close(self, wait: bool = True) -> None:
+        for pool in (self._threads, self._processes):
+            if pool is not None:
+                pool.shutdown(wait=wait, cancel_futures=True)
+        self._threads = self._processes = None
+        self.dispatch()
+        for strategy in self.strategies:
+            strategy.detector.close()
 
     def run_all(self) -> None:
         for strategy in self.strategies:
@@ -108,3 +411,15 @@ class StrategyRegistry:
 
     def run_pending(self) -> None:
         schedule.run_pending()
+        if self._clocked:
+            self._run_clocked()
+        self._run_due()
+        self.dispatch()
+
+    def idle_seconds(self) -> float | None:
+        """Seconds until the next scheduled run, None without any job"""
+        idle = schedule.idle_seconds()
+        if self._due:
+            bar_idle = min(s.due for s in self._due) - time.monotonic()
+            idle = bar_idle if idle is None else min(idle, bar_idle)
+        return idle
@@ -0,0 +1,59 @@
+import threading
+from collections import Counter, OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Hashable
+
+
+class DetectorMemo:
+    """Results of detector computations shared between registrations.
+
+    Keys name the detector type, its parameters, the symbol and the candle
+    versions read, so strategies on the same inputs compute once per bar.
+    Concurrent callers of a key being computed wait for that result instead
+    of repeating the work. The least recently used of ``maxsize`` results
+    are dropped first.
+    """
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._results: OrderedDict[Hashable, Future] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = Counter()
+        self.misses = Counter()
+
+    def get(self, key: tuple, compute: Callable[[], Any]) -> Any:
+        """Cached result of ``compute`` for ``key``; ``key[0]`` groups stats."""
+        with self._lock:
+            future = self._results.get(key)
+            owner = future is None
+            if owner:
+                future = self._results[key] = Future()
+                self.misses[key[0]] += 1
+                if len(self._results) > self.maxsize:
+                    self._results.popitem(last=False)
+            else:
+                self._results.move_to_end(key)
+                self.hits[key[0]] += 1
+        if not owner:
+            return future.result()  # Computed, or being computed by another
+
+        try:
+            future.set_result(compute())
+        except BaseException as e:
+            with self._lock:
+                self._results.pop(key, None)  # Let the next caller retry
+            future.set_exception(e)
+        return future.result()
+
+    def stats(self) -> dict[str, dict]:
+        with self._lock:
+            groups = set(self.hits) | set(self.misses)
+            return {
+                group: {
+                    "hits": self.hits[group],
+                    "misses": self.misses[group],
+                    "hit_rate": self.hits[group]
+                    / (self.hits[group] + self.misses[group]),
+                }
+                for group in sorted(groups)
+            }
@@ -1,14 +1,15 @@
 import math
 
-import MetaTrader5 as mt5
 import numpy as np
-from sklearn.linear_model import QuantileRegressor
 
 from config.settings import Settings
 from core.application.state import TradingState
+from core.infrastructure.brokers import mt5_constants as mt5
 from core.infrastructure.brokers.base import BaseBroker
+from core.infrastructure.candle import EWMAVolatility
 from core.strategies.base import BaseDetector
-from models import Candle
+
+from .quantile_fit import QuantileFitter
 
 
 class MajorTrendConfidenceDetector(BaseDetector):
@@ -16,11 +17,15 @@ class MajorTrendConfidenceDetector(BaseDetector):
         self.broker = broker
         self.state = state
         self.config = config
+        self.symbol = config.SYMBOL
         self.gamma_threshold = 0.85
+        self.fitter = None  # Created on first use, after the registry set the pool
 
     def detect(self, name):
-        if self.broker.has_positions_by_comment(name):
+        if self.broker.has_positions_by_comment(name, self.symbol):
             return 0, f"Existing position found for {name}, skipping new signal"
+        if self.state.orders.has_pending(name, self.symbol):
+            return 0, f"Order pending for {name}, skipping new signal"
 
         tf_analysis = {
             mt5.TIMEFRAME_D1: (7.0, "D1"),
@@ -32,9 +37,27 @@ class MajorTrendConfidenceDetector(BaseDetector):
         total_weight = sum(w for w, _ in tf_analysis.values())
         reason_parts = []
 
+        if self.fitter is None:
+            self.fitter = QuantileFitter(self.process_pool)
+        windows = {
+            tf: self._window(tf, self._calculate_realized_vol_bars(tf))
+            for tf in tf_analysis
+        }
+        # Every fit is in flight before the first result is awaited
+        slopes = {
+            tf: self.fitter.submit(tf, window[0], window[1])
+            for tf, window in windows.items()
+            if window is not None
+        }
+
         for tf, (weight, tf_name) in tf_analysis.items():
-            bars = self._calculate_realized_vol_bars(tf)
-            trend, conf = self._confirm_trend_with_quantile(tf, bars)
+            if windows[tf] is None:
+                trend, conf = 0, 0.0
+            else:
+                _, closes, tick_volumes = windows[tf]
+                trend, conf = self._confirm_trend_with_quantile(
+                    closes, tick_volumes, slopes[tf].result()
+                )
 
             reason_parts.append(f"{tf_name}{'↑' if trend>0 else '↓'}{conf:.1f}")
 
@@ -61,27 +84,32 @@ class MajorTrendConfidenceDetector(BaseDetector):
             )
         return 0, f"NEUTRAL | {' '.join(reason_parts)}"
 
-    def _confirm_trend_with_quantile(self, timeframe, bar_count):
-        if bar_count < 3:
-            return (0, 0.0)
-
-        candles: list[Candle] = self.state.get_candles(timeframe, bar_count)
-        if not candles or len(candles) < bar_count:
-            return (0, 0.0)
+    def close(self):
+        if self.fitter is not None:
+            self.fitter.close()
 
-        closes = np.array([candle.close for candle in candles])
-        x = np.arange(len(closes)).reshape(-1, 1)
+    def _window(self, timeframe, bar_count):
+        """Last bar time, closes and tick volumes of the last ``bar_count``
+        bars, None when there are not enough."""
+        if bar_count < 3:
+            return None
 
-        # Asymmetric trend detection - focuses on downside risks
-        qr = QuantileRegressor(quantile=0.33, alpha=1.0, solver="highs")
-        qr.fit(x, closes)
-        slope = qr.coef_[0]
+        buffer = self.state.get_candle_buffer(timeframe, self.symbol)
+        with self.state.lock:
+            if len(buffer) < bar_count:
+                return None
+            # Copies, the loop keeps updating the buffer during the fit
+            return (
+                float(buffer.timestamps(1)[-1]),
+                buffer.closes(bar_count).copy(),
+                buffer.volumes(bar_count).copy(),
+            )
 
+    def _confirm_trend_with_quantile(self, closes, tick_volumes, slope):
         bull_factor = np.sum(closes[-3:] > np.median(closes)) / 3.0
         bear_factor = np.sum(closes[-3:] < np.percentile(closes, 40)) / 3.0
 
         # Modified VWAP calculation for tick volume
-        tick_volumes = np.array([candle.volume for candle in candles])
         total_ticks = np.sum(tick_volumes)
 
         if total_ticks > 0:
@@ -112,7 +140,7 @@ class MajorTrendConfidenceDetector(BaseDetector):
         #     f"| Confidence: {conf*100:.0f}% "
         #     f"| Slope: {slope:.5f} "
         #     f"| TVWAP Δ: {price_deviation*100:.2f}% "
-        #     f"| Lookback: {bar_count}"
+        #     f"| Lookback: {len(closes)}"
         # )
 
         return (trend, conf)
@@ -135,21 +163,20 @@ class MajorTrendConfidenceDetector(BaseDetector):
         vol_target = default_vol_target.get(timeframe, 0.20)
         ann_factor = annualization.get(timeframe, 252)
 
-        candles = self.state.get_candles(timeframe, 300)
-        if not candles or len(candles) < 30:
+        buffer = self.state.get_candle_buffer(timeframe, self.symbol)
+        if len(buffer) < 30:
             return 20
 
-        closes = np.array([c.close for c in candles][-300:])
-        log_returns = np.log(closes[1:] / closes[:-1])
-
         # Use EWMA volatility or simple standard deviation
         if use_ewma:
-            weights = np.array([lambda_**i for i in range(len(log_returns))])[::-1]
-            weights /= weights.sum()
-            mean = np.sum(weights * log_returns)
-            variance = np.sum(weights * (log_returns - mean) ** 2)
-            realized_vol = np.sqrt(variance) * np.sqrt(ann_factor)
+            window = min(300, buffer.maxlen) - 1
+            ewma = self.state.indicator(
+                timeframe, EWMAVolatility, window, lambda_, symbol=self.symbol
+            )
+            realized_vol = (ewma.value or 0.0) * np.sqrt(ann_factor)
         else:
+            closes = buffer.closes(300)
+            log_returns = np.log(closes[1:] / closes[:-1])
             realized_vol = np.std(log_returns) * np.sqrt(ann_factor)
 
         # Inverse vol scaling with square root dampening
@@ -3,7 +3,6 @@ from core.application.state import TradingState
 from core.infrastructure.brokers.base import BaseBroker
 from core.infrastructure.risk import RiskCalculator
 from core.strategies.base import BaseExecutor
-from models import Position
 
 
 class MajorTrendConfidenceExecutor(BaseExecutor):
@@ -13,7 +12,7 @@ class MajorTrendConfidenceExecutor(BaseExecutor):
     def execute(self, name, direction):
 
         price = self._price(direction)
-        pip_value = self.broker.get_pip_value()
+        pip_value = self.broker.get_pip_value(self.symbol)
 
         # TODO fix this have a better SL value!
         sl_distance = 30 * pip_value * 10  # 30pips
@@ -22,24 +21,6 @@ class MajorTrendConfidenceExecutor(BaseExecutor):
         take_profit = self._calculate_take_profit(
             price, direction, self.config.TP_RATIO * sl_distance
         )
-        order = self.broker.add_order(
-            direction=direction, volume=size, sl=stop_loss, tp=take_profit, comment=name
+        return self._open(
+            name, direction, size, stop_loss, take_profit, pip_value, time_out=0
         )
-
-        if order:
-            self.state.position_manager.add_position(
-                Position(
-                    id=order.order,
-                    symbol=self.config.SYMBOL,
-                    direction=direction,
-                    entry_price=float(order.price),
-                    stop_loss=stop_loss,
-                    take_profit=take_profit,
-                    size=size,
-                    pip_point=pip_value,
-                    time_out=0,
-                    comment=name,
-                )
-            )
-            return True
-        return False
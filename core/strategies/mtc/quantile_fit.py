@@ -0,0 +1,137 @@
+import threading
+import weakref
+from concurrent.futures import Executor, Future
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+_segments = {}  # Shared memory attached by this (worker) process
+
+
+def quantile_slope(closes, quantile=0.33):
+    """Slope of a quantile regression of ``closes`` over the bar index."""
+    # Imported by the first fit, usually in a pool worker
+    from sklearn.linear_model import QuantileRegressor
+
+    x = np.arange(len(closes)).reshape(-1, 1)
+
+    # Asymmetric trend detection - focuses on downside risks
+    qr = QuantileRegressor(quantile=quantile, alpha=1.0, solver="highs")
+    qr.fit(x, closes)
+    return qr.coef_[0]
+
+
+def _attach(name) -> SharedMemory:
+    segment = _segments.get(name)
+    if segment is None:
+        # Pool workers share the owner's resource tracker, which keeps the
+        # name registered once until the owner unlinks it
+        segment = _segments[name] = SharedMemory(name=name)
+    return segment
+
+
+def _shared_slope(name, offset, length, quantile):
+    segment = _attach(name)
+    closes = np.ndarray((length,), dtype=np.float64, buffer=segment.buf, offset=offset)
+    return quantile_slope(closes.copy(), quantile)
+
+
+class QuantileFitter:
+    """Fits ``quantile_slope`` in a process pool, caching every result.
+
+    A fit is keyed by (timeframe, last bar timestamp, bar count), so each
+    timeframe costs at most one fit per bar. Closes go to the workers
+    through one shared memory slot per timeframe instead of being pickled.
+    A slot is rewritten only once its previous fit finished, so callers
+    must wait for a timeframe's result before submitting it again. Without
+    a pool the fits run on the calling thread.
+    """
+
+    def __init__(
+        self,
+        pool: Executor | None = None,
+        slots: int = 4,
+        slot_size: int = 512,
+        quantile: float = 0.33,
+    ):
+        self.pool = pool
+        self.slots = slots
+        self.slot_size = slot_size
+        self.quantile = quantile
+        self.cache = {}  # timeframe -> (key, slope)
+        self.hits = 0
+        self.misses = 0
+        self._slots = {}  # timeframe -> byte offset in the segment
+        self._lock = threading.Lock()
+        self._segment = None
+        self._finalizer = None
+
+    def submit(self, timeframe, last_time, closes) -> Future:
+        """Future slope of ``closes``, the last of which opened at ``last_time``."""
+        key = (timeframe, last_time, len(closes))
+        cached = self.cache.get(timeframe)
+        if cached is not None and cached[0] == key:
+            self.hits += 1
+            future = Future()
+            future.set_result(cached[1])
+            return future
+
+        self.misses += 1
+        if self.pool is None:
+            future = Future()
+            future.set_result(quantile_slope(closes, self.quantile))
+        else:
+            offset = self._slot(timeframe) if len(closes) <= self.slot_size else None
+            if offset is None:
+                future = self.pool.submit(quantile_slope, closes, self.quantile)
+            else:
+                view = np.ndarray(
+                    (len(closes),), np.float64, buffer=self._segment.buf, offset=offset
+                )
+                view[:] = closes
+                future = self.pool.submit(
+                    _shared_slope,
+                    self._segment.name,
+                    offset,
+                    len(closes),
+                    self.quantile,
+                )
+        future.add_done_callback(lambda f: self._store(key, f))
+        return future
+
+    def _store(self, key, future: Future):
+        if not future.cancelled() and future.exception() is None:
+            self.cache[key[0]] = (key, future.result())
+
+    def _slot(self, timeframe):
+        """Byte offset of the timeframe's slot, None once all are taken."""
+        with self._lock:
+            if self._segment is None:
+                self._segment = SharedMemory(
+                    create=True, size=self.slots * self.slot_size * 8
+                )
+                self._finalizer = weakref.finalize(self, _release, self._segment)
+            if timeframe not in self._slots:
+                if len(self._slots) == self.slots:
+                    return None
+                self._slots[timeframe] = len(self._slots) * self.slot_size * 8
+            return self._slots[timeframe]
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    def close(self):
+        if self._finalizer is not None:
+            self._finalizer()
+        self._segment = self._finalizer = None
+        self._slots.clear()
+
+
+def _release(segment: SharedMemory):
+    segment.close()
+    segment.unlink()
@@ -1,12 +1,10 @@
 from datetime import datetime, timedelta, timezone
 
-import MetaTrader5 as mt5
-import numpy as np
-
 from config.settings import Settings
 from core.application.state import TradingState
+from core.infrastructure.brokers import mt5_constants as mt5
 from core.infrastructure.brokers.base import BaseBroker
-from core.infrastructure.candle import CandlePlotter
+from core.infrastructure.candle import RSI, ExpWeightedMA
 from core.strategies.base import BaseDetector
 from core.utilities.logger import logger
 from models import Candle
@@ -17,30 +15,113 @@ class ScalpingDetector(BaseDetector):
         self.broker = broker
         self.state = state
         self.config = config
+        self.symbol = config.SYMBOL
         self.prev_rsi = None
+        self.fast_period = 5
+        self.slow_period = 13
+        self.rsi_period = 14
+        self.lookback = 30
         self.gmt_plus_8 = timezone(timedelta(hours=8))
 
     def detect(self, name):
-        if self.broker.has_positions_by_comment(name):
+        if self.broker.has_positions_by_comment(name, self.symbol):
             return 0, f"Existing position found for {name}, skipping new signal"
+        if self.state.orders.has_pending(name, self.symbol):
+            return 0, f"Order pending for {name}, skipping new signal"
+
+        # Shared with the other scalpers on this symbol until the M1 candles
+        # change; prev_rsi only matters through whether it was set yet
+        first_run = self.prev_rsi is None
+        key = (
+            type(self).__name__,
+            self.fast_period,
+            self.slow_period,
+            self.rsi_period,
+            self.lookback,
+            self.symbol,
+            self.state.candle_version(mt5.TIMEFRAME_M1, self.symbol),
+            self.bar_close,
+            first_run,
+        )
+        signal, reason, current_rsi = self._memoized(
+            key, lambda: self._signal(first_run)
+        )
+        if current_rsi is not None:
+            self.prev_rsi = current_rsi
 
-        candles: list[Candle] = self.state.get_candles(mt5.TIMEFRAME_M1, 30)
+        if signal == 0:
+            return signal, reason
 
-        if len(candles) < 30:
-            return 0, f"Insufficient candles: {len(candles)}/30, skipping detection"
+        try:
+            tick = self.broker.get_tick(self.symbol)
+            if not tick:
+                return 0, "Broker tick data unavailable"
 
-        closes = np.array([candle.close for candle in candles])
+            current_time = datetime.now(self.gmt_plus_8)
+            date_str = current_time.strftime("%Y-%m-%d_%H-%M-%S")
+            direction = "LONG" if signal > 0 else "SHORT"
 
-        ema_fast = self._ema(closes, 5)
-        ema_slow = self._ema(closes, 13)
-        rsi = self._rsi(closes, 14)
+            plot_title = f"{name} {self.symbol} {direction} Signal {date_str}"
+            filename = f"{name}_{self.symbol}_{direction}_{date_str}"
+            candles: list[Candle] = self.state.get_candles(
+                mt5.TIMEFRAME_M1, self.lookback, self.symbol
+            )
+            from core.infrastructure.candle.candle_plotter import CandlePlotter
 
-        current_close = closes[-1]
-        current_rsi = rsi[-1]
-        current_fast = ema_fast[-1]
-        current_slow = ema_slow[-1]
-        prev_fast = ema_fast[-2]
-        prev_slow = ema_slow[-2]
+            plotter = CandlePlotter(plot_title)
+            plotter.plot_and_save(candles, filename)
+
+            return signal, reason
+
+        except Exception as e:
+            return 0, f"Signal processing failed: {str(e)}"
+
+    def get_state(self):
+        return {"prev_rsi": self.prev_rsi}
+
+    def set_state(self, state):
+        self.prev_rsi = state.get("prev_rsi")
+
+    def _signal(self, first_run):
+        """Signal, reason and RSI on the current M1 candles, the RSI is None
+        when there are too few."""
+        lookback = self.lookback
+        # Closes and indicators of the same bar, the main loop updates them
+        # under this lock
+        with self.state.lock:
+            closes = (
+                self.state.get_candle_buffer(mt5.TIMEFRAME_M1, self.symbol)
+                .closes(lookback)
+                .copy()
+            )
+
+            if len(closes) < lookback:
+                return (
+                    0,
+                    f"Insufficient candles: {len(closes)}/{lookback}, skipping detection",
+                    None,
+                )
+
+            indicator = self.state.indicator
+            ema_fast = indicator(
+                mt5.TIMEFRAME_M1, ExpWeightedMA, self.fast_period, symbol=self.symbol
+            )
+            ema_slow = indicator(
+                mt5.TIMEFRAME_M1, ExpWeightedMA, self.slow_period, symbol=self.symbol
+            )
+            rsi = indicator(mt5.TIMEFRAME_M1, RSI, self.rsi_period, symbol=self.symbol)
+
+            if self.bar_close:
+                # The crossover between the last two closed bars
+                current_rsi = rsi.previous
+                current_fast, prev_fast = ema_fast.previous, ema_fast.before
+                current_slow, prev_slow = ema_slow.previous, ema_slow.before
+                current_close = closes[-2]
+            else:
+                current_rsi = rsi.value
+                current_fast, prev_fast = ema_fast.value, ema_fast.previous
+                current_slow, prev_slow = ema_slow.value, ema_slow.previous
+                current_close = closes[-1]
 
         trend_up = current_fast > current_slow and prev_fast <= prev_slow
         trend_down = current_fast < current_slow and prev_fast >= prev_slow
@@ -49,19 +130,17 @@ class ScalpingDetector(BaseDetector):
         long_condition = (
             trend_up
             and current_close > current_fast
-            and (self.prev_rsi is None or current_rsi < 70)
+            and (first_run or current_rsi < 70)
             and current_rsi > 50
         )
 
         short_condition = (
             trend_down
             and current_close < current_fast
-            and (self.prev_rsi is None or current_rsi > 30)
+            and (first_run or current_rsi > 30)
             and current_rsi < 50
         )
 
-        self.prev_rsi = current_rsi
-
         signal = 0
         reason = ""
         if long_condition:
@@ -72,43 +151,5 @@ class ScalpingDetector(BaseDetector):
             signal = -1
 
         if signal == 0:
-            return signal, "No trading conditions met"
-
-        try:
-            tick = self.broker.get_tick()
-            if not tick:
-                return 0, "Broker tick data unavailable"
-
-            current_time = datetime.now(self.gmt_plus_8)
-            date_str = current_time.strftime("%Y-%m-%d_%H-%M-%S")
-            direction = "LONG" if signal > 0 else "SHORT"
-
-            plot_title = f"{name} {direction} Signal {date_str}"
-            filename = f"{name}_{direction}_{date_str}"
-            plotter = CandlePlotter(plot_title)
-            plotter.plot_and_save(candles, filename)
-
-            return signal, reason
-
-        except Exception as e:
-            return 0, f"Signal processing failed: {str(e)}"
-
-    def _ema(self, prices, period):
-        weights = np.exp(np.linspace(0, -1, period))
-        weights /= weights.sum()
-        ema = np.convolve(prices, weights, mode="full")[: len(prices)]
-        ema[:period] = ema[period]
-        return ema
-
-    def _rsi(self, prices, period):
-        deltas = np.diff(prices)
-        gains = np.where(deltas > 0, deltas, 0)
-        losses = np.where(deltas < 0, -deltas, 0)
-
-        avg_gain = np.convolve(gains, np.ones(period) / period, mode="valid")
-        avg_loss = np.convolve(losses, np.ones(period) / period, mode="valid")
-
-        rs = avg_gain / (avg_loss + 1e-10)
-        rsi = 100 - (100 / (1 + rs))
-
-        return np.concatenate([np.zeros(period), rsi])
+            reason = "No trading conditions met"
+        return signal, reason, current_rsi
@@ -1,12 +1,9 @@
-import MetaTrader5 as mt5
-
 from config.settings import Settings
 from core.application.state import TradingState
+from core.infrastructure.brokers import mt5_constants as mt5
 from core.infrastructure.brokers.base import BaseBroker
-from core.infrastructure.candle import CandlePlotter
 from core.infrastructure.risk import RiskCalculator
 from core.strategies.base import BaseExecutor
-from models import Position
 
 
 class ScalpingExecutor(BaseExecutor):
@@ -16,7 +13,7 @@ class ScalpingExecutor(BaseExecutor):
 
     def execute(self, name, direction):
         price = self._price(direction)
-        atr = self.state.candle_manager.calculate_atr(mt5.TIMEFRAME_M1, 14)
+        atr = self.state.calculate_atr(mt5.TIMEFRAME_M1, 14, self.symbol)
         sl_distance = atr * 1.5
         tp_distance = atr * 3
 
@@ -24,29 +21,13 @@ class ScalpingExecutor(BaseExecutor):
         take_profit = self._calculate_take_profit(price, direction, tp_distance)
         size = self._calculate_volume(sl_distance, self.config.RISK_PER_TRADE * 0.5)
 
-        # Execute trade
-        order = self.broker.add_order(
-            direction=direction,
-            volume=size,
-            sl=stop_loss,
-            tp=take_profit,
-            comment=name,
+        # Execute trade, auto-closed after 3 minutes
+        return self._open(
+            name,
+            direction,
+            size,
+            stop_loss,
+            take_profit,
+            self.broker.get_pip_value(self.symbol),
+            time_out=self.trade_duration,
         )
-
-        if order:
-            self.state.position_manager.add_position(
-                Position(
-                    id=order.order,
-                    symbol=self.config.SYMBOL,
-                    direction=direction,
-                    entry_price=float(order.price),
-                    stop_loss=stop_loss,
-                    take_profit=take_profit,
-                    size=size,
-                    pip_point=self.broker.get_pip_value(),
-                    time_out=self.trade_duration,  # Auto-close after 3 minutes
-                    comment=name,
-                )
-            )
-            return True
-        return False
@@ -1,19 +1,225 @@
-from collections import defaultdict
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Callable, Hashable
 
+from core.utilities.logger import logger
+from core.utilities.profiler import LatencyHistogram
+
+BLOCK = "block"  # Publishers wait for room
+DROP_OLDEST = "drop_oldest"  # The oldest queued event is discarded
+COALESCE = "coalesce"  # A queued event with the same key is replaced
+OVERFLOW_POLICIES = (BLOCK, DROP_OLDEST, COALESCE)
+
+
+class TopicStats:
+    __slots__ = (
+        "published",
+        "handled",
+        "dropped",
+        "coalesced",
+        "errors",
+        "max_depth",
+        "latency",
+    )
 
-class EventBus:
     def __init__(self):
+        self.published = 0
+        self.handled = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.errors = 0
+        self.max_depth = 0
+        self.latency = LatencyHistogram()  # All handlers of one event
+
+
+class _Topic:
+    """Bounded queue of an asynchronous event type."""
+
+    def __init__(self, name, maxsize, overflow, priority, key):
+        self.name = name
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self.priority = priority
+        self.key = key
+        self.queue = deque()  # Events, or keys of ``pending`` when coalescing
+        self.pending = {}
+        self.busy = False  # Delivered by one thread at a time, in order
+
+    def ready(self) -> bool:
+        return bool(self.queue) and not self.busy
+
+    def put(self, data):
+        if self.overflow == COALESCE:
+            key = self.key(data) if self.key is not None else None
+            self.queue.append(key)
+            self.pending[key] = data
+        else:
+            self.queue.append(data)
+
+    def take(self):
+        item = self.queue.popleft()
+        return self.pending.pop(item) if self.overflow == COALESCE else item
+
+
+class EventBus:
+    """Publish/subscribe between components.
+
+    Events are delivered synchronously on the publisher's thread unless
+    their type is ``route``-d to a bounded queue, then ``workers`` dispatcher
+    threads deliver them in publish order, priority topics first. Handler
+    errors are logged and never reach the publisher.
+    """
+
+    def __init__(self, workers: int = 2):
         self.subscriptions = defaultdict(list)
+        self.workers = workers
+        self.topics: dict[str, _Topic] = {}
+        self.topic_stats = defaultdict(TopicStats)
+        self._cond = threading.Condition()
+        self._threads: list[threading.Thread] = []
+        self._local = threading.local()
+        self._closed = False
+        self._next = 0  # Round robin over normal topics
 
     def subscribe(self, event_type, callback):
         self.subscriptions[event_type].append(callback)
 
+    def route(
+        self,
+        event_type,
+        maxsize: int = 1000,
+        overflow: str = BLOCK,
+        priority: bool = False,
+        key: Callable[[object], Hashable] | None = None,
+    ):
+        """Deliver ``event_type`` from a bounded queue on dispatcher threads.
+
+        ``overflow`` applies when ``maxsize`` events are queued; ``COALESCE``
+        keeps only the latest event per ``key(data)`` (the latest event when
+        None) and blocks when the queue is full of distinct keys.
+        """
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+        if self.workers < 1:
+            return  # Everything stays synchronous
+        with self._cond:
+            self.topics[event_type] = _Topic(
+                event_type, maxsize, overflow, priority, key
+            )
+            while len(self._threads) < self.workers:
+                thread = threading.Thread(
+                    target=self._work,
+                    name=f"event-bus-{len(self._threads)}",
+                    daemon=True,
+                )
+                self._threads.append(thread)
+                thread.start()
+
     def publish(self, event_type, data=None):
+        stats = self.topic_stats[event_type]
+        stats.published += 1
+        topic = self.topics.get(event_type)
+        if topic is None or self._closed:
+            self._deliver(event_type, data, stats)
+            return
+
+        with self._cond:
+            if topic.overflow == COALESCE:
+                key = topic.key(data) if topic.key is not None else None
+                if key in topic.pending:
+                    topic.pending[key] = data
+                    stats.coalesced += 1
+                    return
+            while len(topic.queue) >= topic.maxsize:
+                # A dispatcher waiting for room could wait for itself
+                if topic.overflow == DROP_OLDEST or getattr(
+                    self._local, "dispatcher", False
+                ):
+                    topic.take()
+                    stats.dropped += 1
+                else:
+                    self._cond.wait()
+            topic.put(data)
+            stats.max_depth = max(stats.max_depth, len(topic.queue))
+            self._cond.notify_all()
+
+    def _deliver(self, event_type, data, stats: TopicStats):
+        start = time.perf_counter()
         for callback in self.subscriptions[event_type]:
             try:
                 callback(data)
             except Exception as e:
-                print(f"Event handler failed: {e}")
+                stats.errors += 1
+                logger.exception(f"{event_type} handler {callback!r} failed: {e}")
+        stats.latency.record(time.perf_counter() - start)
+        stats.handled += 1
+
+    def _ready(self) -> _Topic | None:
+        normal = []
+        for topic in self.topics.values():
+            if topic.priority:
+                if topic.ready():
+                    return topic
+            else:
+                normal.append(topic)
+        for i in range(len(normal)):
+            topic = normal[(self._next + i) % len(normal)]
+            if topic.ready():
+                self._next = (self._next + i + 1) % len(normal)
+                return topic
+        return None
+
+    def _work(self):
+        self._local.dispatcher = True
+        while True:
+            with self._cond:
+                topic = self._ready()
+                while topic is None:
+                    if self._closed:
+                        return
+                    self._cond.wait()
+                    topic = self._ready()
+                data = topic.take()
+                topic.busy = True
+                self._cond.notify_all()  # Room for blocked publishers
+            try:
+                self._deliver(topic.name, data, self.topic_stats[topic.name])
+            finally:
+                with self._cond:
+                    topic.busy = False
+                    self._cond.notify_all()
+
+    def depth(self, event_type) -> int:
+        topic = self.topics.get(event_type)
+        return len(topic.queue) if topic is not None else 0
+
+    def stats(self) -> dict[str, dict]:
+        return {
+            event_type: {
+                "published": stats.published,
+                "handled": stats.handled,
+                "dropped": stats.dropped,
+                "coalesced": stats.coalesced,
+                "errors": stats.errors,
+                "depth": self.depth(event_type),
+                "max_depth": stats.max_depth,
+                "handler_p50_ms": stats.latency.percentile(50) * 1000,
+                "handler_p99_ms": stats.latency.percentile(99) * 1000,
+            }
+            for event_type, stats in sorted(dict(self.topic_stats).items())
+        }
+
+    def close(self, timeout: float | None = 5.0):
+        """Deliver the queued events, then stop the dispatcher threads.
+
+        Events published afterwards are delivered synchronously."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads.clear()
 
 
 event_bus = EventBus()
@@ -0,0 +1,127 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable
+
+from core.utilities.logger import logger
+from core.utilities.profiler import LatencyHistogram
+
+# Histogram buckets in seconds, from a fast MT5 call to a slow strategy run
+BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+class Exposition:
+    """Prometheus text format writer.
+
+    Samples of one metric must be written together; ``# HELP`` and
+    ``# TYPE`` come with its first sample.
+    """
+
+    def __init__(self, prefix: str = "trademanager_"):
+        self.prefix = prefix
+        self.lines: list[str] = []
+        self._declared = set()
+
+    def _declare(self, name, kind, help):
+        if name not in self._declared:
+            self._declared.add(name)
+            self.lines.append(f"# HELP {name} {help}")
+            self.lines.append(f"# TYPE {name} {kind}")
+
+    def gauge(self, name, value, labels=None, help=""):
+        name = self.prefix + name
+        self._declare(name, "gauge", help or name)
+        self.lines.append(f"{name}{_labels(labels)} {float(value)!r}")
+
+    def counter(self, name, value, labels=None, help=""):
+        name = self.prefix + name + "_total"
+        self._declare(name, "counter", help or name)
+        self.lines.append(f"{name}{_labels(labels)} {float(value)!r}")
+
+    def histogram(self, name, histogram: LatencyHistogram, labels=None, help=""):
+        name = self.prefix + name
+        self._declare(name, "histogram", help or name)
+        labels = dict(labels or {})
+        for bound, count in zip(BUCKETS, histogram.cumulative(BUCKETS)):
+            self.lines.append(
+                f"{name}_bucket{_labels({**labels, 'le': bound})} {count}"
+            )
+        self.lines.append(
+            f"{name}_bucket{_labels({**labels, 'le': '+Inf'})} {histogram.count}"
+        )
+        self.lines.append(f"{name}_sum{_labels(labels)} {histogram.total!r}")
+        self.lines.append(f"{name}_count{_labels(labels)} {histogram.count}")
+
+    def text(self) -> str:
+        return "\n".join(self.lines) + "\n"
+
+
+class MetricsServer:
+    """Serves ``/metrics`` in Prometheus text format on localhost.
+
+    Collectors are called with an ``Exposition`` on every scrape, on the
+    server thread, and read the counters the app already keeps; nothing
+    is computed or locked on the trading loop for them.
+    """
+
+    def __init__(self, port: int, host: str = "127.0.0.1"):
+        self.host = host
+        self.port = port
+        self.collectors: list[Callable[[Exposition], None]] = []
+        self._server = None
+        self._thread = None
+
+    def register(self, collector: Callable[[Exposition], None]):
+        self.collectors.append(collector)
+
+    def render(self) -> str:
+        out = Exposition()
+        for collector in self.collectors:
+            try:
+                collector(out)
+            except Exception as e:
+                logger.error(f"Metrics collector failed: {e}")
+        return out.text()
+
+    def start(self):
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # One line per scrape would flood the log
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]  # Resolved when 0
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="metrics", daemon=True
+        )
+        self._thread.start()
+        logger.info(f"Metrics on http://{self.host}:{self.port}/metrics")
+
+    def close(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
@@ -0,0 +1,215 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+from core.utilities.logger import logger
+
+SUB_BUCKETS = 16  # Per power of two, i.e. at most ~6% relative error
+BUCKETS = 32 * SUB_BUCKETS  # Up to 2**31 us, about 35 minutes
+
+
+class LatencyHistogram:
+    """HDR-style log-linear histogram of durations in microseconds.
+
+    Values below ``2 * SUB_BUCKETS`` us are exact; above, every power of two
+    is split in ``SUB_BUCKETS`` equal buckets. Recording is a few integer
+    operations, so it can stay on in production.
+    """
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    @staticmethod
+    def _index(micros: int) -> int:
+        if micros < 2 * SUB_BUCKETS:
+            return micros
+        shift = micros.bit_length() - 5
+        return min(
+            (shift + 1) * SUB_BUCKETS + (micros >> shift) - SUB_BUCKETS, BUCKETS - 1
+        )
+
+    @staticmethod
+    def _upper(index: int) -> int:
+        """Largest value, in microseconds, counted in bucket ``index``."""
+        if index < 2 * SUB_BUCKETS:
+            return index
+        shift = index // SUB_BUCKETS - 1
+        return ((index % SUB_BUCKETS + SUB_BUCKETS + 1) << shift) - 1
+
+    def record(self, seconds: float):
+        micros = int(seconds * 1e6)
+        self.counts[self._index(micros)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def merge(self, other: "LatencyHistogram"):
+        for index, count in enumerate(other.counts):
+            if count:
+                self.counts[index] += count
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def cumulative(self, bounds) -> list[int]:
+        """Counts of values at most each of the ascending ``bounds`` seconds."""
+        counts = [0] * len(bounds)
+        seen = 0
+        i = 0
+        for index, count in enumerate(self.counts):
+            if not count:
+                continue
+            upper = self._upper(index) / 1e6
+            while i < len(bounds) and bounds[i] < upper:
+                counts[i] = seen
+                i += 1
+            seen += count
+        for j in range(i, len(bounds)):
+            counts[j] = seen
+        return counts
+
+    def percentile(self, q: float) -> float:
+        """Upper bound, in seconds, of the ``q`` (0-100) percentile."""
+        if not self.count:
+            return 0.0
+        rank = max(1, int(self.count * q / 100 + 0.5))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(self._upper(index) / 1e6, self.max)
+        return self.max
+
+    def summary(self) -> dict:
+        return {
+            "count": self.count,
+            "mean_ms": self.total / self.count * 1000 if self.count else 0.0,
+            "p50_ms": self.percentile(50) * 1000,
+            "p99_ms": self.percentile(99) * 1000,
+            "max_ms": self.max * 1000,
+        }
+
+
+class _NoPhase:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class Profiler:
+    """Times named phases of the trading loop into latency histograms.
+
+    ``with profiler.phase("state.update"):`` times a block, nested or on
+    any thread; ``record`` adds a duration measured elsewhere. ``maybe_report``
+    logs and appends a JSON line per ``interval`` seconds to ``out_dir``,
+    then starts a new window. Windows are merged into ``totals``, so
+    ``cumulative`` covers the whole session for the metrics endpoint.
+    """
+
+    def __init__(self, interval: float = 60.0, out_dir: str = "out/profile"):
+        self.enabled = True
+        self.interval = interval
+        self.out_dir = out_dir
+        self.histograms: dict[str, LatencyHistogram] = {}
+        self._no_phase = _NoPhase()
+        self.totals: dict[str, LatencyHistogram] = {}
+        # Worker threads record too, a sample never lands in a histogram
+        # that reset already merged
+        self._lock = threading.Lock()
+        self.window_start = time.time()
+
+    def configure(self, enabled=True, interval=None, out_dir=None):
+        self.enabled = enabled
+        if interval is not None:
+            self.interval = interval
+        if out_dir is not None:
+            self.out_dir = out_dir
+
+    def phase(self, name):
+        if not self.enabled:
+            return self._no_phase
+        return self._timed(name)
+
+    @contextmanager
+    def _timed(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def record(self, name, seconds):
+        if self.enabled:
+            with self._lock:
+                histogram = self.histograms.get(name)
+                if histogram is None:
+                    histogram = self.histograms[name] = LatencyHistogram()
+                histogram.record(seconds)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                name: histogram.summary()
+                for name, histogram in sorted(self.histograms.items())
+                if histogram.count
+            }
+
+    def cumulative(self) -> dict[str, LatencyHistogram]:
+        """Session histograms, the current window included."""
+        with self._lock:
+            merged = {}
+            for name, histogram in self.totals.items():
+                merged[name] = LatencyHistogram()
+                merged[name].merge(histogram)
+            for name, histogram in self.histograms.items():
+                merged.setdefault(name, LatencyHistogram()).merge(histogram)
+        return merged
+
+    def reset(self):
+        with self._lock:
+            for name, histogram in self.histograms.items():
+                self.totals.setdefault(name, LatencyHistogram()).merge(histogram)
+            self.histograms.clear()
+        self.window_start = time.time()
+
+    def maybe_report(self, now=None) -> bool:
+        now = time.time() if now is None else now
+        if not self.enabled or now - self.window_start < self.interval:
+            return False
+        self.report(now)
+        return True
+
+    def report(self, now=None):
+        now = time.time() if now is None else now
+        phases = self.snapshot()
+        lines = [
+            f"  {name:<36} n={s['count']:<7} p50={s['p50_ms']:8.2f}ms "
+            f"p99={s['p99_ms']:8.2f}ms max={s['max_ms']:8.2f}ms"
+            for name, s in phases.items()
+        ]
+        logger.info(
+            f"Profile of the last {now - self.window_start:.0f}s:\n" + "\n".join(lines)
+        )
+
+        os.makedirs(self.out_dir, exist_ok=True)
+        path = os.path.join(
+            self.out_dir, f"profile_{datetime.fromtimestamp(now):%y_%m_%d}.jsonl"
+        )
+        record = {"start": self.window_start, "end": now, "phases": phases}
+        with open(path, "a") as f:
+            f.write(json.dumps(record) + "\n")
+        self.reset()
+
+
+profiler = Profiler()
@@ -0,0 +1,80 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+from core.utilities.logger import logger
+
+
+def timed(fn, *args) -> float:
+    """Seconds ``fn(*args)`` took"""
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+class StartupReport:
+    """Wall time of every startup phase, logged and kept as JSON lines.
+
+    Top level phases (import, broker, warm-up, GUI...) are timed with
+    ``phase``; ``record`` adds details such as the warm-up of one
+    timeframe, which may overlap since they run concurrently.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases: dict[str, float] = {}
+        self.details: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + (
+                time.perf_counter() - start
+            )
+
+    def record(self, name, seconds):
+        with self._lock:
+            self.details[name] = seconds
+
+    @property
+    def total(self) -> float:
+        return time.perf_counter() - self.started
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            details = dict(self.details)
+        return {
+            "time": datetime.now().isoformat(timespec="seconds"),
+            "total": self.total,
+            "phases": dict(self.phases),
+            "details": details,
+        }
+
+    def report(self, out_dir=None) -> dict:
+        """Log the report and append it to ``<out_dir>/startup.jsonl``"""
+        report = self.as_dict()
+        lines = [
+            f"  {name:<24} {seconds:7.3f}s"
+            for name, seconds in report["phases"].items()
+        ]
+        lines += [
+            f"    {name:<22} {seconds:7.3f}s"
+            for name, seconds in sorted(report["details"].items())
+        ]
+        logger.info(f"Started in {report['total']:.3f}s:\n" + "\n".join(lines))
+
+        if out_dir:
+            os.makedirs(out_dir, exist_ok=True)
+            with open(os.path.join(out_dir, "startup.jsonl"), "a") as f:
+                f.write(json.dumps(report) + "\n")
+        return report
+
+
+startup = StartupReport()
@@ -0,0 +1,27 @@
+import threading
+
+
+class Wakeup:
+    """Wakes the main loop early when a producer thread has new work."""
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._pending = False
+
+    def notify(self):
+        with self._condition:
+            self._pending = True
+            self._condition.notify_all()
+
+    def wait(self, timeout: float | None) -> bool:
+        """Block until notified or ``timeout`` seconds passed.
+
+        Returns True when woken by ``notify``. Notifications that arrive
+        while the loop is busy are kept, so none is missed.
+        """
+        with self._condition:
+            if not self._pending:
+                self._condition.wait(timeout)
+            woken = self._pending
+            self._pending = False
+            return woken
@@ -1,2 +1,5 @@
+from .bar_event import BarEvent
 from .candle import Candle
+from .order_event import OrderEvent
 from .position import Position
+from .tick_event import TickEvent
@@ -0,0 +1,13 @@
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class BarEvent:
+    """Payload of the ``BAR_CLOSED`` and ``BAR_UPDATED`` events."""
+
+    symbol: Optional[str]
+    timeframe: int
+    timestamp: int  # Open time of the closed or updated bar
+    version: int  # Per symbol/timeframe, increases on every change
+    gap_bars: int = 0  # Flat bars filled in after a closed bar
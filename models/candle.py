@@ -1,4 +1,6 @@
 class Candle:
+    __slots__ = ("timestamp", "open", "high", "low", "close", "volume", "timeframe")
+
     def __init__(self, timestamp, open, high, low, close, volume, timeframe):
         self.timestamp = timestamp
         self.open = open
@@ -0,0 +1,16 @@
+from dataclasses import dataclass
+from typing import Any, Optional
+
+
+@dataclass(frozen=True)
+class OrderEvent:
+    """Payload of the ``ORDER_RESULT`` event."""
+
+    kind: str  # "open", "modify" or "close"
+    symbol: Optional[str]
+    comment: Optional[str]
+    position_id: Optional[int]  # Ticket of the position opened or targeted
+    ok: bool
+    result: Any  # Broker result of the last attempt, None when it failed
+    retcode: Optional[int]
+    latencies: tuple[float, ...]  # Seconds per attempt
@@ -2,6 +2,24 @@ import time
 
 
 class Position:
+    __slots__ = (
+        "id",
+        "symbol",
+        "direction",
+        "entry_price",
+        "stop_loss",
+        "take_profit",
+        "size",
+        "pip_point",
+        "time_out",
+        "entry_time",
+        "current_price",
+        "close_price",
+        "close_time",
+        "close_reason",
+        "comment",
+    )
+
     def __init__(
         self,
         id,
@@ -14,6 +32,7 @@ class Position:
         pip_point,
         time_out,
         comment,
+        entry_time=None,  # The broker's clock, replays are not wall clock
     ):
         self.id = id
         self.symbol = symbol
@@ -24,7 +43,7 @@ class Position:
         self.size = size
         self.pip_point = pip_point
         self.time_out = time_out
-        self.entry_time = time.time()
+        self.entry_time = time.time() if entry_time is None else entry_time
         self.current_price = entry_price
         self.close_price = None
         self.close_time = None
@@ -42,7 +61,10 @@ class Position:
 
     @property
     def age(self):
-        return time.time() - self.entry_time
+        return self.age_at(time.time())
+
+    def age_at(self, now):
+        return now - self.entry_time
 
     @property
     def unrealized_pnl(self):
@@ -60,7 +82,7 @@ class Position:
     def pips_point(self):
         return self.pip_point * 10
 
-    def close(self, reason):
+    def close(self, reason, now=None):
         self.close_price = self.current_price
-        self.close_time = time.time()
+        self.close_time = time.time() if now is None else now
         self.close_reason = self.close_reason or reason
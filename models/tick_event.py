@@ -0,0 +1,19 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class TickEvent:
+    """Payload of the ``TICK`` event, one per symbol per dispatch.
+
+    Ticks ``first_seq`` to ``seq`` are new since the previous event and can
+    be read with ``TickBuffer.since(first_seq, seq + 1)``. ``dropped`` ticks
+    before ``first_seq`` were overwritten before they were dispatched.
+    """
+
+    symbol: str
+    seq: int  # Sequence number of the latest tick
+    first_seq: int
+    time_msc: int
+    bid: float
+    ask: float
+    dropped: int = 0
@@ -0,0 +1,73 @@
+import os
+import sys
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core.infrastructure.candle import BarAggregator, CandleBuffer
+
+M1, M5, H1 = 1, 5, 60
+
+
+def make_aggregator(session_offset=0):
+    buffers = {tf: CandleBuffer(tf, 100) for tf in (M1, M5, H1)}
+    seconds = {M1: 60, M5: 300, H1: 3600}
+    return BarAggregator(buffers, seconds, M1, session_offset), buffers
+
+
+class TestBarAggregator(unittest.TestCase):
+
+    def test_derives_higher_timeframes(self):
+        aggregator, buffers = make_aggregator()
+        for i in range(10):
+            price = 100 + i
+            aggregator.on_bar(i * 60, price, price + 2, price - 1, price + 1, 10)
+
+        m5 = buffers[M5].to_candles()
+        self.assertEqual([c.timestamp for c in m5], [0, 300])
+        self.assertEqual(m5[0].open, 100)
+        self.assertEqual(m5[0].high, 106)
+        self.assertEqual(m5[0].low, 99)
+        self.assertEqual(m5[0].close, 105)
+        self.assertEqual(m5[0].volume, 50)
+        self.assertEqual(buffers[H1].last.volume, 100)
+
+    def test_forming_bar_updates_volume_once(self):
+        aggregator, buffers = make_aggregator()
+        aggregator.on_bar(0, 100, 101, 99, 100, 5)
+        aggregator.on_bar(0, 100, 102, 99, 101, 8)
+        aggregator.on_bar(60, 101, 101, 101, 101, 1)
+
+        self.assertEqual(buffers[M1].volumes().tolist(), [8, 1])
+        self.assertEqual(buffers[M5].last.volume, 9)
+        self.assertEqual(buffers[M5].last.high, 102)
+
+    def test_reports_closed_bars(self):
+        aggregator, _ = make_aggregator()
+        aggregator.on_bar(240, 100, 100, 100, 100, 1)
+        closed = aggregator.on_bar(300, 100, 100, 100, 100, 1)
+
+        self.assertEqual(closed, [(M1, 240), (M5, 0)])
+
+    def test_session_offset(self):
+        aggregator, buffers = make_aggregator(session_offset=1800)
+        aggregator.on_bar(1740, 100, 100, 100, 100, 1)
+        aggregator.on_bar(1800, 100, 100, 100, 100, 1)
+
+        self.assertEqual(buffers[H1].timestamps().tolist(), [-1800, 1800])
+
+    def test_ticks_build_base_bar(self):
+        aggregator, buffers = make_aggregator()
+        for t, price in ((1, 100.0), (20, 101.5), (59, 99.5)):
+            aggregator.on_tick(t, price)
+
+        bar = buffers[M1].last
+        self.assertEqual(
+            (bar.open, bar.high, bar.low, bar.close), (100, 101.5, 99.5, 99.5)
+        )
+        self.assertEqual(bar.volume, 3)
+        self.assertEqual(buffers[M5].last.volume, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import os
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core.infrastructure.candle import CandleBuffer, CandleStore
+
+RATE_DTYPE = [
+    ("time", "i8"),
+    ("open", "f8"),
+    ("high", "f8"),
+    ("low", "f8"),
+    ("close", "f8"),
+    ("tick_volume", "u8"),
+]
+
+
+def make_rates(start, count):
+    rates = np.zeros(count, dtype=RATE_DTYPE)
+    rates["time"] = np.arange(start, start + count) * 60
+    rates["close"] = np.arange(start, start + count, dtype=np.float64)
+    rates["open"] = rates["close"] - 0.5
+    rates["high"] = rates["close"] + 1
+    rates["low"] = rates["close"] - 1
+    rates["tick_volume"] = 10
+    return rates
+
+
+class TestCandleBuffer(unittest.TestCase):
+
+    def test_append_and_wrap(self):
+        buffer = CandleBuffer("M1", 4)
+        for i in range(6):
+            buffer.append(i * 60, i, i + 1, i - 1, i, 10)
+
+        self.assertEqual(len(buffer), 4)
+        self.assertEqual(buffer.closes().tolist(), [2, 3, 4, 5])
+        self.assertEqual(buffer.closes(2).tolist(), [4, 5])
+        self.assertEqual(buffer.last.timestamp, 300)
+
+    def test_views_are_zero_copy(self):
+        buffer = CandleBuffer("M1", 8)
+        buffer.extend(make_rates(0, 5))
+
+        closes = buffer.closes(3)
+        self.assertFalse(closes.flags["OWNDATA"])
+        buffer.update_last(10, 1, 7.5, 20)
+        self.assertEqual(closes[-1], 7.5)
+
+    def test_extend_across_wrap(self):
+        buffer = CandleBuffer("M1", 5)
+        buffer.extend(make_rates(0, 3))
+        buffer.extend(make_rates(3, 4))
+
+        self.assertEqual(buffer.closes().tolist(), [2, 3, 4, 5, 6])
+        self.assertEqual(buffer.timestamps(1)[0], 6 * 60)
+
+    def test_candle_accessors(self):
+        buffer = CandleBuffer("M1", 3)
+        buffer.extend(make_rates(0, 3))
+
+        candles = buffer.to_candles()
+        self.assertEqual([c.close for c in candles], [0, 1, 2])
+        self.assertTrue(candles[-1].is_bullish)
+        self.assertEqual(buffer.candle_at(0).timeframe, "M1")
+        with self.assertRaises(IndexError):
+            buffer.candle_at(3)
+
+    def test_version_counts_real_changes(self):
+        buffer = CandleBuffer("M1", 4)
+        buffer.append(0, 1, 2, 0.5, 1.5, 10)
+        version = buffer.version
+
+        buffer.update_last(2, 0.5, 1.5, 10)
+        self.assertEqual(buffer.version, version)
+        buffer.update_last(2, 0.5, 1.6, 11)
+        self.assertEqual(buffer.version, version + 1)
+        buffer.append(60, 1.6, 1.6, 1.6, 1.6, 1)
+        self.assertEqual(buffer.version, version + 2)
+
+    def test_store_round_trip(self):
+        with tempfile.TemporaryDirectory() as base_dir:
+            store = CandleStore("XAUUSD", base_dir)
+            store.open("M1", "M1", 4).extend(make_rates(0, 6))
+            store.flush()
+            del store
+
+            buffer = CandleStore("XAUUSD", base_dir).open("M1", "M1", 4)
+            self.assertEqual(buffer.closes().tolist(), [2, 3, 4, 5])
+            del buffer
+
+            # A different capacity resets the cached file
+            self.assertEqual(
+                len(CandleStore("XAUUSD", base_dir).open("M1", "M1", 8)), 0
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
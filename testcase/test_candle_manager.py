@@ -0,0 +1,145 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core.infrastructure.candle import RSI, CandleManager, ExpWeightedMA
+from core.utilities.event_bus import EventBus
+
+M1, M5, M15, M30, H1, H4, D1 = 1, 5, 15, 30, 16385, 16388, 16408
+RATE_DTYPE = [
+    ("time", "i8"),
+    ("open", "f8"),
+    ("high", "f8"),
+    ("low", "f8"),
+    ("close", "f8"),
+    ("tick_volume", "u8"),
+]
+
+
+def rates(*bars):
+    """``(time, open, high, low, close, volume)`` rows as broker rates"""
+    return np.array(list(bars), dtype=RATE_DTYPE)
+
+
+def flat(time, price=100.0, volume=1):
+    return (time, price, price, price, price, volume)
+
+
+class RatesBroker:
+    """Serves the latest ``count`` bars of each timeframe."""
+
+    realtime = False
+
+    def __init__(self):
+        self.rates = {tf: rates() for tf in (M1, M5, M15, M30, H1, H4, D1)}
+
+    def get_candles(self, timeframe, count, symbol=None):
+        return self.rates[timeframe][-count:]
+
+
+class TestCandleManagerEvents(unittest.TestCase):
+
+    def setUp(self):
+        self.broker = RatesBroker()
+        self.broker.rates[M1] = rates(*(flat(t) for t in range(0, 300, 60)))
+        for tf in (M5, M15, M30, H1, H4, D1):
+            self.broker.rates[tf] = rates(flat(0, volume=5))
+        self.bus = EventBus()
+        self.events = []
+        self.bus.subscribe("BAR_CLOSED", lambda e: self.events.append(("closed", e)))
+        self.bus.subscribe("BAR_UPDATED", lambda e: self.events.append(("updated", e)))
+        self.manager = CandleManager(self.broker, symbol="XAUUSD", bus=self.bus)
+        self.manager.initialize_all()
+        self.events.clear()
+
+    def closed(self):
+        return {e.timeframe: e for kind, e in self.events if kind == "closed"}
+
+    def updated(self):
+        return {e.timeframe: e for kind, e in self.events if kind == "updated"}
+
+    def test_closed_bars_after_reconcile(self):
+        # M1 240 closes and opens the second M5 bar; the broker's M5 bar differs
+        self.broker.rates[M1] = rates(flat(240, 101), flat(300, 102))
+        self.broker.rates[M5] = rates((0, 100, 105, 99, 101, 5), flat(300, 102))
+        self.manager.update_candles()
+
+        closed = self.closed()
+        self.assertEqual(sorted(closed), [M1, M5])
+        self.assertEqual((closed[M1].timestamp, closed[M5].timestamp), (240, 0))
+        self.assertEqual(closed[M1].gap_bars, 0)
+        m5 = self.manager.get_buffer(M5)
+        # Published once, with the version of the reconciled bar
+        self.assertEqual(closed[M5].version, m5.version)
+        self.assertEqual(m5.candle_at(0).high, 105)
+        self.assertEqual(closed[M1].symbol, "XAUUSD")
+
+        # Forming bars of the other timeframes changed, without closing
+        updated = self.updated()
+        self.assertEqual(sorted(updated), [M15, M30, H1, H4, D1])
+        self.assertEqual(updated[H1].timestamp, 0)
+        self.assertEqual(updated[H1].version, self.manager.version(H1))
+
+    def test_gap_bars(self):
+        # No M1 bars between 240 and 420, 300 and 360 are filled flat
+        self.broker.rates[M1] = rates(flat(240), flat(420))
+        self.manager.update_candles()
+
+        event = self.closed()[M1]
+        self.assertEqual((event.timestamp, event.gap_bars), (240, 2))
+        self.assertEqual(
+            self.manager.get_buffer(M1).timestamps(3).tolist(), [300, 360, 420]
+        )
+
+    def test_unchanged_poll_publishes_nothing(self):
+        self.broker.rates[M1] = rates(flat(180), flat(240))
+        self.manager.update_candles()
+        self.assertEqual(self.events, [])
+
+
+class TestCandleManagerTicks(unittest.TestCase):
+
+    def setUp(self):
+        self.broker = RatesBroker()
+        self.broker.rates[M1] = rates(*(flat(t) for t in range(0, 240, 60)))
+        for tf in (M5, M15, M30, H1, H4, D1):
+            self.broker.rates[tf] = rates(flat(0, volume=4))
+        self.manager = CandleManager(self.broker)
+        self.manager.initialize_all()
+
+    def ticks(self, *rows):
+        """``(time_msc, bid)`` rows in the layout of ``TickBuffer.since``"""
+        ticks = np.zeros((4, len(rows)))
+        ticks[0], ticks[1] = zip(*rows)
+        return ticks
+
+    def test_poll_overwrites_bars_closed_by_ticks(self):
+        ema = self.manager.indicators.get(M1, ExpWeightedMA, 3)
+        rsi = self.manager.indicators.get(M1, RSI, 3)
+        # Ticks dip to 90 in the 180 bar, then open the 240 bar
+        self.manager.on_ticks(self.ticks((181_000, 100), (190_000, 90), (241_000, 99)))
+        self.assertEqual(self.manager.get_buffer(M5).last.low, 90)
+
+        # The broker never saw the 90 print
+        self.broker.rates[M1] = rates((180, 100, 100, 95, 98, 3), flat(240, 99))
+        self.manager.update_candles()
+
+        m1 = self.manager.get_buffer(M1)
+        self.assertEqual(m1.candle_at(-2).low, 95)
+        m5 = self.manager.get_buffer(M5).last
+        self.assertEqual((m5.low, m5.close, m5.volume), (95, 99, 7))
+        self.assertEqual(self.manager.get_buffer(D1).last.low, 95)
+
+        # Indicators match ones seeded from the corrected history
+        fresh = ExpWeightedMA(3), RSI(3)
+        self.manager.indicators._seed(M1, list(fresh))
+        self.assertEqual(ema.value, fresh[0].value)
+        self.assertEqual(rsi.value, fresh[1].value)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import os
+import sys
+import threading
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core.strategies.memo import DetectorMemo
+
+
+class TestDetectorMemo(unittest.TestCase):
+
+    def test_shared_per_key(self):
+        memo = DetectorMemo()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return len(calls)
+
+        self.assertEqual(memo.get(("Scalp", "XAUUSD", 1), compute), 1)
+        self.assertEqual(memo.get(("Scalp", "XAUUSD", 1), compute), 1)
+        self.assertEqual(memo.get(("Scalp", "XAUUSD", 2), compute), 2)
+        self.assertEqual(
+            memo.stats(), {"Scalp": {"hits": 1, "misses": 2, "hit_rate": 1 / 3}}
+        )
+
+    def test_concurrent_callers_compute_once(self):
+        memo = DetectorMemo()
+        started, release = threading.Event(), threading.Event()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return "signal"
+
+        results = []
+        first = threading.Thread(
+            target=lambda: results.append(memo.get(("Scalp", 1), compute))
+        )
+        first.start()
+        started.wait(5)
+        second = threading.Thread(
+            target=lambda: results.append(memo.get(("Scalp", 1), compute))
+        )
+        second.start()
+        release.set()
+        first.join(5)
+        second.join(5)
+
+        self.assertEqual(results, ["signal", "signal"])
+        self.assertEqual(len(calls), 1)
+
+    def test_failure_not_cached(self):
+        memo = DetectorMemo()
+
+        def fail():
+            raise RuntimeError("no data")
+
+        with self.assertRaises(RuntimeError):
+            memo.get(("Scalp", 1), fail)
+        self.assertEqual(memo.get(("Scalp", 1), lambda: 0), 0)
+
+    def test_bounded(self):
+        memo = DetectorMemo(maxsize=2)
+        for version in range(3):
+            memo.get(("Scalp", version), lambda: version)
+        self.assertEqual(memo.get(("Scalp", 0), lambda: "again"), "again")
+
+
+if __name__ == "__main__":
+    unittest.main()
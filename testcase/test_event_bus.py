@@ -0,0 +1,94 @@
+import os
+import sys
+import threading
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core.utilities.event_bus import COALESCE, DROP_OLDEST, EventBus
+
+
+class TestEventBus(unittest.TestCase):
+
+    def setUp(self):
+        self.bus = EventBus(workers=1)
+        self.gate = threading.Event()
+        self.held = threading.Event()
+        self.events = []
+
+    def tearDown(self):
+        self.gate.set()
+        self.bus.close()
+
+    def hold(self, data):
+        """First handler, keeps the only dispatcher busy until ``gate``"""
+        self.held.set()
+        self.gate.wait(5)
+
+    def test_synchronous_by_default(self):
+        self.bus.subscribe("TICK", self.events.append)
+        self.bus.subscribe("TICK", lambda data: 1 / 0)
+        self.bus.publish("TICK", 1)
+
+        self.assertEqual(self.events, [1])
+        stats = self.bus.stats()["TICK"]
+        self.assertEqual((stats["handled"], stats["errors"]), (1, 1))
+
+    def test_publish_returns_before_handlers(self):
+        self.bus.route("LOG_POSITION")
+        self.bus.subscribe("LOG_POSITION", self.hold)
+        self.bus.subscribe("LOG_POSITION", self.events.append)
+        for i in range(3):
+            self.bus.publish("LOG_POSITION", i)
+
+        self.assertTrue(self.held.wait(5))
+        self.assertEqual(self.events, [])
+        self.assertEqual(self.bus.depth("LOG_POSITION"), 2)
+        self.gate.set()
+        self.bus.close()
+        self.assertEqual(self.events, [0, 1, 2])
+
+    def test_overflow_policies(self):
+        self.bus.route("BUSY")
+        self.bus.route("TICK", maxsize=2, overflow=DROP_OLDEST)
+        self.bus.route("LOG_POSITION", overflow=COALESCE, key=lambda p: p[0])
+        self.bus.subscribe("BUSY", self.hold)
+        self.bus.subscribe("TICK", self.events.append)
+        self.bus.subscribe("LOG_POSITION", self.events.append)
+        self.bus.publish("BUSY")
+        self.assertTrue(self.held.wait(5))
+
+        for tick in (1, 2, 3):
+            self.bus.publish("TICK", tick)
+        for position in ((7, "open"), (8, "open"), (7, "closed")):
+            self.bus.publish("LOG_POSITION", position)
+        self.gate.set()
+        self.bus.close()
+
+        ticks = [e for e in self.events if isinstance(e, int)]
+        positions = [e for e in self.events if isinstance(e, tuple)]
+        self.assertEqual(ticks, [2, 3])
+        self.assertEqual(positions, [(7, "closed"), (8, "open")])
+        stats = self.bus.stats()
+        self.assertEqual(stats["TICK"]["dropped"], 1)
+        self.assertEqual(stats["LOG_POSITION"]["coalesced"], 1)
+
+    def test_priority_topics_first(self):
+        self.bus.route("BUSY")
+        self.bus.route("LOG_POSITION")
+        self.bus.route("RISK_VIOLATION", priority=True)
+        self.bus.subscribe("BUSY", self.hold)
+        self.bus.subscribe("LOG_POSITION", self.events.append)
+        self.bus.subscribe("RISK_VIOLATION", self.events.append)
+        self.bus.publish("BUSY")
+        self.assertTrue(self.held.wait(5))
+
+        self.bus.publish("LOG_POSITION", "position")
+        self.bus.publish("RISK_VIOLATION", "drawdown")
+        self.gate.set()
+        self.bus.close()
+        self.assertEqual(self.events, ["drawdown", "position"])
+
+
+if __name__ == "__main__":
+    unittest.main()
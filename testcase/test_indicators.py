@@ -0,0 +1,109 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core.infrastructure.candle import (
+    ATR,
+    RSI,
+    CandleBuffer,
+    EWMAVolatility,
+    ExpWeightedMA,
+    IndicatorEngine,
+)
+
+M1 = 1
+
+
+def batch_atr(highs, lows, closes, period):
+    tr = np.maximum(
+        highs[1:] - lows[1:],
+        np.maximum(np.abs(highs[1:] - closes[:-1]), np.abs(lows[1:] - closes[:-1])),
+    )
+    return np.mean(tr[-period:])
+
+
+def batch_ema(prices, period):
+    weights = np.exp(np.linspace(0, -1, period))
+    weights /= weights.sum()
+    return np.convolve(prices, weights, mode="full")[: len(prices)]
+
+
+def batch_rsi(prices, period):
+    deltas = np.diff(prices)
+    gains = np.where(deltas > 0, deltas, 0)
+    losses = np.where(deltas < 0, -deltas, 0)
+    avg_gain = np.convolve(gains, np.ones(period) / period, mode="valid")
+    avg_loss = np.convolve(losses, np.ones(period) / period, mode="valid")
+    return 100 - (100 / (1 + avg_gain / (avg_loss + 1e-10)))
+
+
+def batch_vol(closes, lambda_):
+    log_returns = np.log(closes[1:] / closes[:-1])
+    weights = np.array([lambda_**i for i in range(len(log_returns))])[::-1]
+    weights /= weights.sum()
+    mean = np.sum(weights * log_returns)
+    return np.sqrt(np.sum(weights * (log_returns - mean) ** 2))
+
+
+class TestIndicatorEngine(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        self.closes = 2000 + np.cumsum(rng.normal(0, 1, 400))
+        self.buffer = CandleBuffer(M1, 200)
+        self.engine = IndicatorEngine({M1: self.buffer})
+        for i, close in enumerate(self.closes[:100]):
+            self._append(i, close)
+
+    def _append(self, i, close):
+        self.buffer.append(i * 60, close, close + 1.5, close - 1.2, close, 1)
+
+    def _check(self):
+        closes = self.buffer.closes()
+        highs = self.buffer.highs()
+        lows = self.buffer.lows()
+
+        atr = self.engine.get(M1, ATR, 14)
+        self.assertAlmostEqual(atr.value, batch_atr(highs, lows, closes, 14))
+
+        ema = self.engine.get(M1, ExpWeightedMA, 5)
+        expected = batch_ema(closes, 5)
+        self.assertAlmostEqual(ema.value, expected[-1])
+        self.assertAlmostEqual(ema.previous, expected[-2])
+        self.assertAlmostEqual(ema.before, expected[-3])
+
+        rsi = self.engine.get(M1, RSI, 14)
+        self.assertAlmostEqual(rsi.value, batch_rsi(closes, 14)[-1])
+
+        vol = self.engine.get(M1, EWMAVolatility, 49, 0.94)
+        self.assertAlmostEqual(vol.value, batch_vol(closes[-50:], 0.94))
+        self.assertEqual(vol.count, 49)
+
+    def test_matches_batch_formulas(self):
+        self._check()
+
+    def test_streaming_updates(self):
+        self._check()
+        for i, close in enumerate(self.closes[100:], start=100):
+            self._append(i, close)
+            self.engine.update(M1)
+            # Forming bar moves before it closes
+            self.buffer.update_last(close + 2, close - 2, close + 0.5, 3)
+            self.engine.update(M1)
+        self._check()
+
+    def test_reseeds_after_reload(self):
+        self._check()
+        self.buffer.clear()
+        for i, close in enumerate(self.closes[200:260], start=200):
+            self._append(i, close)
+        self.engine.update(M1)
+        self._check()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import os
+import sys
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core.infrastructure.brokers.market_data_cache import MarketDataCache, SymbolSpec
+
+
+class TestMarketDataCache(unittest.TestCase):
+
+    def setUp(self):
+        self.now = 0.0
+        self.fetches = []
+        self.cache = MarketDataCache(
+            self._fetch_tick, self._fetch_spec, tick_ttl=0.5, clock=lambda: self.now
+        )
+
+    def _fetch_tick(self, symbol):
+        self.fetches.append(("tick", symbol))
+        return (symbol, len(self.fetches))
+
+    def _fetch_spec(self, symbol):
+        self.fetches.append(("spec", symbol))
+        return SymbolSpec(0.01, 2, 100, 0.01, 100, 0.01)
+
+    def test_tick_ttl(self):
+        first = self.cache.tick("XAUUSD")
+        self.now = 0.4
+        self.assertIs(self.cache.tick("XAUUSD"), first)
+        self.now = 0.5
+        self.assertIsNot(self.cache.tick("XAUUSD"), first)
+        self.assertEqual(len(self.fetches), 2)
+
+    def test_explicit_refresh(self):
+        first = self.cache.tick("XAUUSD")
+        self.assertIsNot(self.cache.refresh_tick("XAUUSD"), first)
+        self.cache.invalidate()
+        self.cache.tick("XAUUSD")
+        self.assertEqual(len(self.fetches), 3)
+
+    def test_spec_is_kept(self):
+        for _ in range(5):
+            self.assertEqual(self.cache.spec("XAUUSD").point, 0.01)
+        stats = self.cache.stats()
+        self.assertEqual(stats["spec_misses"], 1)
+        self.assertEqual(stats["spec_hits"], 4)
+        self.assertAlmostEqual(stats["spec_hit_rate"], 0.8)
+
+    def test_failed_fetch_not_cached(self):
+        cache = MarketDataCache(lambda symbol: None, lambda symbol: None)
+        self.assertIsNone(cache.tick("XAUUSD"))
+        self.assertIsNone(cache.spec("XAUUSD"))
+        self.assertIsNone(cache.tick("XAUUSD"))
+        self.assertEqual(cache.stats()["tick_misses"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from config.settings import Settings
+from core.application.state import TradingState
+from core.infrastructure.brokers.sim_broker import SimBroker
+from core.infrastructure.recorder import MarketReader, MarketRecorder
+from core.infrastructure.recorder.formats import BAR_RECORD, INDEX_RECORD
+from core.utilities.event_bus import EventBus
+
+DAY = 86400
+M1 = 1
+
+
+class RatesBroker:
+    """Serves flat bars at ``times`` on every timeframe."""
+
+    realtime = False
+
+    def __init__(self, times):
+        self.times = times
+
+    def get_candles(self, timeframe, count, symbol=None):
+        bars = [(t, 100, 100, 100, 100, 1) for t in self.times]
+        return np.array(bars, dtype=BAR_RECORD)[-count:]
+
+
+class TestMarketRecorder(unittest.TestCase):
+
+    def setUp(self):
+        self.base_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.base_dir, ignore_errors=True)
+
+    def test_ticks_round_trip_across_days(self):
+        recorder = MarketRecorder(self.base_dir)
+        # Two hours of one tick per second around midnight
+        seconds = np.arange(DAY * 100 - 3600, DAY * 100 + 3600)
+        for chunk in np.array_split(seconds, 7):
+            recorder.write_ticks(
+                "XAUUSD", chunk * 1000, chunk * 0.01, chunk * 0.01 + 0.2, 1
+            )
+        recorder.close()
+
+        reader = MarketReader(self.base_dir)
+        self.assertEqual(reader.days("XAUUSD"), ["19700410", "19700411"])
+        ticks = reader.read("XAUUSD")
+        self.assertEqual(ticks["time_msc"].tolist(), (seconds * 1000).tolist())
+        self.assertIsInstance(reader.day("XAUUSD", "19700410"), np.memmap)
+
+        start, end = DAY * 100 - 125, DAY * 100 + 61
+        ticks = reader.read("XAUUSD", start, end)
+        self.assertEqual(ticks["time_msc"][0], start * 1000)
+        self.assertEqual(ticks["time_msc"][-1], (end - 1) * 1000)
+        self.assertEqual(len(ticks), end - start)
+
+    def test_resumes_after_restart(self):
+        recorder = MarketRecorder(self.base_dir)
+        recorder.write_bar("XAUUSD", M1, 60, 1, 2, 0.5, 1.5, 10)
+        recorder.close()
+        recorder = MarketRecorder(self.base_dir)
+        recorder.write_bar("XAUUSD", M1, 120, 1.5, 2, 1, 1.8, 12)
+        recorder.close()
+
+        bars = MarketReader(self.base_dir).read("XAUUSD", timeframe=M1)
+        self.assertEqual(bars["time"].tolist(), [60, 120])
+        self.assertEqual(bars["close"].tolist(), [1.5, 1.8])
+
+    def test_drops_torn_records_on_restart(self):
+        recorder = MarketRecorder(self.base_dir)
+        seconds = np.arange(DAY * 100, DAY * 100 + 600)
+        recorder.write_ticks("XAUUSD", seconds * 1000, seconds * 0.01, seconds, 1)
+        recorder.close()
+        # A crash mid-write: half a record in both files and an index entry
+        # pointing past the data
+        day_dir = os.path.join(self.base_dir, "XAUUSD", "19700411")
+        with open(os.path.join(day_dir, "ticks.bin"), "ab") as f:
+            f.write(b"torn")
+        with open(os.path.join(day_dir, "ticks.idx"), "ab") as f:
+            f.write(np.array([(DAY * 100 + 600, 10**6)], dtype=INDEX_RECORD))
+            f.write(b"torn")
+
+        recorder = MarketRecorder(self.base_dir)
+        seconds = np.arange(DAY * 100 + 600, DAY * 100 + 1200)
+        recorder.write_ticks("XAUUSD", seconds * 1000, seconds * 0.01, seconds, 1)
+        recorder.close()
+
+        reader = MarketReader(self.base_dir)
+        ticks = reader.read("XAUUSD")
+        self.assertEqual(len(ticks), 1200)
+        ticks = reader.read("XAUUSD", DAY * 100 + 900, DAY * 100 + 960)
+        self.assertEqual(ticks["time_msc"][0], (DAY * 100 + 900) * 1000)
+        self.assertEqual(len(ticks), 60)
+
+    def test_records_gap_bars(self):
+        broker = RatesBroker(range(0, 300, 60))
+        state = TradingState(broker, EventBus(0), ["XAUUSD"], record_dir=self.base_dir)
+        state.candle_manager.initialize_all()
+        broker.times = [240, 480]  # 300 to 420 are filled in flat
+        state.candle_manager.update_candles()
+        state.recorder.close()
+
+        bars = MarketReader(self.base_dir).read("XAUUSD", timeframe=M1)
+        self.assertEqual(bars["time"].tolist(), [240, 300, 360, 420])
+
+    def test_replays_recorded_bars(self):
+        recorder = MarketRecorder(self.base_dir)
+        for i in range(30):
+            recorder.write_bar(
+                "XAUUSD", M1, i * 60, 100 + i, 101 + i, 99 + i, 100 + i, 5
+            )
+        recorder.close()
+
+        broker = SimBroker.from_recording(Settings(), self.base_dir, warmup_bars=10)
+        self.assertEqual(broker.get_tick().bid, 110)
+        self.assertEqual(len(broker.get_candles(M1, 100)), 11)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import os
+import sys
+import unittest
+import urllib.error
+import urllib.request
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core.utilities.metrics import Exposition, MetricsServer
+from core.utilities.profiler import LatencyHistogram, Profiler
+
+
+class TestMetrics(unittest.TestCase):
+
+    def test_histogram_exposition(self):
+        histogram = LatencyHistogram()
+        for seconds in (0.0002, 0.003, 0.003, 2.0):
+            histogram.record(seconds)
+        out = Exposition()
+        out.histogram("broker_call_seconds", histogram, {"function": "order_send"})
+        lines = out.text().splitlines()
+
+        self.assertEqual(lines[1], "# TYPE trademanager_broker_call_seconds histogram")
+        self.assertIn(
+            'trademanager_broker_call_seconds_bucket{function="order_send",le="0.001"} 1',
+            lines,
+        )
+        self.assertIn(
+            'trademanager_broker_call_seconds_bucket{function="order_send",le="0.005"} 3',
+            lines,
+        )
+        self.assertIn(
+            'trademanager_broker_call_seconds_bucket{function="order_send",le="+Inf"} 4',
+            lines,
+        )
+        self.assertIn(
+            'trademanager_broker_call_seconds_count{function="order_send"} 4', lines
+        )
+
+    def test_profiler_totals_survive_reports(self):
+        profiler = Profiler()
+        profiler.record("loop.iteration", 0.01)
+        profiler.reset()  # As after a report
+        profiler.record("loop.iteration", 0.02)
+        cumulative = profiler.cumulative()["loop.iteration"]
+        self.assertEqual(cumulative.count, 2)
+        self.assertAlmostEqual(cumulative.total, 0.03)
+
+    def test_scrape(self):
+        server = MetricsServer(0)
+        server.register(
+            lambda out: out.gauge("open_positions", 2, {"symbol": "XAUUSD"})
+        )
+        server.register(lambda out: 1 / 0)  # A failing collector is skipped
+        server.start()
+        try:
+            url = f"http://127.0.0.1:{server.port}"
+            with urllib.request.urlopen(f"{url}/metrics") as response:
+                body = response.read().decode()
+                self.assertTrue(
+                    response.headers["Content-Type"].startswith("text/plain")
+                )
+            self.assertIn('trademanager_open_positions{symbol="XAUUSD"} 2.0', body)
+            with self.assertRaises(urllib.error.HTTPError):
+                urllib.request.urlopen(f"{url}/other")
+        finally:
+            server.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
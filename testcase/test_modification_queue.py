@@ -0,0 +1,104 @@
+import os
+import sys
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core.infrastructure.risk import ModificationQueue
+from models import OrderEvent, Position
+
+
+class RecordingOrders:
+    def __init__(self):
+        self.sent = []
+
+    def modify(self, position_id, sl, tp, on_done=None):
+        self.sent.append((position_id, sl, tp, on_done))
+
+
+def make_position(id):
+    return Position(id, "XAUUSD", 1, 2000.0, 1990.0, 2030.0, 0.1, 0.01, 0, "test")
+
+
+def confirm(on_done, ok=True):
+    on_done(OrderEvent("modify", None, None, None, ok, None, None, ()))
+
+
+class TestModificationQueue(unittest.TestCase):
+
+    def setUp(self):
+        self.now = 0.0
+        self.orders = RecordingOrders()
+        self.queue = ModificationQueue(
+            self.orders, min_step_pips=2, max_per_second=2, clock=lambda: self.now
+        )
+
+    def test_keeps_latest_target(self):
+        position = make_position(1)
+        for sl in (1995.0, 1996.0, 1997.0):
+            self.queue.request(position, sl, position.take_profit)
+        self.assertEqual(self.queue.flush(), 1)
+        self.assertEqual(self.orders.sent[0][:3], (1, 1997.0, 2030.0))
+        self.assertEqual(self.queue.stats()["coalesced"], 2)
+
+        # SL changes only once the broker confirms
+        self.assertEqual(position.stop_loss, 1990.0)
+        confirm(self.orders.sent[0][3])
+        self.assertEqual(position.stop_loss, 1997.0)
+
+    def test_drops_small_steps(self):
+        position = make_position(1)
+        self.queue.request(position, 1990.1, position.take_profit)  # 0.5 pip
+        self.assertEqual(self.queue.flush(), 0)
+        self.assertEqual(self.queue.stats()["below_step"], 1)
+
+    def test_one_in_flight_per_ticket(self):
+        position = make_position(1)
+        self.queue.request(position, 1995.0, position.take_profit)
+        self.queue.flush()
+        self.queue.request(position, 1998.0, position.take_profit)
+        self.now = 10
+        self.assertEqual(self.queue.flush(), 0)
+        confirm(self.orders.sent[0][3])
+        self.assertEqual(self.queue.flush(), 1)
+
+    def test_never_loosens_sl(self):
+        position = make_position(1)
+        self.queue.request(position, 1995.0, position.take_profit)
+        self.queue.flush()
+        # The price pulls back while 1995 is in flight
+        self.queue.request(position, 1993.0, position.take_profit)
+        self.assertEqual(len(self.queue), 0)
+        self.queue.request(position, 1998.0, position.take_profit)
+        self.queue.request(position, 1995.5, position.take_profit)  # Pending 1998
+        self.now = 10
+        confirm(self.orders.sent[0][3])
+        self.assertEqual(self.queue.flush(), 1)
+        self.assertEqual(self.orders.sent[1][:3], (1, 1998.0, 2030.0))
+        confirm(self.orders.sent[1][3])
+        self.assertEqual(position.stop_loss, 1998.0)
+
+        # Tightened elsewhere after the request, checked again before sending
+        self.queue.request(position, 2001.0, position.take_profit)
+        position.update_sl(2002.0)
+        self.assertEqual(self.queue.flush(), 0)
+        self.assertEqual(position.stop_loss, 2002.0)
+
+        short = Position(2, "XAUUSD", -1, 2000.0, 2010.0, 1970.0, 0.1, 0.01, 0, "t")
+        self.queue.request(short, 2005.0, short.take_profit)
+        self.queue.request(short, 2008.0, short.take_profit)
+        self.assertEqual(self.queue.flush(), 1)
+        self.assertEqual(self.orders.sent[2][:3], (2, 2005.0, 1970.0))
+
+    def test_rate_limit(self):
+        positions = [make_position(i) for i in range(5)]
+        for position in positions:
+            self.queue.request(position, 1995.0, position.take_profit)
+        self.assertEqual(self.queue.flush(), 2)
+        self.now = 0.5  # One more token
+        self.assertEqual(self.queue.flush(), 1)
+        self.assertEqual(len(self.queue), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
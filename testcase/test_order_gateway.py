@@ -0,0 +1,87 @@
+import os
+import sys
+import unittest
+from collections import namedtuple
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core.infrastructure.brokers import OrderGateway
+from core.utilities.event_bus import EventBus
+
+Result = namedtuple("Result", "retcode order price")
+
+REQUOTE, DONE, NO_MONEY = 10004, 10009, 10019
+
+
+class RequotingBroker:
+    realtime = True
+    order_attempts = 3
+    retryable_retcodes = frozenset((REQUOTE,))
+    last_retcode = None
+
+    def __init__(self, retcodes):
+        self.retcodes = list(retcodes)
+        self.sent = 0
+
+    def add_order(self, direction, volume, sl, tp, comment, symbol=None):
+        self.sent += 1
+        self.last_retcode = self.retcodes.pop(0)
+        if self.last_retcode == DONE:
+            return Result(DONE, 42, 2000.5)
+        return None
+
+
+class TestOrderGateway(unittest.TestCase):
+
+    def setUp(self):
+        self.bus = EventBus()
+        self.events = []
+        self.bus.subscribe("ORDER_RESULT", self.events.append)
+
+    def _gateway(self, retcodes):
+        broker = RequotingBroker(retcodes)
+        gateway = OrderGateway(broker, self.bus, max_attempts=3, backoff=0.001)
+        self.assertEqual(broker.order_attempts, 1)
+        gateway.start()
+        return broker, gateway
+
+    def test_retries_requotes_off_thread(self):
+        broker, gateway = self._gateway([REQUOTE, REQUOTE, DONE])
+        done = []
+        future = gateway.open(1, 0.1, 1990, 2030, "M1 Scalping", "XAUUSD", done.append)
+        self.assertTrue(gateway.has_pending("M1 Scalping", "XAUUSD"))
+
+        event = future.result(timeout=5)
+        self.assertTrue(event.ok)
+        self.assertEqual(event.position_id, 42)
+        self.assertEqual(len(event.latencies), 3)
+        self.assertEqual(broker.sent, 3)
+
+        # Callbacks and events wait for the main loop
+        self.assertEqual(done, [])
+        self.assertEqual(gateway.dispatch(), 1)
+        self.assertEqual(done, [event])
+        self.assertEqual(self.events, [event])
+        self.assertFalse(gateway.has_pending("M1 Scalping", "XAUUSD"))
+        gateway.stop()
+
+    def test_does_not_retry_other_errors(self):
+        broker, gateway = self._gateway([NO_MONEY, DONE])
+        event = gateway.open(1, 0.1, 0, 0, "M1 Scalping").result(timeout=5)
+        self.assertFalse(event.ok)
+        self.assertEqual(event.retcode, NO_MONEY)
+        self.assertEqual(broker.sent, 1)
+        gateway.stop()
+        self.assertEqual(gateway.stats()["failed"], 1)
+
+    def test_inline_when_not_realtime(self):
+        broker = RequotingBroker([DONE])
+        broker.realtime = False
+        gateway = OrderGateway(broker, self.bus)
+        gateway.open(1, 0.1, 0, 0, "M1 Scalping")
+        self.assertEqual(len(self.events), 1)
+        self.assertTrue(self.events[0].ok)
+
+
+if __name__ == "__main__":
+    unittest.main()
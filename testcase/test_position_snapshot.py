@@ -0,0 +1,49 @@
+import os
+import sys
+import unittest
+from collections import namedtuple
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core.infrastructure.brokers.position_snapshot import PositionSnapshot
+
+TradePosition = namedtuple("TradePosition", "ticket magic symbol comment")
+
+
+class TestPositionSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        self.snapshot = PositionSnapshot(
+            [
+                TradePosition(1, 666, "XAUUSD", "M1 Scalping"),
+                TradePosition(2, 666, "XAUUSD", "Major Trend Conf"),
+                TradePosition(3, 666, "EURUSD", "M1 Scalping"),
+                TradePosition(4, 1, "XAUUSD", "M1 Scalping"),
+            ]
+        )
+
+    def test_by_ticket(self):
+        self.assertEqual(self.snapshot.get(3).symbol, "EURUSD")
+        self.assertIsNone(self.snapshot.get(4, magic=666))
+        self.assertIsNone(self.snapshot.get(99))
+
+    def test_by_symbol(self):
+        tickets = [p.ticket for p in self.snapshot.of_symbol(666, "XAUUSD")]
+        self.assertEqual(tickets, [1, 2])
+        self.assertEqual(len(self.snapshot.of_symbol(666)), 3)
+        self.assertEqual(self.snapshot.of_symbol(666, "GBPUSD"), ())
+
+    def test_by_comment(self):
+        found = self.snapshot.of_comment(666, "XAUUSD", "M1 Scalping")
+        self.assertEqual([p.ticket for p in found], [1])
+        found = self.snapshot.of_comment(666, "", "M1 Scalping")
+        self.assertEqual([p.ticket for p in found], [1, 3])
+
+    def test_empty(self):
+        snapshot = PositionSnapshot(None)
+        self.assertEqual(len(snapshot), 0)
+        self.assertEqual(snapshot.of_symbol(666, "XAUUSD"), ())
+
+
+if __name__ == "__main__":
+    unittest.main()
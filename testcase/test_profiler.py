@@ -0,0 +1,90 @@
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core.utilities.profiler import LatencyHistogram, Profiler
+
+
+class TestLatencyHistogram(unittest.TestCase):
+
+    def test_percentiles_within_precision(self):
+        histogram = LatencyHistogram()
+        for micros in range(1, 10001):
+            histogram.record(micros / 1e6)
+
+        self.assertEqual(histogram.count, 10000)
+        self.assertAlmostEqual(histogram.max, 0.01)
+        for q, expected in ((50, 0.005), (99, 0.0099)):
+            self.assertAlmostEqual(
+                histogram.percentile(q), expected, delta=expected / 16
+            )
+
+    def test_small_values_exact(self):
+        histogram = LatencyHistogram()
+        for micros in (3, 3, 3, 20):
+            histogram.record(micros / 1e6)
+        self.assertAlmostEqual(histogram.percentile(50), 3e-6)
+        self.assertAlmostEqual(histogram.percentile(100), 20e-6)
+
+    def test_empty(self):
+        self.assertEqual(LatencyHistogram().percentile(99), 0.0)
+
+
+class TestProfiler(unittest.TestCase):
+
+    def test_phases_and_report(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            profiler = Profiler(interval=60, out_dir=tmp)
+            for _ in range(3):
+                with profiler.phase("loop.update"):
+                    pass
+            profiler.record("order.open", 0.2)
+
+            self.assertFalse(profiler.maybe_report(now=profiler.window_start + 1))
+            self.assertTrue(profiler.maybe_report(now=profiler.window_start + 61))
+            self.assertEqual(profiler.histograms, {})
+
+            (name,) = os.listdir(tmp)
+            with open(os.path.join(tmp, name)) as f:
+                record = json.loads(f.readline())
+            self.assertEqual(record["phases"]["loop.update"]["count"], 3)
+            self.assertAlmostEqual(record["phases"]["order.open"]["max_ms"], 200)
+
+    def test_nested_and_concurrent_phases(self):
+        profiler = Profiler()
+        with profiler.phase("strategy.run"):
+            time.sleep(0.02)
+            with profiler.phase("strategy.run"):
+                pass
+        self.assertGreaterEqual(profiler.histograms["strategy.run"].max, 0.02)
+
+        def work():
+            for _ in range(1000):
+                with profiler.phase("strategy.worker"):
+                    pass
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        profiler.reset()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(profiler.cumulative()["strategy.worker"].count, 4000)
+
+    def test_disabled(self):
+        profiler = Profiler()
+        profiler.configure(enabled=False)
+        with profiler.phase("loop.update"):
+            pass
+        profiler.record("order.open", 0.1)
+        self.assertEqual(profiler.histograms, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
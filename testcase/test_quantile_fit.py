@@ -0,0 +1,45 @@
+import os
+import sys
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core.strategies.mtc.quantile_fit import QuantileFitter, quantile_slope
+
+
+class TestQuantileFitter(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        self.closes = 2000 + np.cumsum(rng.normal(0.5, 2.0, 90))
+
+    def test_caches_per_bar(self):
+        fitter = QuantileFitter()
+        slope = fitter.submit(16385, 3600, self.closes).result()
+
+        self.assertEqual(fitter.submit(16385, 3600, self.closes).result(), slope)
+        self.assertEqual(fitter.stats()["hits"], 1)
+
+        # A new bar, or another lookback, fits again
+        fitter.submit(16385, 7200, self.closes)
+        fitter.submit(16385, 7200, self.closes[-60:])
+        self.assertEqual(fitter.stats()["misses"], 3)
+
+    def test_process_pool_through_shared_memory(self):
+        expected = quantile_slope(self.closes)
+        with ProcessPoolExecutor(max_workers=2) as pool:
+            fitter = QuantileFitter(pool, slots=1)
+            try:
+                shared = fitter.submit(16408, 0, self.closes)
+                pickled = fitter.submit(16388, 0, self.closes)  # No slot left
+                self.assertAlmostEqual(shared.result(), expected)
+                self.assertAlmostEqual(pickled.result(), expected)
+            finally:
+                fitter.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from config.settings import Settings
+from core.infrastructure.brokers.sim_broker import (
+    RATE_DTYPE,
+    TRADE_RETCODE_DONE,
+    SimBroker,
+)
+
+M1, M5 = 1, 5
+
+
+def make_rates(count, start=0):
+    rates = np.zeros(count, dtype=RATE_DTYPE)
+    rates["time"] = start + np.arange(count) * 60
+    rates["open"] = 100 + np.arange(count)
+    rates["high"] = rates["open"] + 2
+    rates["low"] = rates["open"] - 1
+    rates["close"] = rates["open"] + 1
+    rates["tick_volume"] = 10
+    return rates
+
+
+class TestSimBroker(unittest.TestCase):
+
+    def setUp(self):
+        self.config = Settings(SYMBOL="XAUUSD")
+        self.broker = SimBroker(
+            self.config, {"XAUUSD": make_rates(30)}, spread_points=20, warmup_bars=7
+        )
+
+    def test_replays_bars(self):
+        self.assertEqual(self.broker.now, 7 * 60)
+        self.assertEqual(self.broker.get_tick().bid, 108)
+        self.assertAlmostEqual(self.broker.get_tick().ask, 108.2)
+        self.assertTrue(self.broker.advance())
+        self.assertEqual(
+            self.broker.get_candles(M1, 3)["time"].tolist(), [360, 420, 480]
+        )
+        while self.broker.advance():
+            pass
+        self.assertEqual(self.broker.now, 29 * 60)
+
+    def test_aggregates_forming_bar(self):
+        bars = self.broker.get_candles(M5, 2)
+        self.assertEqual(bars["time"].tolist(), [0, 300])
+        self.assertEqual(bars["open"].tolist(), [100, 105])
+        self.assertEqual(bars["high"].tolist(), [106, 109])
+        self.assertEqual(bars["close"].tolist(), [105, 108])
+        self.assertEqual(bars["tick_volume"].tolist(), [50, 30])
+
+    def test_fills_and_stops(self):
+        result = self.broker.add_order(1, 0.1, sl=0, tp=111, comment="test")
+        self.assertEqual(result.retcode, TRADE_RETCODE_DONE)
+        self.assertAlmostEqual(result.price, 108.2)
+        self.assertTrue(self.broker.has_positions_by_comment("test"))
+
+        self.broker.advance()
+        self.assertEqual(len(self.broker.get_positions()), 1)
+        self.broker.advance()  # High of 111 reaches the take profit
+        self.assertEqual(self.broker.get_positions(), ())
+        self.assertAlmostEqual(self.broker.balance, 10000 + 2.8 * 0.1 * 100)
+
+    def test_close_position(self):
+        order = self.broker.add_order(-1, 0.1, sl=0, tp=0)
+        self.broker.advance()
+        self.assertTrue(self.broker.close_position(order.order))
+        self.assertIsNone(self.broker.get_position_by_id(order.order))
+        _, equity = self.broker.get_account_info()
+        self.assertAlmostEqual(equity, 10000 + (108 - 109.2) * 0.1 * 100)
+
+    def test_retcode_cleared_when_nothing_is_sent(self):
+        self.broker.send_order({"action": 0})
+        self.assertIsNotNone(self.broker.last_retcode)
+        # Unknown symbol, no order goes out; an earlier retcode must not stay
+        self.assertIsNone(self.broker.add_order(1, 0.1, 0, 0, symbol="EURUSD"))
+        self.assertIsNone(self.broker.last_retcode)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+import os
+import sys
+import tempfile
+import unittest
+from types import SimpleNamespace
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core.application.snapshot import StateSnapshot
+from core.infrastructure.position import PositionManager
+from core.utilities.event_bus import EventBus
+from models import Position
+
+
+def make_state():
+    manager = PositionManager(None, EventBus(), ["XAUUSD"])
+    return SimpleNamespace(
+        symbols=["XAUUSD"], position_manager=manager, candle_managers={}
+    )
+
+
+def make_position(id, time_out=180):
+    return Position(id, "XAUUSD", 1, 2000.0, 1995.0, 2010.0, 0.1, 0.01, time_out, "M1")
+
+
+class Detector:
+    def __init__(self, prev_rsi=None):
+        self.prev_rsi = prev_rsi
+
+    def get_state(self):
+        return {"prev_rsi": self.prev_rsi}
+
+    def set_state(self, state):
+        self.prev_rsi = state["prev_rsi"]
+
+
+class TestStateSnapshot(unittest.TestCase):
+
+    def test_round_trip(self):
+        state = make_state()
+        manager = state.position_manager
+        position = make_position(7)
+        position.entry_time = 1700000000.0
+        manager.add_position(position)
+        closed = make_position(6)
+        closed.close("Timeout")
+        manager.position_history.append(closed)
+        manager.consecutive_losses = 2
+        strategies = [
+            SimpleNamespace(name="M1", symbol="XAUUSD", detector=Detector(55.5))
+        ]
+
+        with tempfile.TemporaryDirectory() as tmp:
+            snapshot = StateSnapshot(os.path.join(tmp, "state", "snapshot.npz"))
+            snapshot.save(state, strategies)
+
+            restored = make_state()
+            detector = Detector()
+            restored_strategies = [
+                SimpleNamespace(name="M1", symbol="XAUUSD", detector=detector)
+            ]
+            self.assertTrue(snapshot.restore(restored, restored_strategies))
+            self.assertEqual(os.listdir(os.path.join(tmp, "state")), ["snapshot.npz"])
+
+        manager = restored.position_manager
+        position = manager.open_positions[7]
+        self.assertEqual(position.time_out, 180)
+        self.assertEqual(position.entry_time, 1700000000.0)
+        self.assertEqual(position.comment, "M1")
+        self.assertIsNone(position.close_price)
+        self.assertIs(manager.books["XAUUSD"][7], position)
+        self.assertEqual(manager.position_history[0].close_reason, "Timeout")
+        self.assertEqual(manager.consecutive_losses, 2)
+        self.assertEqual(detector.prev_rsi, 55.5)
+
+    def test_missing_or_corrupt(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "snapshot.npz")
+            snapshot = StateSnapshot(path)
+            self.assertFalse(snapshot.restore(make_state()))
+            with open(path, "wb") as f:
+                f.write(b"torn")
+            self.assertFalse(snapshot.restore(make_state()))
+
+            # A zip cut short, or damaged past its header
+            state = make_state()
+            state.position_manager.add_position(make_position(7))
+            snapshot.save(state)
+            with open(path, "rb") as f:
+                data = f.read()
+            for damaged in (
+                data[: len(data) // 2],
+                data[:40] + b"\0" * (len(data) - 40),
+            ):
+                with open(path, "wb") as f:
+                    f.write(damaged)
+                self.assertFalse(snapshot.restore(make_state()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core.utilities.startup import StartupReport
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+class TestStartupReport(unittest.TestCase):
+
+    def test_report(self):
+        report = StartupReport()
+        with report.phase("broker"):
+            pass
+        report.record("candles.XAUUSD.M1", 0.25)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            report.report(tmp)
+            with open(os.path.join(tmp, "startup.jsonl")) as f:
+                saved = json.loads(f.readline())
+        self.assertIn("broker", saved["phases"])
+        self.assertEqual(saved["details"], {"candles.XAUUSD.M1": 0.25})
+        self.assertGreaterEqual(saved["total"], saved["phases"]["broker"])
+
+    def test_app_import_is_light(self):
+        code = (
+            "import sys, core.application.app; "
+            "print([m for m in ('sklearn', 'matplotlib', 'pandas', 'tkinter') "
+            "if m in sys.modules])"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        self.assertEqual(output.strip().splitlines()[-1], "[]")
+
+
+if __name__ == "__main__":
+    unittest.main()
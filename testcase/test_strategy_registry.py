@@ -0,0 +1,179 @@
+import os
+import sys
+import threading
+import time
+import unittest
+
+import schedule
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core.strategies.base import BaseDetector, BaseExecutor
+from core.strategies.loader import StrategyRegistry
+from core.utilities.event_bus import EventBus
+from models import BarEvent
+
+
+class GatedDetector(BaseDetector):
+    def __init__(self, signal=0, fail=False):
+        self.symbol = "XAUUSD"
+        self.signal = signal
+        self.fail = fail
+        self.gate = threading.Event()
+        self.gate.set()
+
+    def detect(self, name):
+        self.gate.wait(5)
+        if self.fail:
+            raise RuntimeError("no candles")
+        return self.signal, "test"
+
+
+class RecordingExecutor(BaseExecutor):
+    def __init__(self):
+        self.symbol = "XAUUSD"
+        self.executed = []
+
+    def execute(self, name, direction):
+        self.executed.append((name, direction))
+        return True
+
+
+def wait_idle(registry, timeout=5):
+    deadline = time.monotonic() + timeout
+    while any(s.future is not None for s in registry.strategies):
+        if time.monotonic() > deadline:
+            raise TimeoutError
+        registry.dispatch()
+        time.sleep(0.001)
+
+
+class TestStrategyRegistry(unittest.TestCase):
+
+    def tearDown(self):
+        schedule.clear()
+
+    def test_runs_on_worker_and_skips_while_running(self):
+        registry = StrategyRegistry(workers=2)
+        detector, executor = GatedDetector(signal=1), RecordingExecutor()
+        registry.load("Scalp", detector, executor, {"type": "interval", "seconds": 10})
+        (strategy,) = registry.strategies
+
+        detector.gate.clear()
+        registry.submit(strategy)
+        registry.submit(strategy)  # Still blocked in detect
+        self.assertEqual(strategy.stats.skipped, 1)
+
+        detector.gate.set()
+        wait_idle(registry)
+        self.assertEqual(executor.executed, [("Scalp", 1)])
+        self.assertEqual(strategy.stats.runs, 1)
+        registry.close()
+
+    def test_overrun_and_errors(self):
+        registry = StrategyRegistry(workers=2)
+        slow = GatedDetector()
+        registry.load(
+            "Slow",
+            slow,
+            RecordingExecutor(),
+            {"type": "interval", "seconds": 10},
+            time_budget=0.01,
+        )
+        registry.load(
+            "Broken",
+            GatedDetector(fail=True),
+            RecordingExecutor(),
+            {"type": "interval", "seconds": 10},
+        )
+        slow.gate.clear()
+        for strategy in registry.strategies:
+            registry.submit(strategy)
+        time.sleep(0.05)
+        registry.dispatch()
+        slow.gate.set()
+        wait_idle(registry)
+
+        stats = registry.stats()
+        self.assertEqual(stats["Slow.XAUUSD"]["overruns"], 1)
+        self.assertEqual(stats["Broken.XAUUSD"]["errors"], 1)
+        registry.close()
+
+    def test_inline(self):
+        registry = StrategyRegistry(inline=True)
+        executor = RecordingExecutor()
+        registry.load("Scalp", GatedDetector(signal=-1), executor)
+        registry.submit(registry.strategies[0])
+
+        self.assertIsNone(registry.strategies[0].future)
+        self.assertEqual(executor.executed, [("Scalp", -1)])
+
+    def test_bar_close_once_per_bar(self):
+        bus = EventBus()
+        registry = StrategyRegistry(inline=True, bus=bus)
+        executor = RecordingExecutor()
+        registry.load(
+            "Scalp",
+            GatedDetector(signal=1),
+            executor,
+            {"type": "bar_close", "timeframe": 1, "delay_ms": 200},
+            symbols=["XAUUSD"],
+        )
+
+        bus.publish("BAR_CLOSED", BarEvent("XAUUSD", 5, 60, 1))  # Other timeframe
+        bus.publish("BAR_CLOSED", BarEvent("XAUUSD", 1, 60, 2))
+        bus.publish("BAR_CLOSED", BarEvent("XAUUSD", 1, 60, 3))  # Same bar
+        registry.run_pending()
+        registry.run_pending()
+        bus.publish("BAR_CLOSED", BarEvent("XAUUSD", 1, 120, 4))
+        registry.run_pending()
+
+        self.assertEqual(len(executor.executed), 2)
+        self.assertTrue(registry.strategies[0].detector.bar_close)
+
+    def test_bar_close_waits_for_delay(self):
+        bus = EventBus()
+        registry = StrategyRegistry(workers=1, bus=bus)
+        registry.load(
+            "Scalp",
+            GatedDetector(),
+            RecordingExecutor(),
+            {"type": "bar_close", "timeframe": 1, "delay_ms": 50},
+        )
+        (strategy,) = registry.strategies
+
+        bus.publish("BAR_CLOSED", BarEvent("XAUUSD", 1, 60, 1))
+        registry.run_pending()
+        self.assertIsNone(strategy.future)
+        self.assertLessEqual(registry.idle_seconds(), 0.05)
+
+        time.sleep(0.06)
+        registry.run_pending()
+        wait_idle(registry)
+        self.assertEqual(strategy.stats.runs, 1)
+        registry.close()
+
+    def test_replayed_clock(self):
+        now = [10 * 3600 + 30]  # 10:00:30 of the replayed day
+        registry = StrategyRegistry(inline=True, clock=lambda: now[0])
+        hourly, limited = RecordingExecutor(), RecordingExecutor()
+        registry.load("Hourly", GatedDetector(1), hourly, {"type": "hourly"})
+        registry.load(
+            "Limited",
+            GatedDetector(1),
+            limited,
+            {"type": "hourly", "at": ":00"},
+            duration_minutes=90,
+        )
+
+        while now[0] < 13 * 3600 + 30:
+            now[0] += 60
+            registry.run_pending()
+
+        self.assertEqual(schedule.jobs, [])  # Nothing on the wall clock
+        self.assertEqual(len(hourly.executed), 3)  # 11:00, 12:00 and 13:00
+        self.assertEqual(len(limited.executed), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
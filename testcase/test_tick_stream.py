@@ -0,0 +1,97 @@
+import os
+import sys
+import unittest
+from collections import namedtuple
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core.infrastructure.tick import TickBuffer, TickStream
+from core.utilities.event_bus import EventBus
+
+TICK_DTYPE = [("time_msc", "i8"), ("bid", "f8"), ("ask", "f8"), ("volume", "f8")]
+Tick = namedtuple("Tick", "time_msc bid ask volume")
+
+
+class HistoryBroker:
+    """Serves ticks like ``copy_ticks_from``: from the start of the second."""
+
+    realtime = False
+
+    def __init__(self):
+        self.ticks = np.zeros(0, dtype=TICK_DTYPE)
+
+    def add(self, *times):
+        new = np.array(
+            [(t, 100 + t / 1000, 100.2 + t / 1000, 1) for t in times], TICK_DTYPE
+        )
+        self.ticks = np.concatenate([self.ticks, new])
+
+    def get_tick(self, symbol=None):
+        return Tick(*self.ticks[-1]) if len(self.ticks) else None
+
+    def get_ticks_since(self, since_msc, count, symbol=None):
+        start = np.searchsorted(self.ticks["time_msc"], since_msc // 1000 * 1000)
+        return self.ticks[start : start + count]
+
+
+class TestTickBuffer(unittest.TestCase):
+
+    def test_wraps_and_views(self):
+        buffer = TickBuffer(4)
+        for i in range(6):
+            buffer.append(i, 100 + i, 101 + i)
+        self.assertEqual(len(buffer), 4)
+        self.assertEqual(buffer.oldest, 2)
+        view = buffer.since(0)
+        self.assertEqual(view[0].tolist(), [2, 3, 4, 5])
+        self.assertTrue(np.shares_memory(view, buffer._data))
+        self.assertEqual(buffer.since(4, 5)[1].tolist(), [104])
+        self.assertEqual(buffer.last.bid, 105)
+
+        buffer.extend(np.arange(6, 16), np.arange(6, 16), np.arange(6, 16), 1)
+        self.assertEqual(buffer.count, 16)
+        self.assertEqual(buffer.latest(4)[0].tolist(), [12, 13, 14, 15])
+
+
+class TestTickStream(unittest.TestCase):
+
+    def setUp(self):
+        self.broker = HistoryBroker()
+        self.bus = EventBus()
+        self.events = []
+        self.bus.subscribe("TICK", self.events.append)
+        self.stream = TickStream(
+            self.broker, self.bus, ["XAUUSD"], capacity=8, backfill_seconds=2, batch=4
+        )
+
+    def test_backfills_without_duplicates(self):
+        self.broker.add(1000, 2500, 3000, 3000)
+        self.stream.dispatch()
+        buffer = self.stream.buffers["XAUUSD"]
+        # Backfill starts 2 s before the latest tick
+        self.assertEqual(buffer.since(0)[0].tolist(), [1000, 2500, 3000, 3000])
+
+        self.broker.add(3000, 3400, 4100, 4200, 4300, 4400)
+        self.stream.dispatch()
+        self.assertEqual(
+            buffer.since(4)[0].tolist(), [3000, 3400, 4100, 4200, 4300, 4400]
+        )
+        self.assertEqual([e.seq for e in self.events], [3, 9])
+        self.assertEqual(self.events[1].first_seq, 4)
+        self.assertEqual(self.events[1].time_msc, 4400)
+
+    def test_reports_dropped_ticks(self):
+        self.broker.add(1000)
+        self.stream.dispatch()
+        self.broker.add(*range(1001, 1011))
+        self.stream.dispatch()
+        event = self.events[-1]
+        self.assertEqual(event.dropped, 2)
+        self.assertEqual(event.first_seq, 3)
+        self.assertEqual(event.seq, 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,33 @@
+import os
+import sys
+import threading
+import time
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core.utilities.wakeup import Wakeup
+
+
+class TestWakeup(unittest.TestCase):
+
+    def test_times_out(self):
+        wakeup = Wakeup()
+        start = time.monotonic()
+        self.assertFalse(wakeup.wait(0.05))
+        self.assertGreaterEqual(time.monotonic() - start, 0.04)
+
+    def test_notify_from_thread(self):
+        wakeup = Wakeup()
+        threading.Timer(0.01, wakeup.notify).start()
+        self.assertTrue(wakeup.wait(5))
+
+    def test_keeps_early_notification(self):
+        wakeup = Wakeup()
+        wakeup.notify()
+        self.assertTrue(wakeup.wait(0))
+        self.assertFalse(wakeup.wait(0))
+
+
+if __name__ == "__main__":
+    unittest.main()